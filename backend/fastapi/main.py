@@ -5,8 +5,9 @@ import logging
 import os
 import re
 import sys
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Any, AsyncIterator, Iterable, List, Sequence
 
 SRC_PATH = Path(__file__).resolve().parent / "src"
 if str(SRC_PATH) not in sys.path:
@@ -15,8 +16,19 @@ if str(SRC_PATH) not in sys.path:
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from rag_pipeline.api.dependencies import build_services
 from rag_pipeline.api.routes import router as rag_router
 from rag_pipeline.config import settings
+from rag_pipeline.embedding.batcher import get_embedding_batcher
+from rag_pipeline.embedding.local_embeddings import get_embedding_client
+from rag_pipeline.retrieval.cache import get_retrieval_cache, start_reload_listener, stop_reload_listener
+from rag_pipeline.retrieval.pool import close_async_pool, close_pool, open_async_pool, open_pool
+from rag_pipeline.services.curriculum_cache import get_curriculum_cache
+from rag_pipeline.services.openai_client import (
+    close_openai_client,
+    create_async_openai_client,
+    get_openai_client,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +38,7 @@ PRODUCTION_ORIGIN: str = "https://hanataba227.github.io"
 
 def create_app(*, allowed_origins: Iterable[str] | None = None) -> FastAPI:
     """FastAPI 애플리케이션 인스턴스를 생성한다."""
-    app = FastAPI(title="Project S RAG API", version="0.1.0")
+    app = FastAPI(title="Project S RAG API", version="0.1.0", lifespan=_lifespan)
 
     origins = _resolve_allowed_origins(allowed_origins)
     _configure_cors(app, origins)
@@ -37,6 +49,32 @@ def create_app(*, allowed_origins: Iterable[str] | None = None) -> FastAPI:
     return app
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    프로세스 수명 동안 공유할 자원(DB 커넥션 풀 등)을 열고 닫는다.
+
+    자원을 열 때마다 정리 함수를 스택에 등록하므로, 시작 도중 실패해도 이미 연 자원은 역순으로 닫힌다.
+    """
+    async with AsyncExitStack() as stack:
+        open_pool()
+        stack.callback(close_pool)
+        await open_async_pool()
+        stack.push_async_callback(close_async_pool)
+        # 임베딩 재적재 알림(NOTIFY)을 받아 검색 캐시를 비운다
+        start_reload_listener()
+        stack.callback(stop_reload_listener)
+        # 첫 요청이 모델 로딩/연결 수립 비용을 떠안지 않도록 미리 한 번 임베딩한다
+        await get_embedding_client().awarm_up()
+        # LLM 클라이언트(커넥션 풀)와 서비스는 프로세스당 한 번만 만들어 요청 간에 공유한다
+        app.state.openai = create_async_openai_client()
+        stack.push_async_callback(app.state.openai.close)
+        stack.callback(close_openai_client)
+        app.state.services = build_services(app.state.openai, get_openai_client())
+        stack.push_async_callback(get_curriculum_cache().aclose)
+        yield
+
+
 def _resolve_allowed_origins(allowed_origins: Iterable[str] | None) -> List[str]:
     """
     허용할 CORS 오리진 목록을 결정한다.
@@ -110,8 +148,17 @@ def _register_routes(app: FastAPI) -> None:
 
 def _register_healthcheck(app: FastAPI) -> None:
     @app.get("/health", tags=["health"])
-    async def healthcheck() -> dict[str, str]:
-        return {"status": "ok"}
+    async def healthcheck() -> dict[str, Any]:
+        embedding = get_embedding_client().health()
+        return {
+            "status": "ok" if embedding["ready"] else "degraded",
+            "embedding": embedding,
+            "embedding_batcher": (
+                get_embedding_batcher().stats() if settings.embedding_microbatch_enabled else None
+            ),
+            "retrieval_cache": get_retrieval_cache().stats(),
+            "curriculum_cache": get_curriculum_cache().stats(),
+        }
 
 
 app = create_app()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from fastapi import Request
+from openai import AsyncOpenAI, OpenAI
+
+from rag_pipeline.services.chat_service import ChatService
+from rag_pipeline.services.curriculum_service import CurriculumService
+from rag_pipeline.services.feedback_service import FeedbackService
+from rag_pipeline.services.openai_client import OpenAIChatClient, OpenAIJSONClient
+from rag_pipeline.services.problem_service import ProblemGenerationService
+
+# 서비스 인스턴스는 앱 lifespan에서 한 번 만들어 app.state에 두고 요청마다 재사용한다.
+# (요청마다 OpenAI 클라이언트/커넥션 풀과 프롬프트를 새로 만들지 않도록)
+
+
+@dataclass
+class Services:
+    curriculum: CurriculumService
+    feedback: FeedbackService
+    problem: ProblemGenerationService
+    chat: ChatService
+
+
+def build_services(async_openai_client: AsyncOpenAI, openai_client: OpenAI) -> Services:
+    """공유 OpenAI 클라이언트(비동기/동기)를 주입한 서비스 묶음을 만든다."""
+    return Services(
+        curriculum=CurriculumService(openai_client=async_openai_client),
+        feedback=FeedbackService(openai_client=async_openai_client),
+        problem=ProblemGenerationService(client=OpenAIJSONClient(client=openai_client)),
+        chat=ChatService(
+            client=OpenAIChatClient(client=openai_client, async_client=async_openai_client),
+            async_openai_client=async_openai_client,
+        ),
+    )
+
+
+def get_services(request: Request) -> Services:
+    return request.app.state.services
+
+
+def get_curriculum_service(request: Request) -> CurriculumService:
+    return get_services(request).curriculum
+
+
+def get_feedback_service(request: Request) -> FeedbackService:
+    return get_services(request).feedback
+
+
+def get_problem_service(request: Request) -> ProblemGenerationService:
+    return get_services(request).problem
+
+
+def get_chat_service(request: Request) -> ChatService:
+    return get_services(request).chat
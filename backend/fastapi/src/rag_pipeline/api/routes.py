@@ -3,22 +3,30 @@
 import asyncio
 import json
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from rag_pipeline.services.chat_service import ChatService, get_chat_service
-from rag_pipeline.services.curriculum_service import CurriculumService, get_curriculum_service
-from rag_pipeline.services.feedback_service import FeedbackService, get_feedback_service
-from rag_pipeline.services.problem_service import ProblemGenerationService, get_problem_service
-
+from rag_pipeline.services.chat_service import ChatService
+from rag_pipeline.services.curriculum_service import CurriculumService
+from rag_pipeline.services.feedback_service import FeedbackService
+from rag_pipeline.services.openai_client import LLMTimeoutError
+from rag_pipeline.services.problem_service import ProblemGenerationService
+
+from .dependencies import (
+    get_chat_service,
+    get_curriculum_service,
+    get_feedback_service,
+    get_problem_service,
+)
 from .schemas import (
     ChatRequest,
     ChatResponse,
     CurriculumGenerationRequest,
     CurriculumGenerationResponse,
+    CurriculumNode,
     CurriculumUpdateRequest,
     CurriculumUpdateResponse,
     FeedbackRequest,
@@ -44,6 +52,18 @@ def _json_text_response(payload: BaseModel | dict[str, Any], filename: str) -> P
     return PlainTextResponse(content=content, media_type="text/plain; charset=utf-8", headers=headers)
 
 
+def _sse_event(event: str, data: BaseModel | dict[str, Any]) -> str:
+    if isinstance(data, BaseModel):
+        data = data.model_dump()
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    # 프록시(nginx 등)가 이벤트를 모아서 보내지 않도록 버퍼링을 끈다
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events, media_type="text/event-stream", headers=headers)
+
+
 @router.post(
     "/curriculum/generate",
     response_model=CurriculumGenerationResponse,
@@ -60,6 +80,9 @@ async def generate_curriculum(
     except json.JSONDecodeError as exc:
         logger.exception("Failed to parse LLM response for subject=%s, grade=%s", payload.subject, payload.grade)
         raise HTTPException(status_code=502, detail="LLM 응답 형식을 파싱하지 못했습니다") from exc
+    except LLMTimeoutError as exc:
+        logger.warning("Curriculum generation timed out for subject=%s, grade=%s", payload.subject, payload.grade)
+        raise HTTPException(status_code=504, detail="LLM 응답 시간이 초과되었습니다") from exc
     except ValueError as exc:
         logger.exception("Invalid curriculum data for subject=%s, grade=%s", payload.subject, payload.grade)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -68,6 +91,46 @@ async def generate_curriculum(
         raise HTTPException(status_code=500, detail="커리큘럼 생성 실패") from exc
 
 
+@router.post("/curriculum/generate/stream")
+async def stream_curriculum(
+    payload: CurriculumGenerationRequest,
+    service: CurriculumService = Depends(get_curriculum_service),
+) -> StreamingResponse:
+    """
+    커리큘럼 생성 결과를 SSE로 스트리밍.
+    노드가 완성·검증되는 대로 `node` 이벤트를, 끝나면 메타데이터와 함께 `done` 이벤트를 보낸다.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        nodes: list[CurriculumNode] = []
+        try:
+            async for node in service.stream_curriculum(payload):
+                yield _sse_event("node", {"index": len(nodes), "node": node.model_dump()})
+                nodes.append(node)
+        except LLMTimeoutError:
+            logger.warning("Curriculum stream timed out for subject=%s, grade=%s", payload.subject, payload.grade)
+            yield _sse_event("error", {"detail": "LLM 응답 시간이 초과되었습니다"})
+            return
+        except ValueError:
+            logger.exception("Invalid curriculum stream for subject=%s, grade=%s", payload.subject, payload.grade)
+            yield _sse_event("error", {"detail": "LLM 응답 형식을 파싱하지 못했습니다"})
+            return
+        except Exception:  # pragma: no cover - defensive logging
+            logger.exception("Failed to stream curriculum for subject=%s, grade=%s", payload.subject, payload.grade)
+            yield _sse_event("error", {"detail": "커리큘럼 생성 실패"})
+            return
+        yield _sse_event(
+            "done",
+            {
+                "subject": payload.subject,
+                "grade": payload.grade,
+                "metadata": CurriculumService.build_metadata(nodes),
+            },
+        )
+
+    return _sse_response(events())
+
+
 @router.post(
     "/assessment/generate",
     response_model=ProblemGenerationResponse,
@@ -101,6 +164,32 @@ async def create_chat_turn(
         raise HTTPException(status_code=500, detail="Failed to generate chat reply") from exc
 
 
+@router.post("/chat/stream")
+async def stream_chat_turn(
+    payload: ChatRequest,
+    service: ChatService = Depends(get_chat_service),
+) -> StreamingResponse:
+    """챗봇 응답을 SSE로 스트리밍. 토큰 조각마다 `token` 이벤트를, 끝나면 전체 응답과 함께 `done` 이벤트를 보낸다."""
+
+    async def events() -> AsyncIterator[str]:
+        parts: list[str] = []
+        try:
+            async for delta in service.stream_reply(payload):
+                parts.append(delta)
+                yield _sse_event("token", {"delta": delta})
+        except LLMTimeoutError:
+            logger.warning("Chat stream timed out")
+            yield _sse_event("error", {"detail": "LLM 응답 시간이 초과되었습니다"})
+            return
+        except Exception:  # pragma: no cover - defensive logging
+            logger.exception("Failed to stream chat reply")
+            yield _sse_event("error", {"detail": "Failed to generate chat reply"})
+            return
+        yield _sse_event("done", ChatResponse(reply="".join(parts)))
+
+    return _sse_response(events())
+
+
 @router.post(
     "/curriculum/update",
     response_model=CurriculumUpdateResponse,
@@ -23,11 +23,86 @@ class Settings(BaseSettings):
     data_roots: List[Path] = Field(alias="DATA_ROOTS")
     artifacts_root: Path = Field(alias="ARTIFACTS_ROOT")
     embedding_model: str = Field(alias="EMBEDDING_MODEL")
+    huggingface_token: str | None = Field(default=None, alias="HUGGINGFACE_TOKEN")
     openai_api_key: str = Field(alias="OPENAI_API_KEY")
     openai_model: str = Field(alias="OPENAI_MODEL")
     database_url: str = Field(alias="DATABASE_URL")
     environment: str = Field(alias="ENVIRONMENT")
 
+    # OpenAI HTTP 클라이언트: 프로세스당 하나를 공유하며 keep-alive 커넥션을 재사용한다
+    openai_timeout: float = Field(default=60.0, alias="OPENAI_TIMEOUT")
+    openai_connect_timeout: float = Field(default=5.0, alias="OPENAI_CONNECT_TIMEOUT")
+    openai_max_retries: int = Field(default=2, alias="OPENAI_MAX_RETRIES")
+    openai_http2: bool = Field(default=True, alias="OPENAI_HTTP2")
+    openai_max_connections: int = Field(default=100, alias="OPENAI_MAX_CONNECTIONS")
+    openai_max_keepalive_connections: int = Field(default=20, alias="OPENAI_MAX_KEEPALIVE_CONNECTIONS")
+    openai_keepalive_expiry: float = Field(default=30.0, alias="OPENAI_KEEPALIVE_EXPIRY")
+
+    # LLM 호출별 전체 제한 시간(초, 재시도 포함)
+    curriculum_llm_timeout: float = Field(default=120.0, alias="CURRICULUM_LLM_TIMEOUT")
+    feedback_llm_timeout: float = Field(default=60.0, alias="FEEDBACK_LLM_TIMEOUT")
+
+    # 임베딩 백엔드: "huggingface"(Inference API) 또는 "fastembed"(프로세스 내 ONNX Runtime)
+    embedding_backend: str = Field(default="huggingface", alias="EMBEDDING_BACKEND")
+    # fastembed 추론 스레드 수 (미설정 시 ONNX Runtime 기본값)
+    embedding_threads: int | None = Field(default=None, alias="EMBEDDING_THREADS")
+
+    # 토큰 단위 응답의 풀링 방식(mean/cls/max)과 L2 정규화 여부
+    embedding_pooling: str = Field(default="mean", alias="EMBEDDING_POOLING")
+    embedding_normalize: bool = Field(default=False, alias="EMBEDDING_NORMALIZE")
+
+    # 임베딩 요청 배치 크기와 동시에 보내는 배치 요청 수
+    embedding_batch_size: int = Field(default=32, alias="EMBEDDING_BATCH_SIZE")
+    embedding_max_concurrency: int = Field(default=4, alias="EMBEDDING_MAX_CONCURRENCY")
+
+    # 동시 요청의 질의 임베딩을 모아 한 번에 처리하는 마이크로 배칭 (비동기 경로)
+    embedding_microbatch_enabled: bool = Field(default=True, alias="EMBEDDING_MICROBATCH_ENABLED")
+    embedding_microbatch_max_size: int = Field(default=32, alias="EMBEDDING_MICROBATCH_MAX_SIZE")
+    embedding_microbatch_max_wait_ms: float = Field(default=5.0, alias="EMBEDDING_MICROBATCH_MAX_WAIT_MS")
+
+    # 질의 임베딩 영구 캐시 (기본 위치: ARTIFACTS_ROOT/query_embeddings.sqlite3)
+    embedding_cache_enabled: bool = Field(default=True, alias="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_path: Path | None = Field(default=None, alias="EMBEDDING_CACHE_PATH")
+    embedding_cache_memory_size: int = Field(default=4096, alias="EMBEDDING_CACHE_MEMORY_SIZE")
+
+    # pgvector 커넥션 풀 설정
+    db_pool_min_size: int = Field(default=1, alias="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(default=10, alias="DB_POOL_MAX_SIZE")
+    db_pool_timeout: float = Field(default=10.0, alias="DB_POOL_TIMEOUT")
+    db_pool_max_idle: float = Field(default=300.0, alias="DB_POOL_MAX_IDLE")
+    db_pool_max_lifetime: float = Field(default=1800.0, alias="DB_POOL_MAX_LIFETIME")
+
+    # ANN 인덱스 검색 파라미터 (미설정 시 pgvector 기본값 사용)
+    hnsw_ef_search: int | None = Field(default=None, alias="HNSW_EF_SEARCH")
+    ivfflat_probes: int | None = Field(default=None, alias="IVFFLAT_PROBES")
+
+    # 검색 엔진: "pgvector"(기본) 또는 "numpy"(VECTOR_STORE_PATH의 임베딩을 메모리에 적재)
+    # VECTOR_STORE_PATH는 바이너리 아티팩트 디렉터리 또는 embedding_cache.jsonl (기본값: ARTIFACTS_ROOT/embeddings)
+    retrieval_backend: str = Field(default="pgvector", alias="RETRIEVAL_BACKEND")
+    vector_store_path: Path | None = Field(default=None, alias="VECTOR_STORE_PATH")
+
+    # 하이브리드(어휘 + 벡터) 검색: RRF 상수와 각 검색의 후보 수
+    retrieval_hybrid: bool = Field(default=False, alias="RETRIEVAL_HYBRID")
+    hybrid_rrf_k: int = Field(default=60, alias="HYBRID_RRF_K")
+    hybrid_candidates: int = Field(default=40, alias="HYBRID_CANDIDATES")
+
+    # 검색 결과 캐시 (RETRIEVAL_CACHE_URL에 Redis URL을 지정하면 워커 간 공유)
+    retrieval_cache_enabled: bool = Field(default=True, alias="RETRIEVAL_CACHE_ENABLED")
+    retrieval_cache_size: int = Field(default=1024, alias="RETRIEVAL_CACHE_SIZE")
+    retrieval_cache_ttl: float = Field(default=600.0, alias="RETRIEVAL_CACHE_TTL")
+    retrieval_cache_url: str | None = Field(default=None, alias="RETRIEVAL_CACHE_URL")
+
+    # 생성된 커리큘럼 캐시 (stale-while-revalidate)
+    # TTL이 지나면 STALE_TTL 동안은 이전 결과를 즉시 반환하면서 백그라운드에서 새로 생성한다.
+    # VARIANTS가 2 이상이면 키마다 여러 결과를 모아 번갈아 반환한다.
+    # CURRICULUM_CACHE_URL 미설정 시 RETRIEVAL_CACHE_URL의 Redis를 함께 사용한다.
+    curriculum_cache_enabled: bool = Field(default=True, alias="CURRICULUM_CACHE_ENABLED")
+    curriculum_cache_ttl: float = Field(default=86400.0, alias="CURRICULUM_CACHE_TTL")
+    curriculum_cache_stale_ttl: float = Field(default=604800.0, alias="CURRICULUM_CACHE_STALE_TTL")
+    curriculum_cache_variants: int = Field(default=1, alias="CURRICULUM_CACHE_VARIANTS")
+    curriculum_cache_size: int = Field(default=512, alias="CURRICULUM_CACHE_SIZE")
+    curriculum_cache_url: str | None = Field(default=None, alias="CURRICULUM_CACHE_URL")
+
     @property
     def existing_data_roots(self) -> List[Path]:
         roots: List[Path] = []
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rag_pipeline.config import settings
+
+try:  # orjson은 Windows에서는 설치되지 않는다
+    import orjson as _json_impl
+except ImportError:  # pragma: no cover - platform dependent
+    import json as _json_impl  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+# 임베딩 코퍼스의 바이너리 아티팩트 (디렉터리 하나)
+#   manifest.json : 형식 버전, 모델, 차원, 행 수, 벡터 dtype, 범주형 컬럼의 어휘
+#   vectors.bin   : (행 수, 차원) 리틀 엔디언 float32/float16 행렬 (numpy.memmap으로 바로 연다)
+#   strings.bin   : 행마다 source_path/source_name/text 순서로 이어 붙인 UTF-8 바이트
+#   columns.npz   : 문자열 오프셋, 범주형 코드, 성취기준 코드 목록, 벡터 제곱 노름
+#                   (string_offsets는 길이 행 수 * 3 + 1. 행 i의 k번째 문자열 컬럼은
+#                    string_offsets[i*3+k]부터 string_offsets[i*3+k+1] 직전까지)
+# JSONL처럼 숫자를 문자열로 파싱할 필요가 없어 코퍼스 전체를 복사 없이 바로 열 수 있다.
+
+FORMAT_NAME = "studymate-embeddings"
+FORMAT_VERSION = 2
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.bin"
+STRINGS_FILE = "strings.bin"
+COLUMNS_FILE = "columns.npz"
+
+STRING_COLUMNS = ("source_path", "source_name", "text")
+CATEGORY_COLUMNS = ("grade", "subject", "sub_subject", "difficulty")
+
+_VECTOR_DTYPES = {"float32": np.dtype("<f4"), "float16": np.dtype("<f2")}
+
+
+def default_artifact_path() -> Path:
+    return settings.artifacts_root / "embeddings"
+
+
+def is_artifact(path: Path) -> bool:
+    return path.is_dir() and (path / MANIFEST_FILE).exists()
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """embedding_cache.jsonl의 레코드를 순서대로 읽는다."""
+    with path.open("rb") as infile:
+        for line_no, line in enumerate(infile, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield _json_impl.loads(line)
+            except ValueError as exc:
+                raise RuntimeError(f"JSON 파싱 오류 (line {line_no}): {exc}") from exc
+
+
+def encode_categories(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """문자열 값을 등장 순서대로 정수 코드로 바꾼다. (None은 -1)"""
+    lookup: Dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for idx, value in enumerate(values):
+        if value is None:
+            codes[idx] = -1
+            continue
+        code = lookup.get(value)
+        if code is None:
+            code = len(lookup)
+            lookup[value] = code
+        codes[idx] = code
+    return codes, list(lookup)
+
+
+class ArtifactWriter:
+    """
+    레코드를 하나씩 받아 아티팩트를 만든다.
+
+    벡터와 문자열은 임시 디렉터리의 파일에 바로 이어 쓰고, 작은 컬럼 배열만 메모리에 모은다.
+    close()에서 임시 디렉터리를 대상 경로로 교체하므로 읽는 쪽은 완성된 아티팩트만 본다.
+    """
+
+    def __init__(self, path: Path, *, model: str, dtype: str = "float32") -> None:
+        if dtype not in _VECTOR_DTYPES:
+            raise ValueError(f"지원하지 않는 벡터 dtype입니다: {dtype}")
+        self.path = path
+        self.model = model
+        self.dtype = dtype
+        self.dimension: Optional[int] = None
+        self.count = 0
+
+        self._temp_path = path.with_name(path.name + ".tmp")
+        shutil.rmtree(self._temp_path, ignore_errors=True)
+        self._temp_path.mkdir(parents=True)
+        self._vectors = (self._temp_path / VECTORS_FILE).open("wb")
+        self._strings = (self._temp_path / STRINGS_FILE).open("wb")
+        # 세 문자열 컬럼이 한 파일을 나눠 쓰므로 오프셋도 기록한 순서대로 한 배열에 모은다
+        self._string_offsets: List[int] = [0]
+        self._categories: Dict[str, List[Optional[str]]] = {column: [] for column in CATEGORY_COLUMNS}
+        self._code_lookup: Dict[str, int] = {}
+        self._code_offsets: List[int] = [0]
+        self._code_values: List[int] = []
+        self._sq_norms: List[float] = []
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        vector = np.asarray(record["embedding"], dtype=_VECTOR_DTYPES[self.dtype])
+        if vector.ndim != 1:
+            raise RuntimeError(f"잘못된 임베딩 형식: shape={vector.shape}")
+        if self.dimension is None:
+            self.dimension = vector.shape[0]
+        elif vector.shape[0] != self.dimension:
+            raise RuntimeError(f"임베딩 차원이 {self.dimension}이 아닙니다: {vector.shape[0]}")
+        self._vectors.write(vector.tobytes())
+        # float16으로 저장하면 반올림된 값 기준으로 노름을 계산해야 거리가 맞는다
+        as_float32 = vector.astype(np.float32)
+        self._sq_norms.append(float(np.dot(as_float32, as_float32)))
+
+        for column in STRING_COLUMNS:
+            encoded = (record.get(column) or "").encode("utf-8")
+            self._strings.write(encoded)
+            self._string_offsets.append(self._string_offsets[-1] + len(encoded))
+        for column in CATEGORY_COLUMNS:
+            self._categories[column].append(record.get(column) or None)
+        for code in record.get("achievement_codes") or []:
+            self._code_values.append(self._code_lookup.setdefault(code, len(self._code_lookup)))
+        self._code_offsets.append(len(self._code_values))
+        self.count += 1
+
+    def close(self) -> None:
+        self._vectors.close()
+        self._strings.close()
+        if self.count == 0 or self.dimension is None:
+            self.abort()
+            raise RuntimeError("아티팩트에 쓸 임베딩이 없습니다.")
+
+        columns: Dict[str, np.ndarray] = {"string_offsets": np.asarray(self._string_offsets, dtype=np.int64)}
+        vocabularies: Dict[str, List[str]] = {}
+        for column, values in self._categories.items():
+            columns[f"{column}_codes"], vocabularies[column] = encode_categories(values)
+        columns["achievement_codes_offsets"] = np.asarray(self._code_offsets, dtype=np.int64)
+        columns["achievement_codes"] = np.asarray(self._code_values, dtype=np.int32)
+        columns["sq_norms"] = np.asarray(self._sq_norms, dtype=np.float32)
+        vocabularies["achievement_codes"] = list(self._code_lookup)
+        np.savez(self._temp_path / COLUMNS_FILE, **columns)
+
+        manifest = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "model": self.model,
+            "dimension": self.dimension,
+            "count": self.count,
+            "dtype": self.dtype,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "vocabularies": vocabularies,
+        }
+        (self._temp_path / MANIFEST_FILE).write_text(
+            json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+        # 기존 아티팩트를 열어 둔 프로세스는 교체 후에도 이전 파일을 계속 읽는다
+        old_path = self.path.with_name(self.path.name + ".old")
+        shutil.rmtree(old_path, ignore_errors=True)
+        if self.path.exists():
+            os.replace(self.path, old_path)
+        os.replace(self._temp_path, self.path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    def abort(self) -> None:
+        self._vectors.close()
+        self._strings.close()
+        shutil.rmtree(self._temp_path, ignore_errors=True)
+
+
+def write_artifact(
+    records: Iterable[Dict[str, Any]],
+    path: Path,
+    *,
+    model: str,
+    dtype: str = "float32",
+) -> int:
+    """레코드(embedding_cache.jsonl과 같은 형태)를 아티팩트로 쓰고 행 수를 반환한다."""
+    with ArtifactWriter(path, model=model, dtype=dtype) as writer:
+        for record in records:
+            writer.append(record)
+    return writer.count
+
+
+class EmbeddingArtifact:
+    """
+    읽기 전용 아티팩트.
+
+    vectors는 파일을 그대로 매핑한 numpy.memmap이라 여는 비용이 행 수와 무관하고,
+    문자열은 요청한 행만 디코딩한다.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        manifest_path = path / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"임베딩 아티팩트가 아닙니다: {path}")
+        self.manifest: Dict[str, Any] = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if self.manifest.get("format") != FORMAT_NAME or self.manifest.get("version") != FORMAT_VERSION:
+            raise RuntimeError(
+                f"지원하지 않는 아티팩트 형식입니다: {self.manifest.get('format')} v{self.manifest.get('version')}"
+            )
+
+        self.vectors = np.memmap(
+            path / VECTORS_FILE,
+            dtype=_VECTOR_DTYPES[self.manifest["dtype"]],
+            mode="r",
+            shape=(self.count, self.dimension),
+        )
+        strings_path = path / STRINGS_FILE
+        self._strings = (
+            np.memmap(strings_path, dtype=np.uint8, mode="r")
+            if strings_path.stat().st_size
+            else np.empty(0, dtype=np.uint8)
+        )
+        with np.load(path / COLUMNS_FILE) as columns:
+            self._columns: Dict[str, np.ndarray] = {name: columns[name] for name in columns.files}
+        self._vocabularies: Dict[str, List[str]] = self.manifest["vocabularies"]
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def model(self) -> str:
+        return self.manifest["model"]
+
+    @property
+    def dimension(self) -> int:
+        return int(self.manifest["dimension"])
+
+    @property
+    def count(self) -> int:
+        return int(self.manifest["count"])
+
+    @property
+    def sq_norms(self) -> np.ndarray:
+        return self._columns["sq_norms"]
+
+    def string(self, column: str, idx: int) -> Optional[str]:
+        position = idx * len(STRING_COLUMNS) + STRING_COLUMNS.index(column)
+        offsets = self._columns["string_offsets"]
+        start, end = int(offsets[position]), int(offsets[position + 1])
+        return self._strings[start:end].tobytes().decode("utf-8") or None
+
+    def categories(self, column: str) -> Tuple[np.ndarray, List[str]]:
+        """범주형 컬럼의 (행별 코드, 어휘) 쌍. 코드 -1은 값 없음."""
+        return self._columns[f"{column}_codes"], self._vocabularies[column]
+
+    def category(self, column: str, idx: int) -> Optional[str]:
+        codes, vocabulary = self.categories(column)
+        code = int(codes[idx])
+        return vocabulary[code] if code >= 0 else None
+
+    def achievement_codes(self, idx: int) -> List[str]:
+        offsets = self._columns["achievement_codes_offsets"]
+        values = self._columns["achievement_codes"][offsets[idx] : offsets[idx + 1]]
+        vocabulary = self._vocabularies["achievement_codes"]
+        return [vocabulary[code] for code in values.tolist()]
+
+    def record(self, idx: int) -> Dict[str, Any]:
+        """임베딩을 제외한 한 행의 메타데이터."""
+        record: Dict[str, Any] = {column: self.string(column, idx) for column in STRING_COLUMNS}
+        for column in CATEGORY_COLUMNS:
+            record[column] = self.category(column, idx)
+        record["achievement_codes"] = self.achievement_codes(idx)
+        return record
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """embedding_cache.jsonl과 같은 형태의 레코드. float32 아티팩트의 embedding은 memmap 뷰다."""
+        for idx in range(self.count):
+            record = self.record(idx)
+            record["embedding"] = self.vectors[idx]
+            yield record
+
+
+def convert_jsonl(jsonl_path: Path, path: Path, *, model: str, dtype: str = "float32") -> int:
+    """embedding_cache.jsonl을 아티팩트로 변환한다."""
+    count = write_artifact(iter_jsonl(jsonl_path), path, model=model, dtype=dtype)
+    logger.info("Converted %d records from %s into artifact %s", count, jsonl_path, path)
+    return count
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from rag_pipeline.config import settings
+from rag_pipeline.embedding.local_embeddings import LocalEmbeddingClient, get_embedding_client
+
+logger = logging.getLogger(__name__)
+
+# 요청 간 동적 마이크로 배칭
+# 동시에 들어온 짧은 질의 임베딩 요청을 잠깐(max_wait) 모아 한 번의 배치 추론/HTTP 호출로 처리한다.
+# 같은 텍스트가 이미 대기 중이거나 처리 중이면 새 요청을 만들지 않고 그 결과를 함께 기다린다.
+
+
+class EmbeddingBatcher:
+    """
+    asyncio 기반 임베딩 스케줄러.
+
+    Args:
+        client: 실제 배치 임베딩을 수행할 클라이언트
+        max_batch_size: 한 번에 보낼 최대 텍스트 수. 가득 차면 기다리지 않고 바로 보낸다
+        max_wait: 첫 요청 이후 배치를 모으는 최대 시간(초)
+    """
+
+    def __init__(self, client: LocalEmbeddingClient, *, max_batch_size: int = 32, max_wait: float = 0.005) -> None:
+        self.client = client
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        # 아직 보내지 않은 텍스트와 처리 중인 텍스트 → 결과 future
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.coalesced = 0
+
+    async def embed(self, text: str) -> np.ndarray:
+        future = self._in_flight.get(text) or self._pending.get(text)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        # 한 호출자가 취소되어도 같은 텍스트를 기다리는 다른 호출자에게는 영향이 없도록 shield
+        vector = await asyncio.shield(future)
+        return vector.copy()
+
+    async def embed_many(self, texts: Sequence[str]) -> List[np.ndarray]:
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = {}
+        self._in_flight.update(batch)
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        # 태스크가 시작 전에 취소되면 _run의 코드가 전혀 실행되지 않으므로 정리는 완료 콜백에서 한다
+        task.add_done_callback(lambda _: self._finish(batch))
+
+    async def _run(self, batch: Dict[str, asyncio.Future]) -> None:
+        texts = list(batch)
+        self.batches += 1
+        try:
+            vectors = await self.client.aembed(texts)
+        except Exception as exc:
+            self._fail(batch, exc)
+            return
+        for text, vector in zip(texts, vectors):
+            future = batch[text]
+            if not future.done():
+                future.set_result(vector)
+
+    def _finish(self, batch: Dict[str, asyncio.Future]) -> None:
+        # 배치 태스크가 취소되어(앱 종료 등) 결과를 받지 못한 호출자가 영원히 기다리지 않게 한다
+        self._fail(batch, RuntimeError("Embedding batch was cancelled before it completed"))
+        for text, future in batch.items():
+            if self._in_flight.get(text) is future:
+                del self._in_flight[text]
+
+    @staticmethod
+    def _fail(batch: Dict[str, asyncio.Future], exc: BaseException) -> None:
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(exc)
+                # 기다리는 호출자가 모두 취소된 경우 "never retrieved" 경고를 막는다
+                future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+            "in_flight": len(self._in_flight),
+        }
+
+
+_batcher: Optional[EmbeddingBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """공유 임베딩 클라이언트를 사용하는 프로세스 전역 배처를 반환한다."""
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = EmbeddingBatcher(
+                    get_embedding_client(),
+                    max_batch_size=settings.embedding_microbatch_max_size,
+                    max_wait=settings.embedding_microbatch_max_wait_ms / 1000.0,
+                )
+    return _batcher
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rag_pipeline.config import resolve_path, settings
+from rag_pipeline.utils.cache import TTLCache
+from rag_pipeline.utils.text import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# 질의 임베딩 영구 캐시
+# 질의 어휘(학년/과목 조합, 단원명)가 반복되므로 (네임스페이스, 정규화된 텍스트 해시)별로 벡터를 저장해
+# 재시작 후에도 재사용한다. 네임스페이스는 모델과 벡터를 바꾸는 설정(백엔드/풀링/정규화)을 함께 담아
+# 설정을 바꾸면 이전 벡터를 쓰지 않는다. SQLite WAL 모드는 여러 uvicorn 워커의 동시 읽기와
+# 직렬화된 쓰기를 허용하고, 앞단의 인메모리 LRU가 반복 조회의 디스크 접근을 없앤다.
+
+_SQLITE_MAX_PARAMS = 500
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS query_embeddings (
+        model TEXT NOT NULL,
+        text_hash TEXT NOT NULL,
+        vector BLOB NOT NULL,
+        PRIMARY KEY (model, text_hash)
+    ) WITHOUT ROWID
+"""
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_query(text).encode("utf-8")).hexdigest()
+
+
+def cache_namespace(model: str, *, backend: str, pooling: str, normalize: bool) -> str:
+    """같은 텍스트라도 벡터가 달라지는 설정 조합마다 다른 캐시 네임스페이스. (model 컬럼에 저장)"""
+    return f"{model}|{backend}|{pooling}|{'normalized' if normalize else 'raw'}"
+
+
+class EmbeddingCache:
+    """
+    SQLite 기반 영구 임베딩 캐시와 그 앞의 인메모리 LRU.
+
+    벡터는 float32 BLOB으로 저장한다. SQLite 연결은 스레드마다 따로 연다.
+    """
+
+    def __init__(self, path: Path, *, memory_size: int = 4096) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._memory: TTLCache[Tuple[str, str], np.ndarray] = TTLCache(memory_size)
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            # 다른 워커가 쓰는 동안에는 잠금이 풀릴 때까지 기다린다
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, namespace: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """texts와 같은 순서로 캐시된 벡터(없으면 None)를 반환한다."""
+        hashes = [text_hash(text) for text in texts]
+        results: List[Optional[np.ndarray]] = []
+        for digest in hashes:
+            cached = self._memory.get((namespace, digest))
+            # 호출자가 결과를 수정해도 캐시가 오염되지 않도록 복사본을 돌려준다
+            results.append(cached.copy() if cached is not None else None)
+
+        missing: Dict[str, List[int]] = {}
+        for idx, (digest, vector) in enumerate(zip(hashes, results)):
+            if vector is None:
+                missing.setdefault(digest, []).append(idx)
+        if not missing:
+            return results
+
+        digests = list(missing)
+        try:
+            conn = self._connect()
+            for start in range(0, len(digests), _SQLITE_MAX_PARAMS):
+                chunk = digests[start : start + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM query_embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    (namespace, *chunk),
+                ).fetchall()
+                for digest, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32).copy()
+                    self._memory.set((namespace, digest), vector)
+                    for idx in missing[digest]:
+                        results[idx] = vector.copy()
+        except sqlite3.Error:
+            # 캐시 장애가 임베딩 실패로 이어지지 않게 한다
+            logger.warning("Embedding cache read failed (%s)", self.path, exc_info=True)
+        return results
+
+    def set_many(self, namespace: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        rows = []
+        for text, vector in zip(texts, vectors):
+            array = np.array(vector, dtype=np.float32)
+            if not array.size:
+                continue
+            digest = text_hash(text)
+            self._memory.set((namespace, digest), array)
+            rows.append((namespace, digest, array.tobytes()))
+        if not rows:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO query_embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error:
+            logger.warning("Embedding cache write failed (%s)", self.path, exc_info=True)
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """설정에 따라 프로세스 전역 임베딩 캐시를 반환한다. 비활성화되어 있으면 None."""
+    global _cache
+    if not settings.embedding_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                path = settings.embedding_cache_path or settings.artifacts_root / "query_embeddings.sqlite3"
+                if not path.is_absolute():
+                    path = resolve_path(path)
+                _cache = EmbeddingCache(path, memory_size=settings.embedding_cache_memory_size)
+                logger.info("Using persistent embedding cache at %s", path)
+    return _cache
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# fastembed(ONNX Runtime, CPU)로 프로세스 안에서 직접 임베딩을 계산하는 백엔드
+# 모델 로딩은 수 초가 걸리므로 (모델, 스레드 수) 조합마다 프로세스당 한 번만 로드한다.
+
+_models: Dict[Tuple[str, Optional[int]], "object"] = {}
+_models_lock = threading.Lock()
+
+
+def _load_model(model_name: str, threads: Optional[int]):
+    key = (model_name, threads)
+    model = _models.get(key)
+    if model is not None:
+        return model
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            try:
+                from fastembed import TextEmbedding
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "EMBEDDING_BACKEND=fastembed requires the 'fastembed' package to be installed."
+                ) from exc
+            try:
+                model = TextEmbedding(model_name=model_name, threads=threads)
+            except ValueError as exc:
+                raise RuntimeError(f"fastembed does not support embedding model '{model_name}'") from exc
+            logger.info("Loaded fastembed model '%s' (threads=%s)", model_name, threads or "auto")
+            _models[key] = model
+    return model
+
+
+class FastEmbedBackend:
+    """
+    fastembed TextEmbedding 래퍼.
+
+    ONNX Runtime 세션은 스레드 안전하므로 하나의 모델을 여러 요청이 함께 사용한다.
+    """
+
+    def __init__(self, model_name: str, *, threads: Optional[int] = None, batch_size: int = 32) -> None:
+        self.model_name = model_name
+        self.threads = threads
+        self.batch_size = batch_size
+        self._model = _load_model(model_name, threads)
+
+    def embed(self, texts: Sequence[str]) -> List[np.ndarray]:
+        # embed는 배치 단위로 추론한 결과를 입력 순서대로 내보내는 제너레이터를 반환한다
+        vectors = self._model.embed(list(texts), batch_size=self.batch_size)  # type: ignore[attr-defined]
+        return [np.asarray(vector, dtype=np.float32) for vector in vectors]
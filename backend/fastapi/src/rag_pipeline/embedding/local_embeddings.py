@@ -1,112 +1,386 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from contextlib import AbstractContextManager
-from typing import Iterable, List, Sequence
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
-from huggingface_hub import InferenceClient
+import numpy as np
+from huggingface_hub import AsyncInferenceClient, InferenceClient
 from huggingface_hub.utils import HfHubHTTPError
 
 from rag_pipeline.config import settings
+from rag_pipeline.embedding.cache import EmbeddingCache, cache_namespace, get_embedding_cache
+from rag_pipeline.embedding.fastembed_backend import FastEmbedBackend
+from rag_pipeline.embedding.pooling import POOLING_STRATEGIES, pad_token_embeddings, pool_embeddings
 
 logger = logging.getLogger(__name__)
 
+_WARMUP_TEXT = "임베딩 워밍업"
 
-class LocalEmbeddingClient(AbstractContextManager["LocalEmbeddingClient"]):
-    """Hugging Face Inference API 기반 텍스트 임베딩 클라이언트."""
+
+class LocalEmbeddingClient(
+    AbstractContextManager["LocalEmbeddingClient"],
+    AbstractAsyncContextManager["LocalEmbeddingClient"],
+):
+    """
+    텍스트 임베딩 클라이언트.
+
+    EMBEDDING_BACKEND에 따라 Hugging Face Inference API("huggingface") 또는
+    프로세스 안의 fastembed/ONNX Runtime 모델("fastembed")을 사용한다.
+    내부 클라이언트는 처음 사용할 때 한 번만 만들며, 여러 스레드/요청이 공유해도 안전하다.
+    API 서버는 get_embedding_client()로 프로세스 전역 인스턴스를 사용한다.
+    """
 
     def __init__(
         self,
         model_name: str | None = None,
         *,
         timeout: float = 30.0,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+        backend: str | None = None,
+        use_cache: bool = True,
     ) -> None:
         self.model_name = model_name or settings.embedding_model
+        self.backend = (backend or settings.embedding_backend).lower()
+        if self.backend not in ("huggingface", "fastembed"):
+            raise ValueError(f"Unsupported EMBEDDING_BACKEND: {self.backend}")
         self.timeout = timeout
+        self.batch_size = max(1, batch_size or settings.embedding_batch_size)
+        self.max_concurrency = max(1, max_concurrency or settings.embedding_max_concurrency)
+        self.pooling = settings.embedding_pooling.lower()
+        if self.pooling not in POOLING_STRATEGIES:
+            raise ValueError(f"Unsupported EMBEDDING_POOLING: {settings.embedding_pooling}")
+        self.normalize = settings.embedding_normalize
+        # 배치 응답이 ragged(입력마다 토큰 수가 다름)여서 텍스트별 요청으로 전환했는지 여부
+        self._per_text_requests = False
         self._client: InferenceClient | None = None
+        self._async_client: AsyncInferenceClient | None = None
+        self._local: FastEmbedBackend | None = None
+        self._cache: EmbeddingCache | None = get_embedding_cache() if use_cache else None
+        self._cache_namespace = cache_namespace(
+            self.model_name, backend=self.backend, pooling=self.pooling, normalize=self.normalize
+        )
         self._token = settings.huggingface_token
+        self._init_lock = threading.Lock()
+        # 워밍업 결과 (/health 준비 상태 보고용)
+        self.ready = False
+        self.last_error: str | None = None
+        self.warmup_seconds: float | None = None
 
     def __enter__(self) -> "LocalEmbeddingClient":
-        if self._client is None:
-            self._client = self._build_client()
+        if self.backend == "fastembed":
+            self._local_backend()
+        else:
+            self._sync_client()
         return self
 
     def __exit__(self, exc_type, exc, exc_tb) -> bool:
         return False
 
-    def embed(self, texts: Sequence[str] | Iterable[str]) -> List[List[float]]:
+    async def __aenter__(self) -> "LocalEmbeddingClient":
+        if self.backend == "fastembed":
+            # 첫 모델 로딩은 수 초가 걸리므로 이벤트 루프 밖에서 수행
+            await asyncio.to_thread(self._local_backend)
+        else:
+            self._async_inference_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, exc_tb) -> bool:
+        return False
+
+    def embed(self, texts: Sequence[str] | Iterable[str]) -> List[np.ndarray]:
+        """
+        텍스트 목록을 임베딩한다.
+
+        영구 캐시(EMBEDDING_CACHE_ENABLED)에 있는 텍스트는 건너뛰고, 나머지는 batch_size개씩
+        묶어 최대 max_concurrency개의 요청을 동시에 보낸다. 반환 순서는 입력 순서와 같다.
+        """
         texts_list = list(texts)
         if not texts_list:
             logger.warning("Called embed with empty input sequence.")
             return []
+        if self._cache is None:
+            vectors = self._embed_uncached(texts_list)
+            self._mark_ready()
+            return vectors
+
+        vectors = self._cache.get_many(self._cache_namespace, texts_list)
+        pending = self._pending(texts_list, vectors)
+        if pending:
+            computed = self._embed_uncached(list(pending))
+            self._mark_ready()
+            self._cache.set_many(self._cache_namespace, list(pending), computed)
+            self._fill(vectors, pending, computed)
+        return vectors  # type: ignore[return-value]
+
+    async def aembed(self, texts: Sequence[str] | Iterable[str]) -> List[np.ndarray]:
+        """embed의 비동기 버전. HTTP 요청을 기다리는 동안 이벤트 루프를 양보한다."""
+        texts_list = list(texts)
+        if not texts_list:
+            logger.warning("Called aembed with empty input sequence.")
+            return []
+        if self._cache is None:
+            vectors = await self._aembed_uncached(texts_list)
+            self._mark_ready()
+            return vectors
+
+        # SQLite 조회/저장은 디스크 I/O이므로 스레드에서 실행한다
+        vectors = await asyncio.to_thread(self._cache.get_many, self._cache_namespace, texts_list)
+        pending = self._pending(texts_list, vectors)
+        if pending:
+            computed = await self._aembed_uncached(list(pending))
+            self._mark_ready()
+            await asyncio.to_thread(self._cache.set_many, self._cache_namespace, list(pending), computed)
+            self._fill(vectors, pending, computed)
+        return vectors  # type: ignore[return-value]
 
-        client = self._client or self._build_client()
-        embeddings: List[List[float]] = []
-        for text in texts_list:
+    @staticmethod
+    def _pending(texts: List[str], vectors: List[Optional[np.ndarray]]) -> Dict[str, List[int]]:
+        # 캐시에 없는 텍스트 → 입력 위치 목록. 같은 텍스트는 한 번만 임베딩한다.
+        pending: Dict[str, List[int]] = {}
+        for idx, (text, vector) in enumerate(zip(texts, vectors)):
+            if vector is None:
+                pending.setdefault(text, []).append(idx)
+        return pending
+
+    @staticmethod
+    def _fill(
+        vectors: List[Optional[np.ndarray]],
+        pending: Dict[str, List[int]],
+        computed: List[np.ndarray],
+    ) -> None:
+        for positions, vector in zip(pending.values(), computed):
+            for idx in positions:
+                vectors[idx] = vector.copy()
+
+    def _embed_uncached(self, texts_list: List[str]) -> List[np.ndarray]:
+        if self.backend == "fastembed":
+            return self._local_backend().embed(texts_list)
+
+        client = self._sync_client()
+        batches = self._batches(texts_list)
+        if len(batches) == 1:
+            return self._embed_batch(client, batches[0])
+
+        workers = min(self.max_concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hf-embed") as executor:
+            # map은 제출 순서대로 결과를 돌려주므로 입력 순서가 유지된다
+            results = executor.map(lambda batch: self._embed_batch(client, batch), batches)
+            return [vector for batch_vectors in results for vector in batch_vectors]
+
+    async def _aembed_uncached(self, texts_list: List[str]) -> List[np.ndarray]:
+        if self.backend == "fastembed":
+            # ONNX Runtime 추론은 GIL을 놓고 실행되므로 스레드로 넘겨 이벤트 루프를 막지 않는다
+            return await asyncio.to_thread(self._local_backend().embed, texts_list)
+
+        client = self._async_inference_client()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch: List[str]) -> List[np.ndarray]:
+            async with semaphore:
+                return await self._aembed_batch(client, batch)
+
+        results = await asyncio.gather(*(run(batch) for batch in self._batches(texts_list)))
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [texts[start : start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+
+    def _embed_batch(self, client: InferenceClient, batch: List[str]) -> List[np.ndarray]:
+        if not self._per_text_requests:
             try:
-                raw = client.feature_extraction(text, timeout=self.timeout)
-            except HfHubHTTPError as exc:
-                logger.exception("Failed to fetch embeddings from Hugging Face (model=%s)", self.model_name)
-                raise RuntimeError("Hugging Face embedding request failed") from exc
+                # 입력 목록을 한 번에 보내면 응답의 첫 번째 축이 입력 순서와 대응한다
+                raw = self._feature_extraction(client, batch)
+            except ValueError:
+                if len(batch) == 1:
+                    raise
+                self._switch_to_per_text()
+            else:
+                return self._split_batch(raw, len(batch))
+        # 입력 하나짜리 목록의 응답은 (1, tokens, dim)이므로 첫 원소를 꺼내 패딩 풀링에 넘긴다
+        raw_items = [self._feature_extraction(client, [text])[0] for text in batch]
+        return self._split_batch(raw_items, len(batch))
 
-            pooled = self._pool_embedding(raw)
-            if not pooled:
-                logger.warning("Received empty embedding vector from Hugging Face model '%s'", self.model_name)
-            embeddings.append(pooled)
+    async def _aembed_batch(self, client: AsyncInferenceClient, batch: List[str]) -> List[np.ndarray]:
+        if not self._per_text_requests:
+            try:
+                raw = await self._afeature_extraction(client, batch)
+            except ValueError:
+                if len(batch) == 1:
+                    raise
+                self._switch_to_per_text()
+            else:
+                return self._split_batch(raw, len(batch))
+        raw_items = await asyncio.gather(*(self._afeature_extraction(client, [text]) for text in batch))
+        return self._split_batch([raw[0] for raw in raw_items], len(batch))
 
-        return embeddings
+    def _feature_extraction(self, client: InferenceClient, inputs: List[str]) -> object:
+        try:
+            return client.feature_extraction(inputs)  # type: ignore[arg-type]
+        except HfHubHTTPError as exc:
+            logger.exception("Failed to fetch embeddings from Hugging Face (model=%s)", self.model_name)
+            raise RuntimeError("Hugging Face embedding request failed") from exc
 
-    def _build_client(self) -> InferenceClient:
+    async def _afeature_extraction(self, client: AsyncInferenceClient, inputs: List[str]) -> object:
+        try:
+            return await client.feature_extraction(inputs)  # type: ignore[arg-type]
+        except HfHubHTTPError as exc:
+            logger.exception("Failed to fetch embeddings from Hugging Face (model=%s)", self.model_name)
+            raise RuntimeError("Hugging Face embedding request failed") from exc
+
+    def _switch_to_per_text(self) -> None:
+        # huggingface_hub는 응답을 np.array(dtype=float32)로 변환하는데, 토큰 단위 출력을 내는 모델은
+        # 입력마다 토큰 수가 달라 배치 응답이 ragged 배열이 되어 ValueError가 난다.
+        # 이 경우 이후 요청은 텍스트별로 보내고 패딩 + attention mask로 풀링한다.
+        if not self._per_text_requests:
+            self._per_text_requests = True
+            logger.warning(
+                "Model '%s' returned ragged token-level embeddings for a batch; "
+                "falling back to one request per text",
+                self.model_name,
+            )
+
+    def _split_batch(self, raw: object, expected: int) -> List[np.ndarray]:
+        items = raw if raw is not None else []
+        count = len(items)  # type: ignore[arg-type]
+        if count != expected:
+            raise RuntimeError(
+                f"Hugging Face returned {count} embeddings for {expected} inputs (model={self.model_name})"
+            )
+        pooled = self._pool_embedding(items)
+        if pooled.shape[1] == 0:
+            logger.warning("Received empty embedding vector from Hugging Face model '%s'", self.model_name)
+        return list(pooled)
+
+    def _pool_embedding(self, raw_batch: object) -> np.ndarray:
+        """
+        배치 feature-extraction 응답을 (batch, dim) float32 배열로 변환한다.
+
+        sentence-transformers 계열 모델은 토큰별 벡터를 반환하므로 EMBEDDING_POOLING 방식
+        (mean/cls/max)으로 문장 임베딩을 만든다. 이미 풀링된 (batch, dim) 응답은 그대로 쓴다.
+        """
+        if isinstance(raw_batch, np.ndarray) and raw_batch.ndim in (2, 3):
+            # 길이가 같은 응답은 배치 전체를 한 번에 풀링
+            return pool_embeddings(raw_batch, strategy=self.pooling, normalize=self.normalize)
+        # 토큰 길이가 달라 리스트로 온 응답은 패딩 + attention mask로 맞춰 한 번에 풀링
+        hidden, mask = pad_token_embeddings(raw_batch)  # type: ignore[arg-type]
+        if hidden.shape[1] == 1:
+            # 항목마다 1차원 벡터였다면 이미 풀링된 응답
+            hidden = hidden[:, 0, :]
+        return pool_embeddings(hidden, mask, strategy=self.pooling, normalize=self.normalize)
+
+    def _ensure_token(self) -> str:
         if not self._token:
             raise RuntimeError(
                 "HUGGINGFACE_TOKEN is not configured but Hugging Face embeddings were requested."
             )
+        return self._token
 
-        logger.info("Using Hugging Face Inference API model '%s' for embeddings", self.model_name)
-        return InferenceClient(model=self.model_name, token=self._token)
-
-    @staticmethod
-    def _pool_embedding(raw_embedding: object) -> List[float]:
+    def warm_up(self) -> bool:
         """
-        Hugging Face feature-extraction 응답을 1차원 벡터로 변환한다.
+        캐시를 거치지 않고 짧은 문장을 임베딩해 모델 로딩/HTTP 연결을 미리 끝낸다.
 
-        sentence-transformers 계열 모델은 토큰별 벡터(2차원 리스트)를 반환하므로
-        평균 풀링으로 단일 문장 임베딩을 만든다.
+        실패해도 예외를 올리지 않고 준비 상태(ready=False)와 오류를 기록한다.
         """
-        if raw_embedding is None:
-            return []
+        started = time.perf_counter()
+        try:
+            self._embed_uncached([_WARMUP_TEXT])
+        except Exception as exc:
+            self._record_warmup(started, exc)
+        else:
+            self._record_warmup(started, None)
+        return self.ready
 
-        if isinstance(raw_embedding, list):
-            if not raw_embedding:
-                return []
-
-            first = raw_embedding[0]
-            if isinstance(first, list):
-                # 평균 풀링
-                length = len(first)
-                accumulator = [0.0] * length
-                for token_vector in raw_embedding:
-                    for idx, value in enumerate(token_vector):
-                        accumulator[idx] += float(value)
-                token_count = len(raw_embedding)
-                if token_count == 0:
-                    return []
-                return [value / token_count for value in accumulator]
-
-            # 이미 1차원 벡터라면 그대로 반환
-            return [float(x) for x in raw_embedding]
-
-        # numpy.ndarray 등 다른 형식은 리스트로 변환 시도
+    async def awarm_up(self) -> bool:
+        """warm_up의 비동기 버전. API 서버 시작(lifespan) 시 호출한다."""
+        started = time.perf_counter()
         try:
-            import numpy as np  # type: ignore
-
-            if isinstance(raw_embedding, np.ndarray):
-                if raw_embedding.ndim == 1:
-                    return raw_embedding.astype(float).tolist()
-                if raw_embedding.ndim == 2 and raw_embedding.shape[0] > 0:
-                    return raw_embedding.mean(axis=0).astype(float).tolist()
-        except Exception:  # pragma: no cover - numpy optional
-            pass
-
-        logger.warning("Unsupported embedding response type: %r", type(raw_embedding))
-        return []
+            await self._aembed_uncached([_WARMUP_TEXT])
+        except Exception as exc:
+            self._record_warmup(started, exc)
+        else:
+            self._record_warmup(started, None)
+        return self.ready
+
+    def _record_warmup(self, started: float, error: Exception | None) -> None:
+        self.warmup_seconds = time.perf_counter() - started
+        self.ready = error is None
+        self.last_error = None if error is None else str(error)
+        if error is None:
+            logger.info(
+                "Embedding client warmed up in %.2fs (backend=%s, model=%s)",
+                self.warmup_seconds,
+                self.backend,
+                self.model_name,
+            )
+        else:
+            logger.warning("Embedding warm-up failed (backend=%s): %s", self.backend, error)
+
+    def _mark_ready(self) -> None:
+        # 워밍업이 실패했더라도 이후 임베딩이 성공하면 준비 상태로 본다
+        if not self.ready:
+            self.ready = True
+            self.last_error = None
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "backend": self.backend,
+            "model": self.model_name,
+            "warmup_seconds": round(self.warmup_seconds, 3) if self.warmup_seconds is not None else None,
+            "error": self.last_error,
+        }
+
+    def _local_backend(self) -> FastEmbedBackend:
+        if self._local is None:
+            with self._init_lock:
+                if self._local is None:
+                    self._local = FastEmbedBackend(
+                        self.model_name,
+                        threads=settings.embedding_threads,
+                        batch_size=self.batch_size,
+                    )
+        return self._local
+
+    def _sync_client(self) -> InferenceClient:
+        if self._client is None:
+            with self._init_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _async_inference_client(self) -> AsyncInferenceClient:
+        if self._async_client is None:
+            with self._init_lock:
+                if self._async_client is None:
+                    self._async_client = self._build_async_client()
+        return self._async_client
+
+    def _build_client(self) -> InferenceClient:
+        token = self._ensure_token()
+        logger.info("Using Hugging Face Inference API model '%s' for embeddings", self.model_name)
+        return InferenceClient(model=self.model_name, token=token, timeout=self.timeout)
+
+    def _build_async_client(self) -> AsyncInferenceClient:
+        token = self._ensure_token()
+        logger.info("Using async Hugging Face Inference API model '%s' for embeddings", self.model_name)
+        return AsyncInferenceClient(model=self.model_name, token=token, timeout=self.timeout)
+
+
+_shared_client: Optional[LocalEmbeddingClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_embedding_client() -> LocalEmbeddingClient:
+    """프로세스 전역 임베딩 클라이언트를 반환한다. (요청마다 HTTP 세션/모델을 새로 만들지 않도록)"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = LocalEmbeddingClient()
+    return _shared_client
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# 토큰 단위 임베딩을 문장 임베딩으로 모으는 풀링 연산 (NumPy 벡터화)
+
+POOLING_STRATEGIES = ("mean", "cls", "max")
+
+
+def pad_token_embeddings(items: Sequence[object]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    길이가 다른 토큰 임베딩 목록을 (batch, tokens, dim) 배열과 attention mask로 맞춘다.
+
+    1차원 벡터는 토큰 하나짜리로 취급한다.
+    """
+    arrays = [np.atleast_2d(np.asarray(item, dtype=np.float32)) for item in items]
+    dim = max((array.shape[-1] for array in arrays if array.size), default=0)
+    max_tokens = max((array.shape[0] for array in arrays if array.size), default=0)
+    hidden = np.zeros((len(arrays), max_tokens, dim), dtype=np.float32)
+    mask = np.zeros((len(arrays), max_tokens), dtype=bool)
+    for idx, array in enumerate(arrays):
+        if not array.size:
+            continue
+        hidden[idx, : array.shape[0]] = array
+        mask[idx, : array.shape[0]] = True
+    return hidden, mask
+
+
+def pool_embeddings(
+    hidden: np.ndarray,
+    attention_mask: Optional[np.ndarray] = None,
+    *,
+    strategy: str = "mean",
+    normalize: bool = False,
+) -> np.ndarray:
+    """
+    배치 임베딩을 (batch, dim) float32 배열로 풀링한다.
+
+    Args:
+        hidden: (batch, tokens, dim) 토큰 임베딩 또는 이미 풀링된 (batch, dim) 배열
+        attention_mask: (batch, tokens) 마스크. 패딩 토큰은 mean/max 계산에서 제외
+        strategy: "mean", "cls"(첫 토큰), "max"
+        normalize: 참이면 결과를 L2 정규화
+    """
+    if strategy not in POOLING_STRATEGIES:
+        raise ValueError(f"Unsupported pooling strategy: {strategy}")
+    hidden = np.asarray(hidden, dtype=np.float32)
+
+    if hidden.ndim == 2:
+        pooled = hidden
+    elif hidden.ndim != 3:
+        raise ValueError(f"Expected a 2-D or 3-D embedding array, got shape {hidden.shape}")
+    elif hidden.shape[1] == 0:
+        pooled = np.zeros((hidden.shape[0], hidden.shape[2]), dtype=np.float32)
+    elif strategy == "cls":
+        pooled = hidden[:, 0, :]
+    elif attention_mask is None:
+        pooled = hidden.mean(axis=1) if strategy == "mean" else hidden.max(axis=1)
+    elif strategy == "mean":
+        weights = np.asarray(attention_mask, dtype=np.float32)
+        counts = np.maximum(weights.sum(axis=1, keepdims=True), 1.0)
+        pooled = np.einsum("btd,bt->bd", hidden, weights) / counts
+    else:
+        mask = np.asarray(attention_mask, dtype=bool)
+        pooled = np.where(mask[:, :, None], hidden, -np.inf).max(axis=1)
+        # 토큰이 하나도 없는 행은 0 벡터로 둔다
+        pooled[~mask.any(axis=1)] = 0.0
+
+    if normalize:
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        pooled = pooled / np.maximum(norms, 1e-12)
+    return np.ascontiguousarray(pooled, dtype=np.float32)
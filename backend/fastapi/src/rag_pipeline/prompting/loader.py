@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 import yaml
 
@@ -18,6 +19,17 @@ class PromptTemplate:
     version: str
 
 
+@lru_cache(maxsize=64)
+def _read_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    # 수정 시각을 키에 포함해 파일이 바뀌었을 때만 다시 읽는다
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _load_yaml(prompt_path: Path) -> Dict[str, Any]:
+    return _read_yaml(str(prompt_path), prompt_path.stat().st_mtime_ns)
+
+
 class PromptLoader:
     """
     프롬프트 템플릿을 로드하는 통합 클래스
@@ -43,8 +55,7 @@ class PromptLoader:
         if not prompt_path.exists():
             raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
         
-        with prompt_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(prompt_path)
         
         return {
             "system": data.get("system", ""),
@@ -65,8 +76,7 @@ class PromptLoader:
         if not prompt_path.exists():
             raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
 
-        with prompt_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml(prompt_path)
 
         return PromptTemplate(
             name=data.get("name", prompt_path.stem),
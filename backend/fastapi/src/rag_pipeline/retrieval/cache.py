@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import psycopg
+
+from rag_pipeline.config import settings
+from rag_pipeline.retrieval.pool import resolve_dsn
+from rag_pipeline.utils.cache import CacheBackend, create_cache_backend
+from rag_pipeline.utils.text import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# 검색 결과 캐시
+# 같은 (질의, 필터, limit) 조합이 반복되므로 임베딩 + SQL 왕복 결과를 재사용한다.
+# load_embeddings가 테이블을 다시 적재하면 NOTIFY로 모든 워커의 캐시를 비운다.
+
+RELOAD_CHANNEL = "rag_embeddings_reloaded"
+
+
+class RetrievalCache:
+    """검색 결과 캐시. 적중/실패 횟수를 집계한다."""
+
+    def __init__(self, backend: CacheBackend, *, enabled: bool = True) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # 무효화 세대. 조회 시작 후 무효화가 일어나면 오래된 결과를 저장하지 않는다.
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind: str, query: str, **params: Any) -> str:
+        normalized = {key: (value or None) for key, value in sorted(params.items())}
+        raw = json.dumps([kind, normalize_query(query), normalized], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, *, generation: Optional[int] = None) -> None:
+        if not self.enabled:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        self.backend.set(key, value)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        if self.backend.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, *, generation: Optional[int] = None) -> None:
+        if self.backend.blocking:
+            await asyncio.to_thread(self.set, key, value, generation=generation)
+        else:
+            self.set(key, value, generation=generation)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+        self.backend.clear()
+        logger.info("Retrieval cache invalidated (generation=%d)", self.generation)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": self.backend.size(),
+        }
+
+
+_cache: Optional[RetrievalCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """설정에 따라 프로세스 전역 검색 캐시를 만들어 반환한다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend = create_cache_backend(
+                    url=settings.retrieval_cache_url,
+                    namespace="rag:retrieval",
+                    maxsize=settings.retrieval_cache_size,
+                    ttl=settings.retrieval_cache_ttl,
+                )
+                _cache = RetrievalCache(backend, enabled=settings.retrieval_cache_enabled)
+    return _cache
+
+
+def notify_reload(conn: psycopg.Connection) -> None:
+    """임베딩 테이블이 다시 적재되었음을 모든 API 워커에 알린다."""
+    conn.execute(f"NOTIFY {RELOAD_CHANNEL}")
+    conn.commit()
+
+
+_reload_callbacks: List[Callable[[], None]] = []
+
+
+def register_reload_callback(callback: Callable[[], None]) -> None:
+    """재적재 알림을 받았을 때 검색 캐시 무효화와 함께 실행할 콜백을 등록한다."""
+    if callback not in _reload_callbacks:
+        _reload_callbacks.append(callback)
+
+
+class _ReloadListener(threading.Thread):
+    """LISTEN 전용 연결로 재적재 알림을 기다렸다가 콜백을 실행하는 백그라운드 스레드."""
+
+    def __init__(self) -> None:
+        super().__init__(name="rag-reload-listener", daemon=True)
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                with psycopg.connect(resolve_dsn(), autocommit=True) as conn:
+                    conn.execute(f"LISTEN {RELOAD_CHANNEL}")
+                    while not self._stop_event.is_set():
+                        for _ in conn.notifies(timeout=1.0):
+                            self._fire()
+            except Exception:
+                logger.warning("Reload listener connection failed; retrying", exc_info=True)
+                self._stop_event.wait(5.0)
+
+    def _fire(self) -> None:
+        for callback in [get_retrieval_cache().invalidate, *_reload_callbacks]:
+            try:
+                callback()
+            except Exception:  # pragma: no cover - defensive logging
+                logger.exception("Reload callback failed")
+
+
+_listener: Optional[_ReloadListener] = None
+
+
+def start_reload_listener() -> None:
+    """재적재 알림을 받으면 검색 캐시를 비우고 등록된 콜백을 실행하는 리스너를 시작한다."""
+    global _listener
+    if _listener is not None:
+        return
+    _listener = _ReloadListener()
+    _listener.start()
+
+
+def stop_reload_listener() -> None:
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener.join(timeout=5.0)
+    _listener = None
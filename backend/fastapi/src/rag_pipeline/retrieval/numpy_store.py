@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from rag_pipeline.embedding.artifact import EmbeddingArtifact, encode_categories, is_artifact, iter_jsonl
+
+logger = logging.getLogger(__name__)
+
+# 임베딩 코퍼스 전체를 메모리에 올려 pgvector 없이 검색하는 엔진
+# 코퍼스가 작을 때는 DB 왕복 없이 행렬 연산 한 번으로 top-k를 구할 수 있고,
+# Postgres가 없는 테스트/벤치마크 환경에서도 같은 인터페이스로 사용할 수 있다.
+
+_FILTER_COLUMNS = ("grade", "subject", "sub_subject")
+
+
+class _CategoricalColumn:
+    """문자열 컬럼을 정수 코드로 사전 인코딩해 필터 마스크를 빠르게 만든다."""
+
+    def __init__(self, codes: np.ndarray, vocabulary: Sequence[str]) -> None:
+        self.codes = codes
+        self.lookup: Dict[str, int] = {value: code for code, value in enumerate(vocabulary)}
+
+    def mask(self, value: str) -> np.ndarray:
+        code = self.lookup.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+
+class _RecordSource(Protocol):
+    def record(self, idx: int) -> Dict[str, Any]: ...
+
+    def categories(self, column: str) -> Tuple[np.ndarray, List[str]]: ...
+
+
+class _ListRecords:
+    """JSONL에서 읽은 메타데이터를 컬럼별 리스트로 보관한다."""
+
+    def __init__(self, metadata: Dict[str, List[Any]]) -> None:
+        self._metadata = metadata
+
+    def record(self, idx: int) -> Dict[str, Any]:
+        return {key: values[idx] for key, values in self._metadata.items()}
+
+    def categories(self, column: str) -> Tuple[np.ndarray, List[str]]:
+        return encode_categories(self._metadata[column])
+
+
+class NumpyVectorStore:
+    """
+    연속된 float32 행렬과 컬럼형 메타데이터로 구성된 인메모리 벡터 검색 엔진.
+
+    PgvectorEngine과 같은 search/search_many/search_tiered 인터페이스를 제공하며,
+    거리는 pgvector의 L2 거리(<->)와 같은 값을 반환한다.
+    메타데이터는 top-k로 뽑힌 행만 records에서 꺼낸다.
+    """
+
+    name = "numpy"
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        records: _RecordSource,
+        *,
+        sq_norms: Optional[np.ndarray] = None,
+        snapshot: str = "",
+    ) -> None:
+        # float32 memmap은 복사 없이 그대로 쓰고, float16 아티팩트만 float32로 변환한다
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        # ||x||^2을 미리 계산해 두면 질의마다 행렬-벡터 곱 한 번으로 L2 거리를 구할 수 있다
+        self._sq_norms = sq_norms if sq_norms is not None else np.einsum("ij,ij->i", self.vectors, self.vectors)
+        self._records = records
+        self.snapshot = snapshot
+        self._categorical = {key: _CategoricalColumn(*records.categories(key)) for key in _FILTER_COLUMNS}
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    @classmethod
+    def open(cls, path: Path) -> "NumpyVectorStore":
+        """경로가 바이너리 아티팩트 디렉터리면 from_artifact, 아니면 from_jsonl로 연다."""
+        if is_artifact(path):
+            return cls.from_artifact(path)
+        return cls.from_jsonl(path)
+
+    @classmethod
+    def from_artifact(cls, path: Path) -> "NumpyVectorStore":
+        """바이너리 아티팩트를 memmap으로 열어 검색 엔진을 만든다."""
+        artifact = EmbeddingArtifact(path)
+        store = cls(artifact.vectors, artifact, sq_norms=artifact.sq_norms, snapshot=artifact.manifest["created_at"])
+        logger.info(
+            "Opened %d vectors (dim=%d, %s) from artifact %s",
+            len(store),
+            artifact.dimension,
+            artifact.manifest["dtype"],
+            path,
+        )
+        return store
+
+    @classmethod
+    def from_jsonl(cls, path: Path) -> "NumpyVectorStore":
+        """embedding_cache.jsonl을 읽어 검색 엔진을 만든다."""
+        vectors: List[Sequence[float]] = []
+        metadata: Dict[str, List[Any]] = {
+            key: []
+            for key in (
+                "source_name",
+                "grade",
+                "subject",
+                "sub_subject",
+                "difficulty",
+                "achievement_codes",
+                "text",
+            )
+        }
+        for payload in iter_jsonl(path):
+            embedding = payload.get("embedding")
+            if not isinstance(embedding, list):
+                continue
+            vectors.append(embedding)
+            for key, values in metadata.items():
+                default: Any = [] if key == "achievement_codes" else None
+                values.append(payload.get(key) or default)
+
+        if not vectors:
+            raise RuntimeError(f"임베딩이 없는 파일입니다: {path}")
+
+        store = cls(
+            np.asarray(vectors, dtype=np.float32),
+            _ListRecords(metadata),
+            snapshot=str(path.stat().st_mtime_ns),
+        )
+        logger.info(
+            "Loaded %d vectors (dim=%d) into NumPy vector store from %s",
+            len(store),
+            store.vectors.shape[1],
+            path,
+        )
+        return store
+
+    # --- 내부 연산 ---------------------------------------------------------
+
+    def _filter_mask(self, filters: Dict[str, Optional[str]]) -> Optional[np.ndarray]:
+        mask: Optional[np.ndarray] = None
+        for key in _FILTER_COLUMNS:
+            value = filters.get(key)
+            if not value:
+                continue
+            column_mask = self._categorical[key].mask(value)
+            mask = column_mask if mask is None else mask & column_mask
+        return mask
+
+    def _distances(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """(후보 행 수, 질의 수) 모양의 L2 거리 행렬."""
+        if rows is None:
+            vectors, sq_norms = self.vectors, self._sq_norms
+        else:
+            vectors, sq_norms = self.vectors[rows], self._sq_norms[rows]
+        query_norms = np.einsum("ij,ij->i", queries, queries)
+        squared = sq_norms[:, None] - 2.0 * (vectors @ queries.T) + query_norms[None, :]
+        np.maximum(squared, 0.0, out=squared)
+        return np.sqrt(squared)
+
+    @staticmethod
+    def _top_k(distances: np.ndarray, k: int) -> np.ndarray:
+        if k <= 0 or distances.size == 0:
+            return np.empty(0, dtype=np.int64)
+        if k < distances.size:
+            candidates = np.argpartition(distances, k - 1)[:k]
+        else:
+            candidates = np.arange(distances.size)
+        return candidates[np.argsort(distances[candidates], kind="stable")]
+
+    def _rows(self, indices: np.ndarray, distances: np.ndarray) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        for idx, distance in zip(indices.tolist(), distances.tolist()):
+            record = self._records.record(idx)
+            rows.append(
+                {
+                    "source_name": record["source_name"],
+                    "grade": record["grade"],
+                    "subject": record["subject"],
+                    "sub_subject": record["sub_subject"],
+                    "text": record["text"],
+                    "achievement_codes": list(record["achievement_codes"]),
+                    "difficulty": record["difficulty"],
+                    "distance": float(distance),
+                }
+            )
+        return rows
+
+    @staticmethod
+    def _as_matrix(embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        return np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+
+    # --- 검색 엔진 인터페이스 ------------------------------------------------
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        filters: Dict[str, Optional[str]],
+        limit: int,
+        **_: Any,
+    ) -> List[Dict[str, Any]]:
+        return self.search_many([embedding], filters, limit)[0]
+
+    def search_many(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        filters: Dict[str, Optional[str]],
+        limit_per_query: int,
+        **_: Any,
+    ) -> List[List[Dict[str, Any]]]:
+        queries = self._as_matrix(embeddings)
+        mask = self._filter_mask(filters)
+        # 필터가 있으면 불리언 마스크로 후보 행만 골라 거리를 계산한다
+        rows = np.flatnonzero(mask) if mask is not None else None
+        if rows is not None and rows.size == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        distances = self._distances(queries, rows)
+        results: List[List[Dict[str, Any]]] = []
+        for column in range(queries.shape[0]):
+            column_distances = distances[:, column]
+            top = self._top_k(column_distances, limit_per_query)
+            indices = rows[top] if rows is not None else top
+            results.append(self._rows(indices, column_distances[top]))
+        return results
+
+    def search_tiered(
+        self,
+        embedding: Sequence[float],
+        tiers: Sequence[Tuple[Optional[str], Optional[str]]],
+        limit: int,
+        **_: Any,
+    ) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+        # 전체 거리를 한 번만 계산하고 단계별로 마스크만 바꿔 적용한다
+        distances = self._distances(self._as_matrix([embedding]))[:, 0]
+        for tier_index, (grade, subject) in enumerate(tiers):
+            mask = self._filter_mask({"grade": grade, "subject": subject})
+            if mask is None:
+                top = self._top_k(distances, limit)
+                indices = top
+            else:
+                rows = np.flatnonzero(mask)
+                if rows.size == 0:
+                    continue
+                top = self._top_k(distances[rows], limit)
+                indices = rows[top]
+            if indices.size:
+                return tier_index, self._rows(indices, distances[indices])
+        return None, []
+
+    # 행렬 연산과 memmap 페이지 읽기는 코퍼스 크기에 비례하므로 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+    # (NumPy 연산은 대부분 GIL을 놓고 실행된다)
+
+    async def asearch(self, embedding, filters, limit, **kwargs: Any) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.search, embedding, filters, limit, **kwargs)
+
+    async def asearch_many(self, embeddings, filters, limit_per_query, **kwargs: Any) -> List[List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self.search_many, embeddings, filters, limit_per_query, **kwargs)
+
+    async def asearch_tiered(self, embedding, tiers, limit, **kwargs: Any) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self.search_tiered, embedding, tiers, limit, **kwargs)
+
+    async def asnapshot(self) -> str:
+        return self.snapshot
@@ -1,72 +1,550 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import psycopg
 from psycopg.rows import dict_row
 
 from rag_pipeline.config import settings
-from rag_pipeline.embeddings.local_embeddings import LocalEmbeddingClient
+from rag_pipeline.retrieval.cache import register_reload_callback
+from rag_pipeline.retrieval.pool import get_async_pool, get_pool
+from rag_pipeline.utils.text import find_achievement_codes
+
+logger = logging.getLogger(__name__)
 
 # pgvector 테이블에서 질의 벡터와 가장 가까운 학습 자료를 검색
 
+_TABLE_NAME = "curriculum_embeddings"
+
+_FILTER_COLUMNS = ("grade", "subject", "sub_subject")
+
+_RESULT_COLUMNS = """
+               source_name,
+               grade,
+               subject,
+               sub_subject,
+               text,
+               achievement_codes,
+               difficulty"""
+
+
+# 거리 연산자: l2(<->), cosine(<=>), ip(<#>, 음의 내적 — 정규화된 벡터에서는 코사인과 같은 순위)
+METRIC_OPERATORS = {"l2": "<->", "cosine": "<=>", "ip": "<#>"}
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """임베딩 컬럼의 저장 형식(vector/halfvec)과 거리 지표. load_embeddings가 테이블 주석에 기록한다."""
+
+    storage: str = "vector"
+    metric: str = "l2"
+    normalized: bool = False
+    # 적재마다 바뀌는 데이터 버전. SQL 캐시 키에는 포함하지 않는다
+    snapshot: Optional[str] = field(default=None, compare=False)
+
+    @property
+    def operator(self) -> str:
+        return METRIC_OPERATORS[self.metric]
+
+    @property
+    def cast(self) -> str:
+        # 질의 벡터는 vector로 바인딩되므로 halfvec 컬럼이면 서버에서 변환한다
+        return "::halfvec" if self.storage == "halfvec" else ""
+
+    @property
+    def array_cast(self) -> str:
+        return "::halfvec[]" if self.storage == "halfvec" else ""
+
+
+TABLE_SPEC_SQL = """
+    SELECT format_type(a.atttypid, a.atttypmod) AS column_type,
+           obj_description(a.attrelid, 'pg_class') AS comment
+    FROM pg_attribute AS a
+    WHERE a.attrelid = to_regclass(%(table)s)
+      AND a.attname = 'embedding'
+      AND NOT a.attisdropped
+"""
+
+_table_spec: Optional[TableSpec] = None
+_table_spec_lock = threading.Lock()
+
+
+def parse_table_spec(
+    row: Optional[Tuple[Optional[str], Optional[str]]],
+    table: str = _TABLE_NAME,
+) -> TableSpec:
+    """TABLE_SPEC_SQL 결과 (컬럼 타입, 테이블 주석)를 TableSpec으로 바꾼다. 행이 없으면 기본값."""
+    if row is None:
+        return TableSpec()
+    column_type, comment = row
+    metadata: Dict[str, Any] = {}
+    if comment:
+        try:
+            metadata = json.loads(comment)
+        except ValueError:
+            logger.warning("Ignoring non-JSON comment on table %s: %r", table, comment)
+    storage = "halfvec" if (column_type or "").startswith("halfvec") else "vector"
+    metric = metadata.get("metric", "l2")
+    if metric not in METRIC_OPERATORS:
+        logger.warning("Unknown metric '%s' in table metadata; falling back to l2", metric)
+        metric = "l2"
+    return TableSpec(
+        storage=storage,
+        metric=metric,
+        normalized=bool(metadata.get("normalized", False)),
+        snapshot=metadata.get("snapshot"),
+    )
+
+
+def read_table_spec(conn: psycopg.Connection, table: str = _TABLE_NAME) -> TableSpec:
+    """load_embeddings가 기록한 테이블 메타데이터에서 저장 형식과 거리 지표를 읽는다."""
+    return parse_table_spec(conn.execute(TABLE_SPEC_SQL, {"table": table}).fetchone(), table)
+
 
-def _resolve_dsn() -> str:
-    dsn = settings.database_url
-    if "+psycopg_async" in dsn:
-        dsn = dsn.replace("+psycopg_async", "")
-    return dsn
+def _get_table_spec() -> TableSpec:
+    """테이블 메타데이터에서 저장 형식과 거리 연산자를 한 번만 읽어 둔다."""
+    global _table_spec
+    if _table_spec is None:
+        with get_pool().connection() as conn:
+            spec = read_table_spec(conn)
+        with _table_spec_lock:
+            _table_spec = spec
+        logger.info("Resolved %s embedding spec: %s", _TABLE_NAME, _table_spec)
+    return _table_spec
+
+
+async def _aget_table_spec() -> TableSpec:
+    global _table_spec
+    if _table_spec is None:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            cursor = await conn.execute(TABLE_SPEC_SQL, {"table": _TABLE_NAME})
+            row = await cursor.fetchone()
+        with _table_spec_lock:
+            _table_spec = parse_table_spec(row)
+        logger.info("Resolved %s embedding spec: %s", _TABLE_NAME, _table_spec)
+    return _table_spec
+
+
+def _reset_table_spec() -> None:
+    global _table_spec
+    with _table_spec_lock:
+        _table_spec = None
+
+
+# 재적재로 저장 형식이 바뀔 수 있으므로 알림을 받으면 다시 읽는다
+register_reload_callback(_reset_table_spec)
+
+
+def _filter_conditions(filters: Dict[str, Optional[str]]) -> List[str]:
+    return [f"{key} = %({key})s" for key, value in filters.items() if value]
 
 
 def _build_where_clause(filters: Dict[str, Optional[str]]) -> str:
-    clauses = []
-    for key, value in filters.items():
-        if value:
-            clauses.append(f"{key} = %({key})s")
+    clauses = _filter_conditions(filters)
     if not clauses:
         return ""
     return "WHERE " + " AND ".join(clauses)
 
 
-def retrieve_passages(
-    query: str,
-    *,
-    grade: Optional[str] = None,
-    subject: Optional[str] = None,
-    sub_subject: Optional[str] = None,
-    limit: int = 5,
-) -> List[Dict[str, str]]:
-    """Return top-N passages from curriculum_embeddings."""
-    filters = {"grade": grade, "subject": subject, "sub_subject": sub_subject}
-    where_sql = _build_where_clause(filters)
-
-    with LocalEmbeddingClient() as client:
-        # 요청 쿼리를 fastembed로 벡터화해 pgvector 유사도 검색에 사용
-        embedding = client.embed([query])[0]
-
-    vector_literal = "[" + ",".join(str(x) for x in embedding) + "]"
-    sql_query = f"""
-        SELECT source_name,
-               grade,
-               subject,
-               sub_subject,
-               text,
-               achievement_codes,
-               difficulty,
-               embedding <-> '{vector_literal}'::vector AS distance
+@lru_cache(maxsize=None)
+def _build_search_sql(filter_keys: Tuple[str, ...], spec: TableSpec) -> str:
+    """
+    필터 조합별 검색 SQL을 만든다.
+
+    질의 벡터와 LIMIT은 모두 바인딩 파라미터이므로 같은 필터 조합은 항상 같은
+    SQL 텍스트가 되고, 서버 측 prepared statement로 재사용된다.
+    """
+    where_sql = _build_where_clause({key: key for key in filter_keys})
+    # 테이블 지표에 맞는 거리 연산자로 한 번만 계산하고 ORDER BY에서 별칭으로 재사용한다
+    return f"""
+        SELECT {_RESULT_COLUMNS},
+               embedding {spec.operator} %(embedding)b{spec.cast} AS distance
         FROM curriculum_embeddings
         {where_sql}
-        ORDER BY embedding <-> '{vector_literal}'::vector
-        LIMIT {limit}
+        ORDER BY distance
+        LIMIT %(limit)s
+    """
+
+
+@lru_cache(maxsize=None)
+def _build_hybrid_search_sql(filter_keys: Tuple[str, ...], spec: TableSpec) -> str:
+    """
+    벡터 검색과 어휘(트라이그램/성취기준 코드) 검색을 DB 안에서 RRF로 결합하는 SQL.
+
+    각 검색의 상위 후보에 순위를 매긴 뒤 1 / (rrf_k + rank)를 합산해 정렬한다.
+    어휘 검색은 load_embeddings가 만든 GIN 인덱스(text gin_trgm_ops, achievement_codes)를 사용한다.
     """
-    # pgvector의 L2 거리(<->)를 사용해 최상위 문서를 가져온다
+    conditions = _filter_conditions({key: key for key in filter_keys})
+    vector_where = _build_where_clause({key: key for key in filter_keys})
+    lexical_where = " AND ".join(
+        conditions + ["(%(query)s <%% text OR achievement_codes && %(codes)s::text[])"]
+    )
+    return f"""
+        WITH vector_hits AS (
+            SELECT id, row_number() OVER (ORDER BY distance) AS rank
+            FROM (
+                SELECT id, embedding {spec.operator} %(embedding)b{spec.cast} AS distance
+                FROM curriculum_embeddings
+                {vector_where}
+                ORDER BY distance
+                LIMIT %(candidates)s
+            ) AS v
+        ),
+        lexical_hits AS (
+            SELECT id, row_number() OVER (ORDER BY score DESC) AS rank
+            FROM (
+                SELECT id,
+                       word_similarity(%(query)s, text)
+                       + CASE WHEN achievement_codes && %(codes)s::text[] THEN 1.0 ELSE 0.0 END AS score
+                FROM curriculum_embeddings
+                WHERE {lexical_where}
+                ORDER BY score DESC
+                LIMIT %(candidates)s
+            ) AS l
+        ),
+        fused AS (
+            SELECT id,
+                   -- numeric 리터럴끼리 나누면 Decimal로 돌아와 JSON 캐시에 저장되지 않으므로 float8로 계산
+                   COALESCE(1.0::float8 / (%(rrf_k)s + vector_hits.rank), 0.0::float8)
+                   + COALESCE(1.0::float8 / (%(rrf_k)s + lexical_hits.rank), 0.0::float8) AS rrf_score
+            FROM vector_hits
+            FULL OUTER JOIN lexical_hits USING (id)
+        )
+        SELECT {_RESULT_COLUMNS},
+               embedding {spec.operator} %(embedding)b{spec.cast} AS distance,
+               fused.rrf_score
+        FROM fused
+        JOIN curriculum_embeddings USING (id)
+        ORDER BY fused.rrf_score DESC, distance
+        LIMIT %(limit)s
+    """
+
 
-    dsn = _resolve_dsn()
-    rows: List[Dict[str, str]] = []
-    with psycopg.connect(dsn) as conn:
+@lru_cache(maxsize=None)
+def _build_multi_search_sql(filter_keys: Tuple[str, ...], spec: TableSpec) -> str:
+    """
+    여러 질의 벡터의 top-k를 한 번의 왕복으로 가져오는 SQL.
+
+    질의 벡터 배열을 unnest한 뒤 LATERAL 서브쿼리로 질의마다 인덱스 검색을 수행한다.
+    """
+    where_sql = _build_where_clause({key: key for key in filter_keys})
+    return f"""
+        SELECT q.query_index, hit.*
+        FROM unnest(%(embeddings)b{spec.array_cast})
+             WITH ORDINALITY AS q(embedding, query_index)
+        CROSS JOIN LATERAL (
+            SELECT {_RESULT_COLUMNS},
+                   e.embedding {spec.operator} q.embedding AS distance
+            FROM curriculum_embeddings AS e
+            {where_sql}
+            ORDER BY distance
+            LIMIT %(limit)s
+        ) AS hit
+        ORDER BY q.query_index, hit.distance
+    """
+
+
+@lru_cache(maxsize=None)
+def _build_tiered_search_sql(spec: TableSpec) -> str:
+    return f"""
+    WITH hits AS (
+        SELECT t.tier, hit.*
+        FROM unnest(%(tier_grades)s::text[], %(tier_subjects)s::text[])
+             WITH ORDINALITY AS t(tier_grade, tier_subject, tier)
+        CROSS JOIN LATERAL (
+            SELECT {_RESULT_COLUMNS},
+                   embedding {spec.operator} %(embedding)b{spec.cast} AS distance
+            FROM curriculum_embeddings
+            WHERE (t.tier_grade IS NULL OR grade = t.tier_grade)
+              AND (t.tier_subject IS NULL OR subject = t.tier_subject)
+            ORDER BY distance
+            LIMIT %(limit)s
+        ) AS hit
+    )
+    SELECT *
+    FROM hits
+    WHERE tier = (SELECT min(tier) FROM hits)
+    ORDER BY distance
+"""
+
+
+def _active_filters(filters: Dict[str, Optional[str]]) -> Tuple[Dict[str, str], Tuple[str, ...]]:
+    active = {key: value for key, value in filters.items() if value}
+    return active, tuple(key for key in _FILTER_COLUMNS if key in active)
+
+
+def _query_vector(embedding: Sequence[float], spec: TableSpec) -> np.ndarray:
+    # float32 배열은 pgvector 바이너리 포맷으로 그대로 전송된다
+    vector = np.asarray(embedding, dtype=np.float32)
+    if spec.normalized:
+        # 저장된 벡터가 정규화되어 있으면 질의도 정규화해야 내적이 코사인 유사도가 된다
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+    return vector
+
+
+def _prepare_search(
+    embedding: Sequence[float],
+    filters: Dict[str, Optional[str]],
+    limit: int,
+    spec: TableSpec,
+) -> Tuple[str, Dict[str, Any]]:
+    active, filter_keys = _active_filters(filters)
+    sql_query = _build_search_sql(filter_keys, spec)
+    params: Dict[str, Any] = {
+        **active,
+        "embedding": _query_vector(embedding, spec),
+        "limit": limit,
+    }
+    return sql_query, params
+
+
+def _prepare_hybrid_search(
+    embedding: Sequence[float],
+    query_text: str,
+    filters: Dict[str, Optional[str]],
+    limit: int,
+    spec: TableSpec,
+) -> Tuple[str, Dict[str, Any]]:
+    active, filter_keys = _active_filters(filters)
+    sql_query = _build_hybrid_search_sql(filter_keys, spec)
+    params: Dict[str, Any] = {
+        **active,
+        "embedding": _query_vector(embedding, spec),
+        "query": query_text,
+        # 저장된 코드가 대괄호 포함/미포함 어느 쪽이든 일치하도록 두 표기를 모두 넣는다
+        "codes": find_achievement_codes(query_text, include_bare=True),
+        "candidates": max(limit, settings.hybrid_candidates),
+        "rrf_k": settings.hybrid_rrf_k,
+        "limit": limit,
+    }
+    return sql_query, params
+
+
+def _prepare_multi_search(
+    embeddings: Sequence[Sequence[float]],
+    filters: Dict[str, Optional[str]],
+    limit_per_query: int,
+    spec: TableSpec,
+) -> Tuple[str, Dict[str, Any]]:
+    active, filter_keys = _active_filters(filters)
+    sql_query = _build_multi_search_sql(filter_keys, spec)
+    params: Dict[str, Any] = {
+        **active,
+        # vector[] 배열로 바이너리 전송
+        "embeddings": [_query_vector(embedding, spec) for embedding in embeddings],
+        "limit": limit_per_query,
+    }
+    return sql_query, params
+
+
+def _prepare_tiered_search(
+    embedding: Sequence[float],
+    tiers: Sequence[Tuple[Optional[str], Optional[str]]],
+    limit: int,
+    spec: TableSpec,
+) -> Tuple[str, Dict[str, Any]]:
+    params: Dict[str, Any] = {
+        "tier_grades": [grade or None for grade, _ in tiers],
+        "tier_subjects": [subject or None for _, subject in tiers],
+        "embedding": _query_vector(embedding, spec),
+        "limit": limit,
+    }
+    return _build_tiered_search_sql(spec), params
+
+
+def _split_tier(rows: List[Dict[str, Any]]) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+    if not rows:
+        return None, []
+    tier = rows[0]["tier"]
+    for row in rows:
+        row.pop("tier")
+    return tier - 1, rows
+
+
+def _group_by_query(rows: List[Dict[str, Any]], query_count: int) -> List[List[Dict[str, Any]]]:
+    grouped: List[List[Dict[str, Any]]] = [[] for _ in range(query_count)]
+    for row in rows:
+        query_index = row.pop("query_index")
+        grouped[query_index - 1].append(row)
+    return grouped
+
+
+def _build_index_settings(
+    ef_search: Optional[int],
+    probes: Optional[int],
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    ANN 인덱스의 재현율/지연 시간 트레이드오프 설정을 트랜잭션 로컬로 적용하는 SQL.
+
+    hnsw.ef_search가 클수록, ivfflat.probes가 많을수록 재현율이 높아지고 느려진다.
+    """
+    ef_search = ef_search if ef_search is not None else settings.hnsw_ef_search
+    probes = probes if probes is not None else settings.ivfflat_probes
+
+    assignments: List[str] = []
+    params: Dict[str, Any] = {}
+    if ef_search is not None:
+        assignments.append("set_config('hnsw.ef_search', %(ef_search)s, true)")
+        params["ef_search"] = str(ef_search)
+    if probes is not None:
+        assignments.append("set_config('ivfflat.probes', %(probes)s, true)")
+        params["probes"] = str(probes)
+    if not assignments:
+        return None
+    return "SELECT " + ", ".join(assignments), params
+
+
+def _fetch_rows(
+    sql_query: str,
+    params: Dict[str, Any],
+    index_settings: Optional[Tuple[str, Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    # 공유 풀에서 연결을 빌려 핸드셰이크 비용 없이 실행
+    with get_pool().connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            # 필터 파라미터를 그대로 바인딩해 안전하게 실행
-            cur.execute(sql_query, filters)
+            if index_settings:
+                cur.execute(*index_settings)
+            # 필터/벡터/LIMIT을 모두 바인딩하고 prepared statement로 실행
+            cur.execute(sql_query, params, prepare=True)
             for row in cur.fetchall():
                 rows.append(dict(row))
     return rows
+
+
+async def _fetch_rows_async(
+    sql_query: str,
+    params: Dict[str, Any],
+    index_settings: Optional[Tuple[str, Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            if index_settings:
+                await cur.execute(*index_settings)
+            await cur.execute(sql_query, params, prepare=True)
+            for row in await cur.fetchall():
+                rows.append(dict(row))
+    return rows
+
+
+class PgvectorEngine:
+    """
+    curriculum_embeddings 테이블을 pgvector로 검색하는 엔진.
+
+    질의 임베딩과 캐시는 rag_pipeline.retrieval.search가 담당하고, 이 클래스는
+    이미 계산된 질의 벡터로 SQL을 실행하는 역할만 한다.
+    """
+
+    name = "pgvector"
+
+    @staticmethod
+    def _prepare(
+        embedding: Sequence[float],
+        filters: Dict[str, Optional[str]],
+        limit: int,
+        query_text: Optional[str],
+        hybrid: bool,
+        spec: TableSpec,
+    ) -> Tuple[str, Dict[str, Any]]:
+        if hybrid and query_text:
+            return _prepare_hybrid_search(embedding, query_text, filters, limit, spec)
+        return _prepare_search(embedding, filters, limit, spec)
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        filters: Dict[str, Optional[str]],
+        limit: int,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        query_text: Optional[str] = None,
+        hybrid: bool = False,
+    ) -> List[Dict[str, Any]]:
+        sql_query, params = self._prepare(embedding, filters, limit, query_text, hybrid, _get_table_spec())
+        return _fetch_rows(sql_query, params, _build_index_settings(ef_search, probes))
+
+    async def asearch(
+        self,
+        embedding: Sequence[float],
+        filters: Dict[str, Optional[str]],
+        limit: int,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        query_text: Optional[str] = None,
+        hybrid: bool = False,
+    ) -> List[Dict[str, Any]]:
+        spec = await _aget_table_spec()
+        sql_query, params = self._prepare(embedding, filters, limit, query_text, hybrid, spec)
+        return await _fetch_rows_async(sql_query, params, _build_index_settings(ef_search, probes))
+
+    def search_many(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        filters: Dict[str, Optional[str]],
+        limit_per_query: int,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        sql_query, params = _prepare_multi_search(embeddings, filters, limit_per_query, _get_table_spec())
+        rows = _fetch_rows(sql_query, params, _build_index_settings(ef_search, probes))
+        return _group_by_query(rows, len(embeddings))
+
+    async def asearch_many(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        filters: Dict[str, Optional[str]],
+        limit_per_query: int,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        spec = await _aget_table_spec()
+        sql_query, params = _prepare_multi_search(embeddings, filters, limit_per_query, spec)
+        rows = await _fetch_rows_async(sql_query, params, _build_index_settings(ef_search, probes))
+        return _group_by_query(rows, len(embeddings))
+
+    def search_tiered(
+        self,
+        embedding: Sequence[float],
+        tiers: Sequence[Tuple[Optional[str], Optional[str]]],
+        limit: int,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+        sql_query, params = _prepare_tiered_search(embedding, tiers, limit, _get_table_spec())
+        rows = _fetch_rows(sql_query, params, _build_index_settings(ef_search, probes))
+        return _split_tier(rows)
+
+    async def asearch_tiered(
+        self,
+        embedding: Sequence[float],
+        tiers: Sequence[Tuple[Optional[str], Optional[str]]],
+        limit: int,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+        spec = await _aget_table_spec()
+        sql_query, params = _prepare_tiered_search(embedding, tiers, limit, spec)
+        rows = await _fetch_rows_async(sql_query, params, _build_index_settings(ef_search, probes))
+        return _split_tier(rows)
+
+    async def asnapshot(self) -> str:
+        spec = await _aget_table_spec()
+        # 스냅샷을 기록하기 전에 적재된 테이블은 저장 형식만으로 구분한다
+        return spec.snapshot or f"{spec.storage}-{spec.metric}"
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+
+from pgvector.psycopg import register_vector, register_vector_async
+from psycopg import AsyncConnection, Connection
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from rag_pipeline.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 전역에서 공유하는 pgvector 커넥션 풀
+# 요청마다 psycopg.connect()를 호출하면 TCP/인증 핸드셰이크 비용이 반복되므로
+# 앱 lifespan에서 한 번 열어 두고 모든 검색기가 재사용한다.
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+# 비동기 검색기(async 서비스/라우트)용 풀. 이벤트 루프에 묶이므로 별도로 관리한다.
+_async_pool: AsyncConnectionPool | None = None
+# asyncio.Lock은 처음 사용한 이벤트 루프에 묶이므로 임포트 시점이 아니라 실행 중인 루프 안에서 만든다
+_async_pool_lock: asyncio.Lock | None = None
+_async_pool_lock_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_async_pool_lock() -> asyncio.Lock:
+    global _async_pool_lock, _async_pool_lock_loop
+    loop = asyncio.get_running_loop()
+    # await 없이 확인/생성하므로 같은 루프의 코루틴끼리 경쟁하지 않는다
+    if _async_pool_lock is None or _async_pool_lock_loop is not loop:
+        _async_pool_lock = asyncio.Lock()
+        _async_pool_lock_loop = loop
+    return _async_pool_lock
+
+
+def resolve_dsn() -> str:
+    dsn = settings.database_url
+    if "+psycopg_async" in dsn:
+        dsn = dsn.replace("+psycopg_async", "")
+    return dsn
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "conninfo": resolve_dsn(),
+        "min_size": settings.db_pool_min_size,
+        "max_size": settings.db_pool_max_size,
+        "timeout": settings.db_pool_timeout,
+        "max_idle": settings.db_pool_max_idle,
+        "max_lifetime": settings.db_pool_max_lifetime,
+        "open": False,
+    }
+
+
+def _configure_connection(conn: Connection) -> None:
+    # numpy 벡터를 pgvector 바이너리 포맷으로 바인딩할 수 있도록 타입을 등록
+    register_vector(conn)
+    conn.commit()
+
+
+async def _configure_async_connection(conn: AsyncConnection) -> None:
+    await register_vector_async(conn)
+    await conn.commit()
+
+
+def _build_pool() -> ConnectionPool:
+    return ConnectionPool(
+        configure=_configure_connection,
+        # 풀에서 꺼낼 때마다 가벼운 헬스 체크로 끊어진 연결을 걸러낸다
+        check=ConnectionPool.check_connection,
+        name="rag-pgvector",
+        **_pool_kwargs(),
+    )
+
+
+def _build_async_pool() -> AsyncConnectionPool:
+    return AsyncConnectionPool(
+        configure=_configure_async_connection,
+        check=AsyncConnectionPool.check_connection,
+        name="rag-pgvector-async",
+        **_pool_kwargs(),
+    )
+
+
+def open_pool(*, wait: bool = False) -> ConnectionPool:
+    """커넥션 풀을 생성하고 연다. 이미 열려 있으면 기존 풀을 반환한다."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool = _build_pool()
+            pool.open(wait=wait)
+            _pool = pool
+            logger.info(
+                "Opened pgvector connection pool (min=%d, max=%d)",
+                settings.db_pool_min_size,
+                settings.db_pool_max_size,
+            )
+        return _pool
+
+
+def get_pool() -> ConnectionPool:
+    """공유 커넥션 풀을 반환한다. lifespan 밖(CLI 등)에서는 처음 호출 시 연다."""
+    pool = _pool
+    if pool is None:
+        pool = open_pool()
+    return pool
+
+
+def close_pool() -> None:
+    """커넥션 풀을 닫고 모든 연결을 반환한다."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+            logger.info("Closed pgvector connection pool")
+
+
+async def open_async_pool(*, wait: bool = False) -> AsyncConnectionPool:
+    """비동기 커넥션 풀을 생성하고 연다. 실행 중인 이벤트 루프 안에서 호출해야 한다."""
+    global _async_pool
+    async with _get_async_pool_lock():
+        if _async_pool is None:
+            pool = _build_async_pool()
+            await pool.open(wait=wait)
+            _async_pool = pool
+            logger.info(
+                "Opened async pgvector connection pool (min=%d, max=%d)",
+                settings.db_pool_min_size,
+                settings.db_pool_max_size,
+            )
+        return _async_pool
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """공유 비동기 커넥션 풀을 반환한다. 아직 열리지 않았다면 처음 호출 시 연다."""
+    pool = _async_pool
+    if pool is None:
+        pool = await open_async_pool()
+    return pool
+
+
+async def close_async_pool() -> None:
+    """비동기 커넥션 풀을 닫는다."""
+    global _async_pool
+    async with _get_async_pool_lock():
+        if _async_pool is not None:
+            await _async_pool.close()
+            _async_pool = None
+            logger.info("Closed async pgvector connection pool")
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from rag_pipeline.config import resolve_path, settings
+from rag_pipeline.embedding.batcher import get_embedding_batcher
+from rag_pipeline.embedding.local_embeddings import get_embedding_client
+from rag_pipeline.retrieval.cache import get_retrieval_cache, register_reload_callback
+
+logger = logging.getLogger(__name__)
+
+# 검색 진입점: 결과 캐시 → 질의 임베딩 → 설정된 검색 엔진(pgvector/numpy) 순으로 처리
+
+Rows = List[Dict[str, Any]]
+Tier = Tuple[Optional[str], Optional[str]]
+
+
+class RetrievalEngine(Protocol):
+    """이미 임베딩된 질의 벡터로 학습 자료를 검색하는 엔진 인터페이스"""
+
+    name: str
+
+    def search(
+        self, embedding: Sequence[float], filters: Dict[str, Optional[str]], limit: int, **kwargs: Any
+    ) -> Rows: ...
+
+    async def asearch(
+        self, embedding: Sequence[float], filters: Dict[str, Optional[str]], limit: int, **kwargs: Any
+    ) -> Rows: ...
+
+    def search_many(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        filters: Dict[str, Optional[str]],
+        limit_per_query: int,
+        **kwargs: Any,
+    ) -> List[Rows]: ...
+
+    async def asearch_many(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        filters: Dict[str, Optional[str]],
+        limit_per_query: int,
+        **kwargs: Any,
+    ) -> List[Rows]: ...
+
+    def search_tiered(
+        self, embedding: Sequence[float], tiers: Sequence[Tier], limit: int, **kwargs: Any
+    ) -> Tuple[Optional[int], Rows]: ...
+
+    async def asearch_tiered(
+        self, embedding: Sequence[float], tiers: Sequence[Tier], limit: int, **kwargs: Any
+    ) -> Tuple[Optional[int], Rows]: ...
+
+    async def asnapshot(self) -> str:
+        """검색 데이터 버전. 임베딩을 다시 적재하면 바뀐다."""
+        ...
+
+
+_engine: Optional[RetrievalEngine] = None
+_engine_lock = threading.Lock()
+
+
+def _build_engine() -> RetrievalEngine:
+    backend = settings.retrieval_backend.lower()
+    if backend == "pgvector":
+        from rag_pipeline.retrieval.pgvector import PgvectorEngine
+
+        return PgvectorEngine()
+    if backend == "numpy":
+        from rag_pipeline.embedding.artifact import default_artifact_path, is_artifact
+        from rag_pipeline.retrieval.numpy_store import NumpyVectorStore
+
+        # 미설정 시 바이너리 아티팩트가 있으면 그것을, 없으면 embedding_cache.jsonl을 연다
+        path = settings.vector_store_path
+        if path is None:
+            path = default_artifact_path()
+            if not is_artifact(resolve_path(path)):
+                path = settings.artifacts_root / "embedding_cache.jsonl"
+        if not path.is_absolute():
+            path = resolve_path(path)
+        return NumpyVectorStore.open(path)
+    raise ValueError(f"Unsupported RETRIEVAL_BACKEND: {settings.retrieval_backend}")
+
+
+def get_engine() -> RetrievalEngine:
+    """설정(RETRIEVAL_BACKEND)에 맞는 프로세스 전역 검색 엔진을 반환한다."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _build_engine()
+                logger.info("Using '%s' retrieval engine", _engine.name)
+    return _engine
+
+
+def reset_engine() -> None:
+    """다음 검색 때 엔진을 다시 만든다. (임베딩 재적재 후 인메모리 엔진 갱신용)"""
+    global _engine
+    with _engine_lock:
+        _engine = None
+
+
+register_reload_callback(reset_engine)
+
+
+async def retrieval_snapshot_async() -> str:
+    """현재 검색 엔진의 데이터 버전 (생성 결과 캐시 키용)"""
+    engine = get_engine()
+    return f"{engine.name}:{await engine.asnapshot()}"
+
+
+async def _aembed(texts: List[str]) -> List[Any]:
+    # 비동기 경로에서는 동시 요청의 질의를 모아 한 번에 임베딩한다
+    if settings.embedding_microbatch_enabled:
+        return await get_embedding_batcher().embed_many(texts)
+    return await get_embedding_client().aembed(texts)
+
+
+def _filters(grade: Optional[str], subject: Optional[str], sub_subject: Optional[str]) -> Dict[str, Optional[str]]:
+    return {"grade": grade, "subject": subject, "sub_subject": sub_subject}
+
+
+def retrieve_passages(
+    query: str,
+    *,
+    grade: Optional[str] = None,
+    subject: Optional[str] = None,
+    sub_subject: Optional[str] = None,
+    limit: int = 5,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    hybrid: Optional[bool] = None,
+) -> List[Dict[str, str]]:
+    """
+    Return top-N passages from curriculum_embeddings.
+
+    hybrid가 참이면(기본값: RETRIEVAL_HYBRID) 본문/성취기준 코드의 어휘 검색 결과를
+    벡터 검색과 RRF로 결합한다. 인메모리(numpy) 엔진은 벡터 검색만 지원한다.
+    """
+    filters = _filters(grade, subject, sub_subject)
+    hybrid = settings.retrieval_hybrid if hybrid is None else hybrid
+    cache = get_retrieval_cache()
+    cache_key = cache.make_key(
+        "passages", query, **filters, limit=limit, ef_search=ef_search, probes=probes, hybrid=hybrid
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = cache.generation
+
+    # 요청 쿼리를 벡터화해 유사도 검색에 사용
+    embedding = get_embedding_client().embed([query])[0]
+
+    rows = get_engine().search(
+        embedding, filters, limit, ef_search=ef_search, probes=probes, query_text=query, hybrid=hybrid
+    )
+    cache.set(cache_key, rows, generation=generation)
+    return rows
+
+
+async def retrieve_passages_async(
+    query: str,
+    *,
+    grade: Optional[str] = None,
+    subject: Optional[str] = None,
+    sub_subject: Optional[str] = None,
+    limit: int = 5,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    hybrid: Optional[bool] = None,
+) -> List[Dict[str, str]]:
+    """retrieve_passages의 비동기 버전. 임베딩과 SQL 왕복 동안 이벤트 루프를 막지 않는다."""
+    filters = _filters(grade, subject, sub_subject)
+    hybrid = settings.retrieval_hybrid if hybrid is None else hybrid
+    cache = get_retrieval_cache()
+    cache_key = cache.make_key(
+        "passages", query, **filters, limit=limit, ef_search=ef_search, probes=probes, hybrid=hybrid
+    )
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        return cached
+    generation = cache.generation
+
+    embedding = (await _aembed([query]))[0]
+
+    rows = await get_engine().asearch(
+        embedding, filters, limit, ef_search=ef_search, probes=probes, query_text=query, hybrid=hybrid
+    )
+    await cache.aset(cache_key, rows, generation=generation)
+    return rows
+
+
+def retrieve_passages_many(
+    queries: Sequence[str],
+    *,
+    grade: Optional[str] = None,
+    subject: Optional[str] = None,
+    sub_subject: Optional[str] = None,
+    limit_per_query: int = 5,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> List[List[Dict[str, str]]]:
+    """
+    여러 질의를 한 번에 임베딩하고 단일 검색으로 질의별 top-k를 가져온다.
+
+    반환값은 입력 queries와 같은 순서의 결과 목록이다. 캐시에 있는 질의는 건너뛰고
+    나머지만 한 번에 검색한다.
+    """
+    queries = list(queries)
+    if not queries:
+        return []
+    filters = _filters(grade, subject, sub_subject)
+    cache = get_retrieval_cache()
+    cache_keys = [
+        cache.make_key(
+            "passages", query, **filters, limit=limit_per_query, ef_search=ef_search, probes=probes, hybrid=False
+        )
+        for query in queries
+    ]
+    results: List[Optional[List[Dict[str, str]]]] = [cache.get(key) for key in cache_keys]
+    missing = [idx for idx, result in enumerate(results) if result is None]
+    if not missing:
+        return results  # type: ignore[return-value]
+    generation = cache.generation
+
+    embeddings = get_embedding_client().embed([queries[idx] for idx in missing])
+
+    grouped = get_engine().search_many(embeddings, filters, limit_per_query, ef_search=ef_search, probes=probes)
+    for idx, rows in zip(missing, grouped):
+        results[idx] = rows
+        cache.set(cache_keys[idx], rows, generation=generation)
+    return results  # type: ignore[return-value]
+
+
+async def retrieve_passages_many_async(
+    queries: Sequence[str],
+    *,
+    grade: Optional[str] = None,
+    subject: Optional[str] = None,
+    sub_subject: Optional[str] = None,
+    limit_per_query: int = 5,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> List[List[Dict[str, str]]]:
+    """retrieve_passages_many의 비동기 버전."""
+    queries = list(queries)
+    if not queries:
+        return []
+    filters = _filters(grade, subject, sub_subject)
+    cache = get_retrieval_cache()
+    cache_keys = [
+        cache.make_key(
+            "passages", query, **filters, limit=limit_per_query, ef_search=ef_search, probes=probes, hybrid=False
+        )
+        for query in queries
+    ]
+    results: List[Optional[List[Dict[str, str]]]] = [await cache.aget(key) for key in cache_keys]
+    missing = [idx for idx, result in enumerate(results) if result is None]
+    if not missing:
+        return results  # type: ignore[return-value]
+    generation = cache.generation
+
+    embeddings = await _aembed([queries[idx] for idx in missing])
+
+    grouped = await get_engine().asearch_many(
+        embeddings, filters, limit_per_query, ef_search=ef_search, probes=probes
+    )
+    for idx, rows in zip(missing, grouped):
+        results[idx] = rows
+        await cache.aset(cache_keys[idx], rows, generation=generation)
+    return results  # type: ignore[return-value]
+
+
+def _tiered_cache_key(
+    query: str,
+    tiers: Sequence[Tier],
+    limit: int,
+    ef_search: Optional[int],
+    probes: Optional[int],
+) -> str:
+    return get_retrieval_cache().make_key(
+        "tiered",
+        query,
+        tiers=[list(tier) for tier in tiers],
+        limit=limit,
+        ef_search=ef_search,
+        probes=probes,
+    )
+
+
+def retrieve_passages_tiered(
+    query: str,
+    *,
+    tiers: Sequence[Tier],
+    limit: int = 5,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> Tuple[Optional[int], List[Dict[str, str]]]:
+    """
+    (grade, subject) 필터 단계를 우선순위대로 한 번의 질의로 검색한다.
+
+    질의는 한 번만 임베딩하고, 결과가 있는 가장 앞선 단계만 반환한다.
+    None 필터는 해당 컬럼을 제한하지 않는다.
+
+    Returns:
+        (결과가 나온 단계의 인덱스, 검색 결과). 모든 단계가 비어 있으면 (None, []).
+    """
+    if not tiers:
+        return None, []
+    cache = get_retrieval_cache()
+    cache_key = _tiered_cache_key(query, tiers, limit, ef_search, probes)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached[0], cached[1]
+    generation = cache.generation
+
+    embedding = get_embedding_client().embed([query])[0]
+
+    tier, rows = get_engine().search_tiered(embedding, tiers, limit, ef_search=ef_search, probes=probes)
+    cache.set(cache_key, [tier, rows], generation=generation)
+    return tier, rows
+
+
+async def retrieve_passages_tiered_async(
+    query: str,
+    *,
+    tiers: Sequence[Tier],
+    limit: int = 5,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> Tuple[Optional[int], List[Dict[str, str]]]:
+    """retrieve_passages_tiered의 비동기 버전."""
+    if not tiers:
+        return None, []
+    cache = get_retrieval_cache()
+    cache_key = _tiered_cache_key(query, tiers, limit, ef_search, probes)
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        return cached[0], cached[1]
+    generation = cache.generation
+
+    embedding = (await _aembed([query]))[0]
+
+    tier, rows = await get_engine().asearch_tiered(embedding, tiers, limit, ef_search=ef_search, probes=probes)
+    await cache.aset(cache_key, [tier, rows], generation=generation)
+    return tier, rows
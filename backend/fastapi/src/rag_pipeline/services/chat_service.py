@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
+
+from openai import AsyncOpenAI
 
 from rag_pipeline.api.schemas import ChatRequest, ChatResponse
 from rag_pipeline.config import settings
@@ -12,15 +14,24 @@ logger = logging.getLogger(__name__)
 
 
 class ChatService:
-    def __init__(self, *, client: Optional[OpenAIChatClient] = None) -> None:
-        self.client = client or OpenAIChatClient()
+    def __init__(
+        self,
+        *,
+        client: Optional[OpenAIChatClient] = None,
+        async_openai_client: Optional[AsyncOpenAI] = None,
+    ) -> None:
+        self.client = client or OpenAIChatClient(async_client=async_openai_client)
+        self._async = async_openai_client is not None
 
     async def generate_reply(self, payload: ChatRequest) -> ChatResponse:
         has_api_key = bool(settings.openai_api_key)
         
         if has_api_key:
             try:
-                reply = await asyncio.to_thread(self._call_model, payload)
+                if self._async:
+                    reply = await self.client.acomplete(self._build_messages(payload))
+                else:
+                    reply = await asyncio.to_thread(self._call_model, payload)
             except Exception as exc:
                 logger.exception("Chat completion failed")
                 raise
@@ -29,6 +40,18 @@ class ChatService:
 
         return ChatResponse(reply=reply)
 
+    async def stream_reply(self, payload: ChatRequest) -> AsyncIterator[str]:
+        """응답 텍스트를 모델이 생성하는 대로 조각 단위로 내보낸다."""
+        if not settings.openai_api_key:
+            yield self._stub_reply(payload)
+            return
+        if not self._async:
+            # 비동기 클라이언트가 없으면 완성된 응답을 한 번에 보낸다
+            yield await asyncio.to_thread(self._call_model, payload)
+            return
+        async for delta in self.client.astream(self._build_messages(payload)):
+            yield delta
+
     def _call_model(self, payload: ChatRequest) -> str:
         messages = self._build_messages(payload)
         return self.client.complete(messages)
@@ -41,7 +64,3 @@ class ChatService:
             f"[stub] 챗봇 응답입니다. 현재 OpenAI API 키가 설정되지 않아 "
             "실제 답변 대신 확인용 메시지를 반환합니다. 질문: " + payload.message
         )
-
-
-def get_chat_service() -> ChatService:
-    return ChatService()
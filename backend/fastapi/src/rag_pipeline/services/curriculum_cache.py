@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from rag_pipeline.config import settings
+from rag_pipeline.utils.cache import CacheBackend, create_cache_backend
+
+logger = logging.getLogger(__name__)
+
+# 생성된 커리큘럼 캐시
+# 커리큘럼 생성 입력은 (과목, 학년)뿐이므로 같은 학년 학생들이 같은 결과를 공유할 수 있다.
+# 키에는 프롬프트 버전과 검색 데이터 스냅샷을 포함해 둘 중 하나가 바뀌면 자연스럽게 새로 생성한다.
+#
+# 항목 상태 (created_at 기준 경과 시간)
+#   fresh (< ttl)               : 그대로 반환
+#   stale (< ttl + stale_ttl)   : 즉시 반환하고 백그라운드에서 다시 생성
+#   만료                         : 백엔드 TTL로 삭제되어 요청 경로에서 생성
+# 백그라운드 갱신은 잠금 키(add = SET NX)로 워커 간에 한 번만 수행한다.
+
+Generator = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class CurriculumCache:
+    """(과목, 학년, 프롬프트 버전, 검색 스냅샷)별 생성 결과를 저장하는 stale-while-revalidate 캐시."""
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        *,
+        ttl: float,
+        stale_ttl: float,
+        variants: int = 1,
+        refresh_timeout: float = 300.0,
+        enabled: bool = True,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.variants = max(1, variants)
+        self.refresh_timeout = refresh_timeout
+        self.enabled = enabled
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._lock = threading.Lock()
+        # 같은 프로세스에서 동시에 들어온 미스는 생성 한 번을 함께 기다린다
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def make_key(*, subject: str, grade: str, prompt_version: str, snapshot: str) -> str:
+        raw = json.dumps([subject.strip(), grade.strip(), prompt_version, snapshot], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # --- 백엔드 접근 (Redis는 블로킹 I/O이므로 스레드에서 실행) ---------------------
+
+    async def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.backend.blocking:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    async def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        await self._call(self.backend.set, key, entry, self.ttl + self.stale_ttl)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    # --- 조회 ---------------------------------------------------------------
+
+    async def lookup(self, key: str, generate: Generator) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 결과를 반환합니다. 오래되었거나 변형이 부족하면 백그라운드 생성을 예약합니다.
+
+        Args:
+            key: make_key로 만든 키
+            generate: 결과 하나를 새로 생성하는 코루틴 함수
+
+        Returns:
+            캐시된 결과 (없으면 None)
+        """
+        if not self.enabled:
+            return None
+        entry = await self._call(self.backend.get, key)
+        if not entry or not entry.get("variants"):
+            self._count("misses")
+            return None
+
+        age = time.time() - entry["created_at"]
+        if age >= self.ttl:
+            self._count("stale_hits")
+            self._schedule(key, generate, replace=True)
+        else:
+            self._count("hits")
+            if len(entry["variants"]) < self.variants:
+                self._schedule(key, generate, replace=False)
+        return random.choice(entry["variants"])
+
+    async def store(self, key: str, value: Dict[str, Any]) -> None:
+        """새로 생성한 결과를 변형 목록에 추가합니다. (가득 차 있으면 새 목록으로 시작)"""
+        if not self.enabled:
+            return
+        entry = await self._call(self.backend.get, key)
+        if entry and entry.get("variants") and len(entry["variants"]) < self.variants:
+            entry["variants"].append(value)
+        else:
+            entry = {"created_at": time.time(), "variants": [value]}
+        await self._store(key, entry)
+
+    async def get_or_generate(self, key: str, generate: Generator) -> Dict[str, Any]:
+        """
+        캐시된 결과를 반환하고, 없으면 생성해 저장합니다.
+
+        Args:
+            key: make_key로 만든 키
+            generate: 결과 하나를 새로 생성하는 코루틴 함수
+
+        Returns:
+            캐시되었거나 새로 생성한 결과
+        """
+        cached = await self.lookup(key, generate)
+        if cached is not None:
+            return cached
+
+        # 생성은 별도 태스크로 실행하므로 처음 요청한 클라이언트가 끊겨도 기다리는 다른 요청과 캐시에 결과가 남는다
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._generate_and_store(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _generate_and_store(self, key: str, generate: Generator) -> Dict[str, Any]:
+        value = await generate()
+        await self.store(key, value)
+        return value
+
+    # --- 백그라운드 갱신 -----------------------------------------------------
+
+    def _schedule(self, key: str, generate: Generator, *, replace: bool) -> None:
+        task = asyncio.get_running_loop().create_task(self._refresh(key, generate, replace=replace))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, generate: Generator, *, replace: bool) -> None:
+        # 생성에 걸리는 시간 동안만 잠그고, 실패하면 잠금이 만료된 뒤 다른 요청이 다시 시도한다
+        lock_key = f"{key}:refresh"
+        acquired = await self._call(self.backend.add, lock_key, 1, self.refresh_timeout)
+        if not acquired:
+            return
+        try:
+            value = await generate()
+            if replace:
+                await self._store(key, {"created_at": time.time(), "variants": [value]})
+            else:
+                await self.store(key, value)
+            self._count("refreshes")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._count("refresh_failures")
+            logger.warning("Background curriculum refresh failed", exc_info=True)
+        finally:
+            await self._call(self.backend.delete, lock_key)
+
+    async def aclose(self) -> None:
+        """진행 중인 백그라운드 갱신과 생성을 취소합니다. (앱 종료 시)"""
+        tasks = [*self._tasks, *self._inflight.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / total, 4) if total else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "refreshing": len(self._tasks),
+            "size": self.backend.size(),
+        }
+
+
+_cache: Optional[CurriculumCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_curriculum_cache() -> CurriculumCache:
+    """설정에 따라 프로세스 전역 커리큘럼 캐시를 만들어 반환한다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend = create_cache_backend(
+                    url=settings.curriculum_cache_url or settings.retrieval_cache_url,
+                    namespace="rag:curriculum",
+                    maxsize=settings.curriculum_cache_size,
+                    ttl=settings.curriculum_cache_ttl + settings.curriculum_cache_stale_ttl,
+                )
+                _cache = CurriculumCache(
+                    backend,
+                    ttl=settings.curriculum_cache_ttl,
+                    stale_ttl=settings.curriculum_cache_stale_ttl,
+                    variants=settings.curriculum_cache_variants,
+                    # 재시도를 포함한 생성 한 번이 끝날 때까지 다른 워커가 같은 키를 갱신하지 않게 한다
+                    refresh_timeout=settings.curriculum_llm_timeout * 2,
+                    enabled=settings.curriculum_cache_enabled,
+                )
+    return _cache
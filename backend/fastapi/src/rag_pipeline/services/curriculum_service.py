@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from openai import AsyncOpenAI
 
 from rag_pipeline.api.schemas import (
     CurriculumGenerationRequest,
@@ -11,19 +14,41 @@ from rag_pipeline.api.schemas import (
     CurriculumUpdateRequest,
     CurriculumUpdateResponse,
 )
+from rag_pipeline.config import settings
 from rag_pipeline.prompting.loader import PromptLoader
-from rag_pipeline.retrieval.pgvector import retrieve_passages
-from rag_pipeline.services.openai_client import get_openai_client
+from rag_pipeline.retrieval.search import (
+    retrieval_snapshot_async,
+    retrieve_passages_async,
+    retrieve_passages_many_async,
+)
+from rag_pipeline.services.curriculum_cache import CurriculumCache, get_curriculum_cache
+from rag_pipeline.services.openai_client import create_chat_completion, stream_chat_completion
+from rag_pipeline.utils.json_stream import JsonArrayStreamParser
 
 logger = logging.getLogger(__name__)
 
+# 커리큘럼 생성 LLM 호출 옵션 (일괄/스트리밍 공통)
+_LLM_OPTIONS: Dict[str, Any] = {"model": "gpt-4", "temperature": 0.7, "max_tokens": 4000}
+
 
 class CurriculumService:
     """커리큘럼 생성 및 업데이트 서비스"""
 
-    def __init__(self, retriever=retrieve_passages) -> None:
+    def __init__(
+        self,
+        retriever=retrieve_passages_async,
+        *,
+        multi_retriever=retrieve_passages_many_async,
+        openai_client: AsyncOpenAI,
+        llm_timeout: Optional[float] = None,
+        cache: Optional[CurriculumCache] = None,
+    ) -> None:
         self.retriever = retriever
-        self.openai_client = get_openai_client()
+        self.multi_retriever = multi_retriever
+        # 앱 lifespan이 만든 공유 클라이언트 (커넥션 풀을 요청 간에 재사용)
+        self.openai_client = openai_client
+        self.llm_timeout = llm_timeout or settings.curriculum_llm_timeout
+        self.cache = cache or get_curriculum_cache()
         self.prompt_loader = PromptLoader()
 
     async def generate_curriculum(
@@ -38,10 +63,141 @@ class CurriculumService:
         Returns:
             생성된 커리큘럼 정보
         """
+        cache_key = await self._cache_key(request)
+        if cache_key is None:
+            return await self._generate(request)
+        
+        # 같은 (과목, 학년)은 캐시된 결과를 공유하고, 오래된 결과는 반환 후 백그라운드에서 갱신
+        data = await self.cache.get_or_generate(cache_key, lambda: self._generate_data(request))
+        return CurriculumGenerationResponse.model_validate(data)
+
+    async def _generate_data(self, request: CurriculumGenerationRequest) -> Dict[str, Any]:
+        return (await self._generate(request)).model_dump()
+
+    async def _generate(
+        self, request: CurriculumGenerationRequest
+    ) -> CurriculumGenerationResponse:
         # 1. 벡터 DB에서 관련 학습 자료 검색
-        contexts = self._retrieve_contexts(request)
+        contexts = await self._retrieve_contexts(request)
         
         # 2. 검색된 자료를 기반으로 프롬프트 구성
+        messages = self._build_messages(request, contexts)
+        
+        # 3. OpenAI API 호출 (이벤트 루프를 막지 않도록 비동기로, 제한 시간 적용)
+        response = await create_chat_completion(
+            self.openai_client,
+            timeout=self.llm_timeout,
+            messages=messages,
+            **_LLM_OPTIONS,
+        )
+        
+        # 4. 응답 파싱
+        content = response.choices[0].message.content
+        nodes_data = json.loads(content)
+        
+        # 5. 노드 검증 및 변환
+        roadmap_nodes = [CurriculumNode(**node) for node in nodes_data]
+        
+        # 6. 응답 생성
+        return CurriculumGenerationResponse(
+            subject=request.subject,
+            grade=request.grade,
+            roadmap_nodes=roadmap_nodes,
+            metadata=self.build_metadata(roadmap_nodes),
+        )
+
+    async def stream_curriculum(
+        self, request: CurriculumGenerationRequest
+    ) -> AsyncIterator[CurriculumNode]:
+        """
+        커리큘럼 노드를 모델이 생성하는 대로 하나씩 검증해 내보냅니다.
+        
+        응답 JSON 배열을 증분 파싱하므로 노드 객체가 닫히는 즉시 전달됩니다.
+        
+        Args:
+            request: 커리큘럼 생성 요청
+            
+        Yields:
+            검증된 커리큘럼 노드
+        """
+        # 캐시된 결과가 있으면 바로 재생하고, 없으면 스트리밍이 끝난 뒤 결과를 캐시에 저장
+        cache_key = await self._cache_key(request)
+        if cache_key is not None:
+            cached = await self.cache.lookup(cache_key, lambda: self._generate_data(request))
+            if cached is not None:
+                for node in CurriculumGenerationResponse.model_validate(cached).roadmap_nodes:
+                    yield node
+                return
+        
+        contexts = await self._retrieve_contexts(request)
+        messages = self._build_messages(request, contexts)
+        
+        parser = JsonArrayStreamParser()
+        roadmap_nodes: List[CurriculumNode] = []
+        async for delta in stream_chat_completion(
+            self.openai_client,
+            timeout=self.llm_timeout,
+            messages=messages,
+            **_LLM_OPTIONS,
+        ):
+            for node_data in parser.feed(delta):
+                node = CurriculumNode(**node_data)
+                roadmap_nodes.append(node)
+                yield node
+        parser.close()
+        
+        if cache_key is not None:
+            response = CurriculumGenerationResponse(
+                subject=request.subject,
+                grade=request.grade,
+                roadmap_nodes=roadmap_nodes,
+                metadata=self.build_metadata(roadmap_nodes),
+            )
+            await self.cache.store(cache_key, response.model_dump())
+
+    async def _cache_key(self, request: CurriculumGenerationRequest) -> Optional[str]:
+        """
+        캐시 키를 만듭니다. 캐시가 꺼져 있거나 검색 스냅샷을 알 수 없으면 None을 반환합니다.
+        
+        Args:
+            request: 커리큘럼 생성 요청
+            
+        Returns:
+            (과목, 학년, 프롬프트 버전, 검색 스냅샷) 캐시 키
+        """
+        if not self.cache.enabled:
+            return None
+        try:
+            snapshot = await retrieval_snapshot_async()
+        except Exception:
+            logger.warning("Could not resolve retrieval snapshot; bypassing curriculum cache", exc_info=True)
+            return None
+        return self.cache.make_key(
+            subject=request.subject,
+            grade=request.grade,
+            prompt_version=self._prompt_version(),
+            snapshot=snapshot,
+        )
+
+    def _prompt_version(self) -> str:
+        # 프롬프트 파일이나 LLM 옵션이 바뀌면 이전 결과를 재사용하지 않는다
+        prompt_template = self.prompt_loader.load("curriculum_generation")
+        raw = json.dumps([prompt_template, _LLM_OPTIONS], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def _build_messages(
+        self, request: CurriculumGenerationRequest, contexts: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """
+        검색된 자료와 프롬프트 템플릿으로 LLM 메시지를 구성합니다.
+        
+        Args:
+            request: 커리큘럼 생성 요청
+            contexts: 검색된 학습 자료 목록
+            
+        Returns:
+            system/user 메시지 목록
+        """
         prompt_template = self.prompt_loader.load("curriculum_generation")
         
         # 검색된 컨텍스트를 프롬프트에 추가
@@ -55,44 +211,30 @@ class CurriculumService:
         # 컨텍스트를 프롬프트에 추가
         user_prompt = f"### 검색된 학습 자료:\n{context_text}\n\n### 요청사항:\n{user_prompt}"
         
-        system_prompt = prompt_template["system"]
-        
-        # 3. OpenAI API 호출
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.7,
-            max_tokens=4000,
-        )
-        
-        # 4. 응답 파싱
-        content = response.choices[0].message.content
-        nodes_data = json.loads(content)
-        
-        # 5. 노드 검증 및 변환
-        roadmap_nodes = [CurriculumNode(**node) for node in nodes_data]
+        return [
+            {"role": "system", "content": prompt_template["system"]},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    @staticmethod
+    def build_metadata(roadmap_nodes: List[CurriculumNode]) -> Dict[str, Any]:
+        """
+        노드 목록으로 커리큘럼 메타데이터를 만듭니다.
         
-        # 6. 메타데이터 생성
+        Args:
+            roadmap_nodes: 커리큘럼 노드 목록
+            
+        Returns:
+            메타데이터 (total_nodes, estimated_duration)
+        """
         # 예상 기간 계산 (첫 번째 노드의 duration 사용 또는 기본값)
         estimated_duration = roadmap_nodes[0].duration if roadmap_nodes else "6개월"
-        
-        metadata = {
+        return {
             "total_nodes": len(roadmap_nodes),
             "estimated_duration": estimated_duration,
         }
-        
-        # 7. 응답 생성
-        return CurriculumGenerationResponse(
-            subject=request.subject,
-            grade=request.grade,
-            roadmap_nodes=roadmap_nodes,
-            metadata=metadata,
-        )
     
-    def _retrieve_contexts(
+    async def _retrieve_contexts(
         self, request: CurriculumGenerationRequest, limit: int = 10
     ) -> List[Dict[str, Any]]:
         """
@@ -109,7 +251,7 @@ class CurriculumService:
         query = f"{request.subject} {request.grade}"
         
         try:
-            contexts = self.retriever(
+            contexts = await self.retriever(
                 query=query,
                 grade=request.grade,
                 subject=request.subject,
@@ -168,7 +310,7 @@ class CurriculumService:
         logger.info(f"Identified weak areas: {weak_areas}")
         
         # 약점 영역에 대한 추가 학습 자료 검색
-        contexts = self._retrieve_additional_contexts(
+        contexts = await self._retrieve_additional_contexts(
             weak_areas=weak_areas,
             grade=request.grade,
             subject=request.subject,
@@ -224,7 +366,7 @@ class CurriculumService:
         
         return weak_areas
 
-    def _retrieve_additional_contexts(
+    async def _retrieve_additional_contexts(
         self,
         weak_areas: list[str],
         grade: str,
@@ -243,17 +385,18 @@ class CurriculumService:
         Returns:
             검색된 학습 자료 목록
         """
-        all_contexts = []
-        
-        for area in weak_areas:
-            query = f"{grade} {subject} {area}"
-            contexts = self.retriever(
-                query=query,
-                grade=grade,
-                subject=subject,
-                limit=limit // len(weak_areas) if weak_areas else limit,
-            )
-            all_contexts.extend(contexts)
+        if not weak_areas:
+            return []
+
+        # 약점 영역별 질의를 한 번에 임베딩하고 단일 SQL 왕복으로 검색
+        queries = [f"{grade} {subject} {area}" for area in weak_areas]
+        results = await self.multi_retriever(
+            queries,
+            grade=grade,
+            subject=subject,
+            limit_per_query=limit // len(weak_areas),
+        )
+        all_contexts = [context for contexts in results for context in contexts]
         
         return all_contexts[:limit]
 
@@ -293,8 +436,3 @@ class CurriculumService:
                 updated_nodes.append(new_node)
         
         return updated_nodes
-
-
-def get_curriculum_service() -> CurriculumService:
-    """커리큘럼 서비스 인스턴스를 반환합니다."""
-    return CurriculumService()
@@ -4,11 +4,14 @@ import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from openai import AsyncOpenAI
 
 from rag_pipeline.api.schemas import FeedbackRequest, FeedbackResponse
+from rag_pipeline.config import settings
 from rag_pipeline.prompting.loader import PromptLoader
-from rag_pipeline.services.openai_client import get_openai_client
+from rag_pipeline.services.openai_client import create_chat_completion
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +19,15 @@ logger = logging.getLogger(__name__)
 class FeedbackService:
     """AI 기반 학습 피드백 생성 서비스"""
 
-    def __init__(self) -> None:
-        self.openai_client = get_openai_client()
+    def __init__(
+        self,
+        *,
+        openai_client: AsyncOpenAI,
+        llm_timeout: Optional[float] = None,
+    ) -> None:
+        # 앱 lifespan이 만든 공유 클라이언트 (커넥션 풀을 요청 간에 재사용)
+        self.openai_client = openai_client
+        self.llm_timeout = llm_timeout or settings.feedback_llm_timeout
         self.prompt_loader = PromptLoader()
 
     async def generate_feedback(
@@ -44,8 +54,10 @@ class FeedbackService:
             # 3. 사용자 프롬프트 구성
             user_prompt = self._build_user_prompt(stats, request.curriculum_context)
             
-            # 4. OpenAI 호출
-            response = self.openai_client.chat.completions.create(
+            # 4. OpenAI 호출 (비동기, 제한 시간 초과 시 아래에서 기본 피드백으로 대체)
+            response = await create_chat_completion(
+                self.openai_client,
+                timeout=self.llm_timeout,
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": prompt_template["system"]},
@@ -243,8 +255,3 @@ class FeedbackService:
             weaknesses=weaknesses[:5],
             recommendations=recommendations[:5],
         )
-
-
-def get_feedback_service() -> FeedbackService:
-    """피드백 서비스 인스턴스를 반환합니다."""
-    return FeedbackService()
@@ -1,21 +1,117 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
 from rag_pipeline.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def _http2_available() -> bool:
+    if not settings.openai_http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("OPENAI_HTTP2 is enabled but the 'h2' package is missing; falling back to HTTP/1.1")
+        return False
+    return True
+
+
+def _http_options() -> Dict[str, Any]:
+    """OpenAI 엔드포인트용 httpx 설정: keep-alive 커넥션을 재사용해 요청마다 TLS 핸드셰이크를 하지 않는다."""
+    return {
+        "http2": _http2_available(),
+        "limits": httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(settings.openai_timeout, connect=settings.openai_connect_timeout),
+    }
+
+
+def create_async_openai_client() -> AsyncOpenAI:
+    """커넥션 풀을 조정한 AsyncOpenAI 클라이언트를 만든다. (앱 lifespan에서 한 번 생성)"""
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        max_retries=settings.openai_max_retries,
+        http_client=httpx.AsyncClient(**_http_options()),
+    )
+
+
+class LLMTimeoutError(TimeoutError):
+    """LLM 호출이 제한 시간 안에 끝나지 않았을 때 발생한다."""
+
+
+async def create_chat_completion(client: AsyncOpenAI, *, timeout: float, **kwargs: Any) -> Any:
+    """
+    Chat Completions를 비동기로 호출하되 재시도를 포함한 전체 소요 시간을 timeout초로 제한한다.
+
+    제한 시간이 지나거나 호출한 태스크가 취소되면 진행 중인 HTTP 요청도 함께 취소된다.
+    """
+    try:
+        return await asyncio.wait_for(client.chat.completions.create(timeout=timeout, **kwargs), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("LLM call (model=%s) timed out after %.1fs", kwargs.get("model"), timeout)
+        raise LLMTimeoutError(f"LLM 응답이 {timeout:.0f}초 안에 오지 않았습니다") from None
+
+
+async def stream_chat_completion(client: AsyncOpenAI, *, timeout: float, **kwargs: Any) -> AsyncIterator[str]:
+    """
+    Chat Completions를 스트리밍으로 호출해 응답 텍스트 조각을 도착하는 대로 내보낸다.
+
+    전체 소요 시간은 timeout초로 제한한다. 조각을 기다리는 각 단계도 남은 시간만큼만 기다리므로
+    스트림이 중간에 멈춰도 제한 시간을 넘기지 않는다. 소비하는 쪽이 중간에 멈추면
+    (클라이언트 연결 종료 등) HTTP 스트림을 닫아 생성을 중단한다.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        stream = await asyncio.wait_for(
+            client.chat.completions.create(stream=True, timeout=timeout, **kwargs), timeout
+        )
+    except asyncio.TimeoutError:
+        raise LLMTimeoutError(f"LLM 응답이 {timeout:.0f}초 안에 시작되지 않았습니다") from None
+    chunks = stream.__aiter__()
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), max(deadline - loop.time(), 0.0))
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                logger.warning("LLM stream (model=%s) exceeded %.1fs", kwargs.get("model"), timeout)
+                raise LLMTimeoutError(f"LLM 응답이 {timeout:.0f}초 안에 끝나지 않았습니다") from None
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    finally:
+        await stream.close()
+
+
+def create_openai_client() -> OpenAI:
+    return OpenAI(
+        api_key=settings.openai_api_key,
+        max_retries=settings.openai_max_retries,
+        http_client=httpx.Client(**_http_options()),
+    )
+
+
 class OpenAIJSONClient:
     """Simple wrapper around OpenAI Responses API expecting JSON objects."""
 
-    def __init__(self, model: Optional[str] = None) -> None:
+    def __init__(self, model: Optional[str] = None, *, client: Optional[OpenAI] = None) -> None:
         self.model = model or settings.openai_model
-        self._client = OpenAI()
+        self._client = client or get_openai_client()
 
     def complete_json(self, system_prompt: str, user_text: str) -> Dict[str, Any]:
         if hasattr(self._client, "responses"):
@@ -56,17 +152,54 @@ class OpenAIJSONClient:
 class OpenAIChatClient:
     """Wrapper around Chat Completions API for free-form assistant replies."""
 
-    def __init__(self, model: Optional[str] = None, temperature: float = 0.7) -> None:
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        *,
+        client: Optional[OpenAI] = None,
+        async_client: Optional[AsyncOpenAI] = None,
+    ) -> None:
         self.model = model or settings.openai_model
         self.temperature = temperature
-        self._client = OpenAI()
+        self._client = client
+        self._async_client = async_client
 
     def complete(self, messages: List[Dict[str, str]]) -> str:
-        response = self._client.chat.completions.create(
+        client = self._client or get_openai_client()
+        response = client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+        )
+        return self._reply_text(response)
+
+    async def acomplete(self, messages: List[Dict[str, str]]) -> str:
+        if self._async_client is None:
+            raise RuntimeError("OpenAIChatClient was created without an async client")
+        response = await create_chat_completion(
+            self._async_client,
+            timeout=settings.openai_timeout,
             model=self.model,
             messages=messages,
             temperature=self.temperature,
         )
+        return self._reply_text(response)
+
+    async def astream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        if self._async_client is None:
+            raise RuntimeError("OpenAIChatClient was created without an async client")
+        async for delta in stream_chat_completion(
+            self._async_client,
+            timeout=settings.openai_timeout,
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+        ):
+            yield delta
+
+    @staticmethod
+    def _reply_text(response: Any) -> str:
         try:
             message = response.choices[0].message
             if message.content:
@@ -79,6 +212,23 @@ class OpenAIChatClient:
         raise ValueError("Empty chat completion response")
 
 
+_shared_client: Optional[OpenAI] = None
+_shared_client_lock = threading.Lock()
+
+
 def get_openai_client() -> OpenAI:
-    """OpenAI 클라이언트 인스턴스를 반환합니다."""
-    return OpenAI(api_key=settings.openai_api_key)
+    """프로세스 전역 동기 OpenAI 클라이언트를 반환합니다. (커넥션 풀 공유)"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = create_openai_client()
+    return _shared_client
+
+
+def close_openai_client() -> None:
+    global _shared_client
+    with _shared_client_lock:
+        client, _shared_client = _shared_client, None
+    if client is not None:
+        client.close()
@@ -11,7 +11,7 @@ from rag_pipeline.api.schemas import (
     ProblemSetMetadata,
 )
 from rag_pipeline.prompting.loader import load_prompt
-from rag_pipeline.retrieval.pgvector import retrieve_passages
+from rag_pipeline.retrieval.search import retrieve_passages_tiered
 from rag_pipeline.utils.text import summarize_text
 
 from .openai_client import OpenAIJSONClient
@@ -24,10 +24,11 @@ class ProblemGenerationService:
         self,
         prompt_file: str = "problem_generation.yaml",
         *,
-        retriever=retrieve_passages,
+        retriever=retrieve_passages_tiered,
         client: Optional[OpenAIJSONClient] = None,
     ) -> None:
         self.prompt_template = load_prompt(prompt_file)
+        # (grade, subject) 폴백 단계를 한 번의 임베딩/SQL 왕복으로 검색하는 검색기
         self.retriever = retriever
         self.client = client or OpenAIJSONClient()
 
@@ -50,29 +51,17 @@ class ProblemGenerationService:
         query = self._build_query(params)
         limit = 5  # 기본 검색 개수
         
-        primary = self.retriever(
-            query,
-            grade=params.grade,
-            subject=params.subject,
-            limit=limit,
-        )
-        if primary:
-            return primary
-
-        for grade_option, subject_option in self._fallback_filters(params):
-            candidates = self.retriever(
-                query,
-                grade=grade_option,
-                subject=subject_option,
-                limit=limit,
-            )
-            if candidates:
+        tiers = [(params.grade, params.subject), *self._fallback_filters(params)]
+        tier_index, contexts = self.retriever(query, tiers=tiers, limit=limit)
+        if contexts:
+            if tier_index:
+                grade_option, subject_option = tiers[tier_index]
                 logger.info(
                     "ProblemGenerationService fallback matched grade=%s subject=%s",
                     grade_option,
                     subject_option,
                 )
-                return candidates
+            return contexts
 
         logger.warning(
             "ProblemGenerationService could not find retrieval matches for query='%s' grade=%s subject=%s",
@@ -196,7 +185,3 @@ class ProblemGenerationService:
                 raise ValueError(f"{idx}번째 문항에서 정답 라벨 '{question.answer}'이 보기 목록에 없습니다.")
             if not question.explanation or len(question.explanation.strip()) < 5:
                 raise ValueError(f"{idx}번째 문항의 해설이 너무 짧거나 비어 있습니다.")
-
-
-def get_problem_service() -> ProblemGenerationService:
-    return ProblemGenerationService()
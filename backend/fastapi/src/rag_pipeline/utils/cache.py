@@ -0,0 +1,226 @@
+"""LRU + TTL 캐시와 공유 캐시 백엔드"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Protocol, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    크기 제한(LRU)과 만료 시간(TTL)을 함께 갖는 스레드 안전 인메모리 캐시.
+
+    Args:
+        maxsize: 최대 항목 수. 초과하면 가장 오래 사용하지 않은 항목부터 제거
+        ttl: 항목 유효 시간(초). None이면 만료 없음
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key: K, value: V, ttl: Optional[float] = None) -> bool:
+        """키가 없거나 만료되었을 때만 저장하고, 저장했는지 여부를 반환한다."""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and not (entry[0] and entry[0] < now):
+                return False
+            self._data[key] = (now + ttl if ttl else 0.0, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def pop(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """만료된 항목을 정리한 뒤 유효한 항목 수를 반환한다."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._data.items() if expires_at and expires_at < now]
+            for key in expired:
+                del self._data[key]
+            return len(self._data)
+
+
+class CacheBackend(Protocol):
+    """문자열 키와 JSON 직렬화 가능한 값을 저장하는 캐시 백엔드 인터페이스"""
+
+    #: 네트워크 I/O가 있어 이벤트 루프에서 직접 호출하면 안 되는지 여부
+    blocking: bool
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None: ...
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def size(self) -> Optional[int]: ...
+
+
+class MemoryCacheBackend:
+    """프로세스 내부 TTLCache 백엔드. 반환값은 복사본이므로 호출자가 수정해도 안전하다."""
+
+    blocking = False
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        self._cache: TTLCache[str, Any] = TTLCache(maxsize, ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._cache.get(key)
+        return copy.deepcopy(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, copy.deepcopy(value), ttl)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return self._cache.add(key, copy.deepcopy(value), ttl)
+
+    def delete(self, key: str) -> None:
+        self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._cache)
+
+
+class RedisCacheBackend:
+    """
+    여러 uvicorn 워커가 공유하는 Redis 백엔드.
+
+    redis 패키지는 이 백엔드를 사용할 때만 필요하다. LRU 축출은 Redis 서버의
+    maxmemory-policy(allkeys-lru 권장)에 맡기고, 각 키에는 TTL을 건다.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str, *, namespace: str, ttl: Optional[float] = None) -> None:
+        try:
+            import redis  # type: ignore
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("Redis cache backend requested but the 'redis' package is not installed.") from exc
+
+        self.namespace = namespace
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._client.get(self._key(key))
+        except Exception:  # pragma: no cover - 캐시 장애는 검색 실패로 이어지지 않게
+            logger.warning("Redis cache get failed (namespace=%s)", self.namespace, exc_info=True)
+            return None
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            # 직렬화 실패(예: Decimal)도 캐시 장애와 같이 저장만 건너뛴다
+            payload = json.dumps(value, ensure_ascii=False)
+            if ttl:
+                self._client.set(self._key(key), payload, px=int(ttl * 1000))
+            else:
+                self._client.set(self._key(key), payload)
+        except Exception:  # pragma: no cover
+            logger.warning("Redis cache set failed (namespace=%s)", self.namespace, exc_info=True)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """SET NX: 여러 워커 중 하나만 작업을 맡게 하는 잠금 용도로 쓴다."""
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+            return bool(self._client.set(self._key(key), payload, nx=True, px=int(ttl * 1000) if ttl else None))
+        except Exception:  # pragma: no cover
+            logger.warning("Redis cache add failed (namespace=%s)", self.namespace, exc_info=True)
+            return False
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._key(key))
+        except Exception:  # pragma: no cover
+            logger.warning("Redis cache delete failed (namespace=%s)", self.namespace, exc_info=True)
+
+    def clear(self) -> None:
+        pattern = f"{self.namespace}:*"
+        try:
+            batch = []
+            for key in self._client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    self._client.delete(*batch)
+                    batch = []
+            if batch:
+                self._client.delete(*batch)
+        except Exception:  # pragma: no cover
+            logger.warning("Redis cache clear failed (namespace=%s)", self.namespace, exc_info=True)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def create_cache_backend(
+    *,
+    url: Optional[str],
+    namespace: str,
+    maxsize: int,
+    ttl: Optional[float],
+) -> CacheBackend:
+    """url이 주어지면 Redis 공유 백엔드를, 아니면 프로세스 내부 백엔드를 만든다."""
+    if url:
+        return RedisCacheBackend(url, namespace=namespace, ttl=ttl)
+    return MemoryCacheBackend(maxsize, ttl)
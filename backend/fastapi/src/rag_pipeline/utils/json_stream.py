@@ -0,0 +1,82 @@
+"""스트리밍 JSON 파싱 유틸리티"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, List
+
+
+class JsonArrayStreamParser:
+    """
+    최상위 JSON 배열을 조각 단위로 받아, 원소(객체/배열) 하나가 닫힐 때마다 파싱해 돌려줍니다.
+
+    LLM 스트리밍 응답처럼 텍스트가 임의의 위치에서 잘려 들어와도 문자열/이스케이프 상태를
+    유지하므로 원소가 완성되는 즉시 꺼낼 수 있습니다. 배열 시작('[') 앞의 텍스트
+    (예: 코드 블록 표시)는 무시합니다.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: List[str] = []
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        텍스트 조각을 추가합니다.
+
+        Args:
+            chunk: 응답 텍스트 조각
+
+        Returns:
+            이번 조각으로 완성된 배열 원소 목록
+        """
+        items: List[Any] = []
+        for char in chunk:
+            if self._finished:
+                break
+            if not self._started:
+                if char == "[":
+                    self._started = True
+                continue
+
+            if self._depth == 0:
+                # 원소 사이의 공백/쉼표, 또는 배열의 끝
+                if char == "]":
+                    self._finished = True
+                elif char in "{[":
+                    self._depth = 1
+                    self._buffer = [char]
+                elif not (char.isspace() or char == ","):
+                    raise ValueError(f"배열 원소는 객체 또는 배열이어야 합니다: {char!r}")
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    items.append(json.loads("".join(self._buffer)))
+                    self._buffer = []
+        return items
+
+    def close(self) -> None:
+        """응답이 끝났을 때 배열이 완전히 닫혔는지 확인합니다."""
+        if not self._finished:
+            raise ValueError("JSON 배열이 완결되지 않은 채 응답이 끝났습니다.")
@@ -2,6 +2,13 @@
 
 from __future__ import annotations
 
+import re
+import unicodedata
+from typing import List
+
+# 성취기준 코드 (예: [4국01-02], 9수01-03, [10공수1-01-02])
+ACHIEVEMENT_CODE_PATTERN = re.compile(r"\[?(\d{1,2}[가-힣]{1,4}\d?-?\d{2}-\d{2})\]?")
+
 
 def summarize_text(text: str, limit: int = 160) -> str:
     """
@@ -33,3 +40,35 @@ def slugify(value: str) -> str:
     normalized = "".join(ch if ch.isalnum() else "-" for ch in value.lower())
     normalized = "-".join(filter(None, normalized.split("-")))
     return normalized or "node"
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 질의 정규화: 유니코드 NFC + 공백 정리.
+
+    Args:
+        query: 정규화할 질의 문자열
+
+    Returns:
+        정규화된 문자열
+    """
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+def find_achievement_codes(text: str, *, include_bare: bool = False) -> List[str]:
+    """
+    본문에 등장하는 성취기준 코드를 등장 순서대로 중복 없이 추출합니다.
+
+    Args:
+        text: 검사할 텍스트
+        include_bare: 참이면 대괄호 없는 표기도 함께 넣습니다. (저장된 코드의 표기를 모를 때 검색용)
+
+    Returns:
+        대괄호 표기로 통일한 코드 목록 (예: ["[4국01-02]"], include_bare면 ["4국01-02", "[4국01-02]"])
+    """
+    codes: List[str] = []
+    for code in ACHIEVEMENT_CODE_PATTERN.findall(text):
+        for variant in (code, f"[{code}]") if include_bare else (f"[{code}]",):
+            if variant not in codes:
+                codes.append(variant)
+    return codes
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import pytest
+
+# rag_pipeline.config는 임포트할 때 필수 설정을 검증하므로, 환경 변수가 없어도
+# pytest만으로 실행되도록 테스트용 기본값을 먼저 넣어 둔다 (이미 설정된 값은 그대로 쓴다)
+_TEST_ENV = {
+    "DATA_ROOTS": '["data"]',
+    "ARTIFACTS_ROOT": str(Path(tempfile.gettempdir()) / "rag_pipeline_tests"),
+    "EMBEDDING_MODEL": "test/embedding-model",
+    "OPENAI_API_KEY": "test-key",
+    "OPENAI_MODEL": "gpt-test",
+    "DATABASE_URL": "postgresql://localhost/test",
+    "ENVIRONMENT": "test",
+}
+for _name, _value in _TEST_ENV.items():
+    os.environ.setdefault(_name, _value)
+
+# main.py와 같은 방식으로 src/와 tools/를 임포트 경로에 추가한다
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT / "src", ROOT / "tools"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+class FakeRedis:
+    """RedisCacheBackend가 사용하는 명령만 흉내 내는 인메모리 Redis. (만료는 무시)"""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, bytes] = {}
+
+    @classmethod
+    def from_url(cls, url: str) -> "FakeRedis":
+        return cls()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    def set(self, key: str, value: str, *, px: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode("utf-8") if isinstance(value, str) else value
+        return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def scan_iter(self, match: str = "*", count: int = 0) -> Iterator[str]:
+        return iter([key for key in list(self.data) if fnmatch.fnmatchcase(key, match)])
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> types.ModuleType:
+    """redis 패키지 대신 FakeRedis를 쓰는 모듈을 sys.modules에 넣는다."""
+    module = types.ModuleType("redis")
+    module.Redis = FakeRedis  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "redis", module)
+    return module
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rag_pipeline.embedding.artifact import (
+    EmbeddingArtifact,
+    convert_jsonl,
+    encode_categories,
+    is_artifact,
+    write_artifact,
+)
+
+RECORDS = [
+    {
+        "source_path": "/data/수학/중1.md",
+        "source_name": "data/수학/중1.md#0",
+        "grade": "중학교 1학년",
+        "subject": "수학",
+        "sub_subject": None,
+        "difficulty": None,
+        "achievement_codes": ["[9수01-01]", "[9수01-02]"],
+        "text": "소인수분해의 뜻을 안다.",
+        "embedding": [0.25, -1.5, 3.0],
+    },
+    {
+        "source_path": "/data/과학/중1.md",
+        "source_name": "data/과학/중1.md#0",
+        "grade": "중학교 1학년",
+        "subject": "과학",
+        "sub_subject": "물리",
+        "difficulty": "상",
+        "achievement_codes": [],
+        "text": "힘과 운동",
+        "embedding": [1.0, 0.0, -2.0],
+    },
+]
+
+
+def _metadata(record):
+    return {key: value for key, value in record.items() if key != "embedding"}
+
+
+def test_round_trip_preserves_records_and_vectors(tmp_path):
+    path = tmp_path / "embeddings"
+
+    assert write_artifact(RECORDS, path, model="test-model") == 2
+    assert is_artifact(path)
+    assert not (tmp_path / "embeddings.tmp").exists()
+
+    artifact = EmbeddingArtifact(path)
+    assert (len(artifact), artifact.dimension, artifact.model) == (2, 3, "test-model")
+    assert isinstance(artifact.vectors, np.memmap)
+    np.testing.assert_array_equal(artifact.vectors, [record["embedding"] for record in RECORDS])
+    np.testing.assert_allclose(artifact.sq_norms, [np.dot(r["embedding"], r["embedding"]) for r in RECORDS])
+    assert [artifact.record(idx) for idx in range(2)] == [_metadata(record) for record in RECORDS]
+
+    codes, vocabulary = artifact.categories("subject")
+    assert codes.tolist() == [0, 1]
+    assert vocabulary == ["수학", "과학"]
+
+
+def test_string_columns_share_one_blob_without_overlap(tmp_path):
+    records = [
+        {"source_path": f"p{idx}", "source_name": f"n{idx}", "text": f"t{idx}", "embedding": [float(idx)]}
+        for idx in range(3)
+    ]
+    path = tmp_path / "embeddings"
+    write_artifact(records, path, model="test-model")
+
+    artifact = EmbeddingArtifact(path)
+
+    for idx in range(3):
+        assert [artifact.string(column, idx) for column in ("source_path", "source_name", "text")] == [
+            f"p{idx}",
+            f"n{idx}",
+            f"t{idx}",
+        ]
+
+
+def test_float16_artifact_rounds_vectors(tmp_path):
+    path = tmp_path / "embeddings"
+    write_artifact(RECORDS, path, model="test-model", dtype="float16")
+
+    artifact = EmbeddingArtifact(path)
+
+    assert artifact.vectors.dtype == np.dtype("<f2")
+    (first, *_) = artifact.iter_records()
+    np.testing.assert_allclose(first["embedding"], RECORDS[0]["embedding"], rtol=1e-3)
+
+
+def test_convert_jsonl_replaces_existing_artifact(tmp_path):
+    jsonl = tmp_path / "embedding_cache.jsonl"
+    jsonl.write_text("\n".join(json.dumps(record, ensure_ascii=False) for record in RECORDS) + "\n", encoding="utf-8")
+    path = tmp_path / "embeddings"
+    write_artifact(RECORDS[:1], path, model="old-model")
+
+    assert convert_jsonl(jsonl, path, model="test-model") == 2
+    assert EmbeddingArtifact(path).model == "test-model"
+
+
+def test_empty_artifact_is_rejected(tmp_path):
+    with pytest.raises(RuntimeError):
+        write_artifact([], tmp_path / "embeddings", model="test-model")
+    assert not (tmp_path / "embeddings.tmp").exists()
+
+
+def test_unsupported_format_version(tmp_path):
+    path = tmp_path / "embeddings"
+    write_artifact(RECORDS, path, model="test-model")
+    manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+    manifest["version"] = 99
+    (path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        EmbeddingArtifact(path)
+
+
+def test_encode_categories_keeps_first_seen_order():
+    codes, vocabulary = encode_categories(["중2", None, "중1", "중2"])
+
+    assert codes.tolist() == [0, -1, 1, 0]
+    assert vocabulary == ["중2", "중1"]
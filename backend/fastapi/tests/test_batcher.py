@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("huggingface_hub")
+
+from rag_pipeline.embedding.batcher import EmbeddingBatcher
+
+
+class FakeClient:
+    def __init__(self, *, block: bool = False) -> None:
+        self.block = block
+        self.calls: List[List[str]] = []
+
+    async def aembed(self, texts: List[str]) -> List["np.ndarray"]:
+        self.calls.append(list(texts))
+        if self.block:
+            await asyncio.Event().wait()
+        return [np.full(2, len(text), dtype=np.float32) for text in texts]
+
+
+def test_concurrent_requests_share_one_batch():
+    async def scenario():
+        client = FakeClient()
+        batcher = EmbeddingBatcher(client, max_batch_size=8, max_wait=0.01)  # type: ignore[arg-type]
+        results = await asyncio.gather(batcher.embed("가"), batcher.embed("나다"), batcher.embed("가"))
+        return client, batcher, results
+
+    client, batcher, results = asyncio.run(scenario())
+
+    assert client.calls == [["가", "나다"]]
+    assert [vector.tolist() for vector in results] == [[1.0, 1.0], [2.0, 2.0], [1.0, 1.0]]
+    assert batcher.stats() == {"batches": 1, "coalesced": 1, "pending": 0, "in_flight": 0}
+
+
+@pytest.mark.parametrize("started", [False, True])
+def test_cancelled_batch_fails_waiters_instead_of_hanging(started):
+    async def scenario():
+        batcher = EmbeddingBatcher(FakeClient(block=True), max_batch_size=1)  # type: ignore[arg-type]
+        waiter = asyncio.ensure_future(batcher.embed("가"))
+        await asyncio.sleep(0)
+        if started:
+            # 배치 태스크가 client.aembed 안에서 기다리는 중에 취소
+            await asyncio.sleep(0)
+        for task in list(batcher._tasks):
+            task.cancel()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            await asyncio.wait_for(waiter, timeout=1.0)
+        return batcher
+
+    batcher = asyncio.run(scenario())
+
+    assert batcher.stats()["in_flight"] == 0
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import build_embeddings
+from build_embeddings import (
+    _FALLBACK_TOKEN_PATTERN,
+    document_hash,
+    drop_documents,
+    find_stale_documents,
+    load_checkpoint,
+    root_label,
+    save_checkpoint,
+)
+
+
+class _WhitespaceSpanner:
+    def spans(self, text):
+        return [match.span() for match in _FALLBACK_TOKEN_PATTERN.finditer(text)]
+
+
+class _ZeroEmbeddingClient:
+    def embed(self, texts):
+        return [[0.0, 0.0] for _ in texts]
+
+
+@pytest.fixture
+def worker_state(monkeypatch):
+    # _init_worker 대신 모델 없이 동작하는 토크나이저/임베딩 클라이언트를 넣는다
+    state = {"spanner": _WhitespaceSpanner(), "client": _ZeroEmbeddingClient(), "chunk_tokens": 64, "overlap": 0}
+    monkeypatch.setattr(build_embeddings, "_worker_state", state)
+    return state
+
+
+def test_source_names_differ_for_roots_with_the_same_basename(tmp_path, worker_state):
+    roots = [tmp_path / "a" / "data", tmp_path / "b" / "data"]
+    names = []
+    for root in roots:
+        document = root / "수학" / "중1.md"
+        document.parent.mkdir(parents=True)
+        document.write_text("소인수분해의 뜻을 안다.", encoding="utf-8")
+        _, _, records = build_embeddings._process_document(str(root), str(document))
+        names.append(records[0]["source_name"])
+
+    assert names[0] != names[1]
+    assert all(name.startswith("data-") and name.endswith("/수학/중1.md#0") for name in names)
+    # 같은 루트는 경로 표기가 달라도 같은 이름이 된다
+    assert root_label(roots[0]) == root_label(tmp_path / "a" / ".." / "a" / "data")
+
+
+def test_find_stale_documents_detects_changed_and_deleted(tmp_path):
+    kept = tmp_path / "kept.md"
+    changed = tmp_path / "changed.md"
+    other_root = tmp_path / "other.md"
+    for path in (kept, changed, other_root):
+        path.write_text(path.stem, encoding="utf-8")
+    completed = {
+        str(kept): document_hash(kept),
+        str(changed): document_hash(changed),
+        str(other_root): document_hash(other_root),
+        str(tmp_path / "deleted.md"): "0" * 64,
+    }
+    changed.write_text("새 내용", encoding="utf-8")
+    # other.md는 이번 실행의 루트 밖이라 current에 없지만 파일은 남아 있다
+    current = {str(kept): document_hash(kept), str(changed): document_hash(changed)}
+
+    assert find_stale_documents(completed, current) == {str(changed), str(tmp_path / "deleted.md")}
+
+
+def test_drop_documents_rewrites_output_and_checkpoint(tmp_path):
+    output = tmp_path / "embedding_cache.jsonl"
+    records = [
+        {"source_path": "a.md", "source_name": "root/a.md#0"},
+        {"source_path": "b.md", "source_name": "root/b.md#0"},
+        {"source_path": "a.md", "source_name": "root/a.md#1"},
+    ]
+    output.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    checkpoint = load_checkpoint(output, "model")  # 체크포인트가 없으면 출력을 지우고 새로 시작
+    output.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    checkpoint["completed"] = {"a.md": "hash-a", "b.md": "hash-b"}
+    checkpoint["offset"] = output.stat().st_size
+    save_checkpoint(output, checkpoint)
+
+    dropped = drop_documents(output, checkpoint, {"a.md"})
+
+    assert dropped == 2
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["source_name"] for line in lines] == ["root/b.md#0"]
+    resumed = load_checkpoint(output, "model")
+    assert resumed["completed"] == {"b.md": "hash-b"}
+    assert resumed["offset"] == output.stat().st_size
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from rag_pipeline.utils import cache as cache_module
+from rag_pipeline.utils.cache import MemoryCacheBackend, RedisCacheBackend, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a를 최근 사용으로 옮긴다
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+
+    clock.now += 10
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_ttl_cache_len_counts_only_live_entries(clock):
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3, ttl=60)
+    assert len(cache) == 3
+
+    clock.now += 10
+
+    assert len(cache) == 1
+
+
+def test_ttl_cache_add_only_when_missing_or_expired(clock):
+    cache: TTLCache[str, int] = TTLCache(maxsize=10)
+    assert cache.add("lock", 1, ttl=5)
+    assert not cache.add("lock", 2, ttl=5)
+
+    clock.now += 10
+
+    assert cache.add("lock", 3, ttl=5)
+    assert cache.pop("lock") == 3
+
+
+def test_ttl_cache_rejects_non_positive_maxsize():
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
+
+
+def test_memory_backend_returns_copies():
+    backend = MemoryCacheBackend(maxsize=10)
+    value = {"rows": [1, 2]}
+    backend.set("key", value)
+    value["rows"].append(3)
+
+    cached = backend.get("key")
+    assert cached == {"rows": [1, 2]}
+    cached["rows"].append(4)
+    assert backend.get("key") == {"rows": [1, 2]}
+    assert backend.size() == 1
+
+
+def test_redis_backend_round_trips_json(fake_redis):
+    backend = RedisCacheBackend("redis://localhost:6379/0", namespace="test", ttl=60)
+    backend.set("key", {"text": "수학", "score": 0.5})
+
+    assert backend.get("key") == {"text": "수학", "score": 0.5}
+    assert backend.add("lock", 1)
+    assert not backend.add("lock", 1)
+
+    backend.clear()
+    assert backend.get("key") is None
+
+
+def test_redis_backend_skips_unserializable_values(fake_redis, caplog):
+    backend = RedisCacheBackend("redis://localhost:6379/0", namespace="test", ttl=60)
+
+    backend.set("key", {"score": Decimal("0.5")})
+
+    assert backend.get("key") is None
+    assert not backend.add("lock", Decimal("1"))
+    assert "Redis cache set failed" in caplog.text
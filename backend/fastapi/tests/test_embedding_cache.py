@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rag_pipeline.embedding.cache import EmbeddingCache, cache_namespace
+
+
+def test_namespace_changes_with_vector_settings():
+    base = cache_namespace("bge-m3", backend="huggingface", pooling="mean", normalize=False)
+
+    assert base != cache_namespace("bge-m3", backend="fastembed", pooling="mean", normalize=False)
+    assert base != cache_namespace("bge-m3", backend="huggingface", pooling="cls", normalize=False)
+    assert base != cache_namespace("bge-m3", backend="huggingface", pooling="mean", normalize=True)
+    assert base == cache_namespace("bge-m3", backend="huggingface", pooling="mean", normalize=False)
+
+
+def test_cache_entries_are_isolated_by_namespace(tmp_path):
+    mean = cache_namespace("bge-m3", backend="huggingface", pooling="mean", normalize=False)
+    cls = cache_namespace("bge-m3", backend="huggingface", pooling="cls", normalize=False)
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", memory_size=8)
+
+    cache.set_many(mean, ["중1 수학"], [[1.0, 2.0, 3.0]])
+
+    assert cache.get_many(cls, ["중1 수학"]) == [None]
+    (vector,) = cache.get_many(mean, ["중1 수학"])
+    np.testing.assert_array_equal(vector, np.array([1.0, 2.0, 3.0], dtype=np.float32))
+
+    # 인메모리 LRU를 거치지 않고 SQLite에서 다시 읽어도 같은 결과
+    reopened = EmbeddingCache(tmp_path / "cache.sqlite3", memory_size=8)
+    assert reopened.get_many(cls, ["중1 수학"]) == [None]
+    assert reopened.get_many(mean, ["중1  수학"])[0] is not None
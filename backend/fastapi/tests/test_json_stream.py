@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+
+from rag_pipeline.utils.json_stream import JsonArrayStreamParser
+
+PAYLOAD = '```json\n[{"title": "분수 [1]", "note": "따옴표 \\" 와 } 괄호"}, {"steps": [1, [2, 3]]}]\n```'
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    parser = JsonArrayStreamParser()
+    split = PAYLOAD.index("}, {") + 1
+
+    first = parser.feed(PAYLOAD[:split])
+    second = parser.feed(PAYLOAD[split:])
+
+    assert first == [{"title": "분수 [1]", "note": '따옴표 " 와 } 괄호'}]
+    assert second == [{"steps": [1, [2, 3]]}]
+    assert parser.finished
+    parser.close()
+
+
+def test_feeding_one_character_at_a_time_matches_whole_parse():
+    parser = JsonArrayStreamParser()
+    items = [item for char in PAYLOAD for item in parser.feed(char)]
+
+    assert items == [{"title": "분수 [1]", "note": '따옴표 " 와 } 괄호'}, {"steps": [1, [2, 3]]}]
+
+
+def test_text_after_the_array_is_ignored():
+    parser = JsonArrayStreamParser()
+
+    assert parser.feed('[{"a": 1}] [{"b": 2}]') == [{"a": 1}]
+    assert parser.feed('{"c": 3}') == []
+
+
+def test_scalar_elements_are_rejected():
+    parser = JsonArrayStreamParser()
+
+    with pytest.raises(ValueError):
+        parser.feed("[1, 2]")
+
+
+def test_close_fails_on_truncated_array():
+    parser = JsonArrayStreamParser()
+    parser.feed('[{"a": 1}, {"b":')
+
+    assert not parser.finished
+    with pytest.raises(ValueError):
+        parser.close()
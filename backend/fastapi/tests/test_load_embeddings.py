@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import struct
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+import pytest
+
+np = pytest.importorskip("numpy")
+psycopg = pytest.importorskip("psycopg")
+
+from psycopg.adapt import AdaptersMap, PyFormat
+from psycopg.copy import Copy, Writer
+from psycopg.types import TypeInfo
+
+import load_embeddings
+from load_embeddings import _COLUMNS, _COPY_TYPES, _row_from_payload
+
+_VECTOR_OIDS = {"vector": (4242, 4243), "halfvec": (4252, 4253)}
+
+
+def _payload(**overrides):
+    payload = {
+        "source_path": "math.md",
+        "source_name": "math.md#0",
+        "grade": "중1",
+        "subject": "수학",
+        "text": "소인수분해",
+        "achievement_codes": ["[9수01-01]"],
+        "embedding": [0.5, -0.25, 1.0],
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.parametrize("value, expected", [(3, "3"), (2.5, "2.5"), ("상", "상"), (None, None)])
+def test_row_difficulty_is_text_or_none(value, expected):
+    row = _row_from_payload(_payload(difficulty=value), 1)
+
+    assert row["difficulty"] == expected
+    # COPY 타입 목록에서 difficulty는 text 컬럼이다
+    assert _COPY_TYPES[_COLUMNS.index("difficulty")] == "text"
+
+
+def test_row_embedding_is_float32_and_hashed():
+    row = _row_from_payload(_payload(), 7)
+
+    assert row["id"] == "math.md#0"
+    assert row["embedding"].dtype == np.float32
+    assert row["content_hash"] == load_embeddings.content_hash(row)
+
+
+def test_row_rejects_missing_embedding():
+    with pytest.raises(RuntimeError, match="line 3"):
+        _row_from_payload(_payload(embedding=None), 3)
+
+
+class _CapturingWriter(Writer):
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data) -> None:
+        self.data += bytes(data)
+
+
+class _FakeConnection:
+    """
+    서버 없이 copy_rows를 실행하기 위한 연결 대역.
+
+    cursor().copy()는 실제 psycopg.Copy를 돌려주고, 전송할 바이트만 writer에 모은다.
+    """
+
+    def __init__(self) -> None:
+        self.adapters = AdaptersMap(psycopg.adapters)
+        # 바이너리 COPY는 libpq 연결 없이도 형식화할 수 있다
+        self.pgconn = None
+        self.pgresult = None
+        self.writer = _CapturingWriter()
+
+    @contextmanager
+    def cursor(self) -> Iterator["_FakeConnection"]:
+        yield self
+
+    @property
+    def connection(self) -> "_FakeConnection":
+        return self
+
+    def copy(self, statement) -> Copy:
+        return Copy(self, binary=True, writer=self.writer)  # type: ignore[arg-type]
+
+
+@pytest.fixture
+def fake_conn(monkeypatch):
+    # pgvector 확장이 설치된 DB에서 TypeInfo.fetch가 돌려줄 정보를 흉내 낸다
+    def fetch(conn, name):
+        oid, array_oid = _VECTOR_OIDS[name]
+        return TypeInfo(name, oid, array_oid)
+
+    monkeypatch.setattr(load_embeddings.TypeInfo, "fetch", staticmethod(fetch))
+    return _FakeConnection()
+
+
+def _parse_binary_copy(data: bytes) -> List[List[bytes]]:
+    """COPY BINARY 스트림을 행별 필드 바이트 목록으로 나눈다. (NULL은 None)"""
+    assert data.startswith(b"PGCOPY\n\xff\r\n\0")
+    offset = 19  # 서명 11바이트 + 플래그 4바이트 + 확장 길이 4바이트
+    rows: List[List[bytes]] = []
+    while True:
+        (fields,) = struct.unpack_from(">h", data, offset)
+        offset += 2
+        if fields == -1:
+            assert offset == len(data)
+            return rows
+        row = []
+        for _ in range(fields):
+            (length,) = struct.unpack_from(">i", data, offset)
+            offset += 4
+            if length == -1:
+                row.append(None)
+                continue
+            row.append(data[offset : offset + length])
+            offset += length
+        rows.append(row)
+
+
+@pytest.mark.parametrize("storage, element", [("vector", ">f4"), ("halfvec", ">f2")])
+def test_copy_rows_streams_through_copy_set_types(fake_conn, storage, element):
+    rows = [_row_from_payload(_payload(difficulty=3), 1), _row_from_payload(_payload(source_name="b#0"), 2)]
+    progress = load_embeddings._Progress(interval=3600)
+
+    load_embeddings.copy_rows(
+        fake_conn,  # type: ignore[arg-type]
+        rows,
+        table_name="curriculum_embeddings",
+        storage=storage,
+        dimension=3,
+        normalize=False,
+        progress=progress,
+    )
+
+    assert progress.rows == 2
+    assert fake_conn.adapters.types[storage].oid == _VECTOR_OIDS[storage][0]
+    copied = _parse_binary_copy(bytes(fake_conn.writer.data))
+    assert len(copied) == 2
+    first = dict(zip(_COLUMNS, copied[0]))
+    assert first["source_name"].decode("utf-8") == "math.md#0"
+    assert first["difficulty"].decode("utf-8") == "3"
+    assert first["sub_subject"] is None
+    embedding = first["embedding"]
+    assert struct.unpack(">HH", embedding[:4]) == (3, 0)
+    np.testing.assert_array_equal(np.frombuffer(embedding[4:], dtype=element), [0.5, -0.25, 1.0])
+
+
+def _dump(conn: _FakeConnection, storage: str, values) -> Tuple[int, bytes]:
+    load_embeddings._register_embedding_dumper(conn, storage)  # type: ignore[arg-type]
+    dumper_class = conn.adapters.get_dumper(np.ndarray, PyFormat.BINARY)
+    return dumper_class.oid, dumper_class(np.ndarray).dump(np.asarray(values, dtype=np.float32))
+
+
+@pytest.mark.parametrize("storage, element", [("vector", ">f4"), ("halfvec", ">f2")])
+def test_binary_dumper_writes_pgvector_wire_format(fake_conn, storage, element):
+    values = [0.5, -1.25, 3.0]
+
+    oid, payload = _dump(fake_conn, storage, values)
+
+    assert oid == _VECTOR_OIDS[storage][0]
+    dimension, reserved = struct.unpack(">HH", payload[:4])
+    assert (dimension, reserved) == (3, 0)
+    assert len(payload) == 4 + 3 * np.dtype(element).itemsize
+    np.testing.assert_array_equal(np.frombuffer(payload[4:], dtype=element), values)
+
+
+def test_binary_dumper_handles_empty_vector(fake_conn):
+    assert _dump(fake_conn, "vector", [])[1] == struct.pack(">HH", 0, 0)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("huggingface_hub")
+
+from rag_pipeline.embedding.local_embeddings import LocalEmbeddingClient
+from rag_pipeline.embedding.pooling import pool_embeddings
+
+DIM = 4
+
+
+def _token_matrix(text: str) -> "np.ndarray":
+    # 단어 하나를 토큰 하나로 보고, 단어 길이로 값을 채운 (tokens, dim) 행렬
+    return np.array([[float(len(word) + offset) for offset in range(DIM)] for word in text.split()], dtype=np.float32)
+
+
+class RaggedFeatureExtraction:
+    """
+    huggingface_hub 0.23.5의 feature_extraction처럼 응답을 np.array(dtype=float32)로 변환하는 가짜 클라이언트.
+
+    토큰 수가 다른 입력을 한 번에 보내면 ragged 배열이 되어 ValueError가 난다.
+    """
+
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def _respond(self, inputs: List[str]) -> "np.ndarray":
+        self.calls.append(list(inputs))
+        return np.array([_token_matrix(text) for text in inputs], dtype=np.float32)
+
+    def feature_extraction(self, inputs: List[str]) -> "np.ndarray":
+        return self._respond(inputs)
+
+
+class AsyncRaggedFeatureExtraction(RaggedFeatureExtraction):
+    async def feature_extraction(self, inputs: List[str]) -> "np.ndarray":  # type: ignore[override]
+        return self._respond(inputs)
+
+
+TEXTS = ["하나 둘 셋", "넷", "다섯 여섯"]
+
+
+def _expected(client: LocalEmbeddingClient) -> List["np.ndarray"]:
+    return [
+        pool_embeddings(_token_matrix(text)[None, :, :], strategy=client.pooling, normalize=client.normalize)[0]
+        for text in TEXTS
+    ]
+
+
+def _client() -> LocalEmbeddingClient:
+    return LocalEmbeddingClient("fake-model", backend="huggingface", batch_size=8, use_cache=False)
+
+
+def test_ragged_token_outputs_fall_back_to_per_text_requests():
+    client = _client()
+    fake = RaggedFeatureExtraction()
+    client._client = fake  # type: ignore[assignment]
+
+    vectors = client.embed(TEXTS)
+
+    assert fake.calls[1:] == [[text] for text in TEXTS]
+    for vector, expected in zip(vectors, _expected(client)):
+        np.testing.assert_allclose(vector, expected, rtol=1e-6)
+
+    # 한 번 전환하면 이후에는 배치 요청을 다시 시도하지 않는다
+    fake.calls.clear()
+    client.embed(TEXTS[:2])
+    assert fake.calls == [[TEXTS[0]], [TEXTS[1]]]
+
+
+def test_ragged_token_outputs_fall_back_to_per_text_requests_async():
+    client = _client()
+    fake = AsyncRaggedFeatureExtraction()
+    client._async_client = fake  # type: ignore[assignment]
+
+    vectors = asyncio.run(client.aembed(TEXTS))
+
+    for vector, expected in zip(vectors, _expected(client)):
+        np.testing.assert_allclose(vector, expected, rtol=1e-6)
+
+
+def test_uniform_batches_use_a_single_request():
+    client = _client()
+    fake = RaggedFeatureExtraction()
+    client._client = fake  # type: ignore[assignment]
+
+    client.embed(["하나 둘", "셋 넷"])
+
+    assert fake.calls == [["하나 둘", "셋 넷"]]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rag_pipeline.embedding.artifact import convert_jsonl
+from rag_pipeline.retrieval.numpy_store import NumpyVectorStore
+
+RECORDS = [
+    {"source_name": "a#0", "grade": "중1", "subject": "수학", "sub_subject": "방정식", "embedding": [0.0, 0.0]},
+    {"source_name": "b#0", "grade": "중1", "subject": "수학", "sub_subject": "함수", "embedding": [1.0, 0.0]},
+    {"source_name": "c#0", "grade": "중2", "subject": "수학", "sub_subject": "함수", "embedding": [0.0, 2.0]},
+    {"source_name": "d#0", "grade": "중1", "subject": "과학", "sub_subject": None, "embedding": [3.0, 4.0]},
+]
+
+
+@pytest.fixture(params=["jsonl", "artifact"])
+def store(request, tmp_path):
+    path = tmp_path / "embedding_cache.jsonl"
+    with path.open("w", encoding="utf-8") as outfile:
+        for record in RECORDS:
+            payload = {**record, "text": f"{record['source_name']} 본문", "achievement_codes": ["[9수01-01]"]}
+            outfile.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    if request.param == "artifact":
+        artifact_path = tmp_path / "embeddings"
+        convert_jsonl(path, artifact_path, model="test-model")
+        path = artifact_path
+    return NumpyVectorStore.open(path)
+
+
+def _names(rows):
+    return [row["source_name"] for row in rows]
+
+
+def test_search_returns_nearest_rows_with_l2_distance(store):
+    rows = store.search([0.9, 0.1], {}, 2)
+
+    assert _names(rows) == ["b#0", "a#0"]
+    assert rows[0]["distance"] == pytest.approx(np.hypot(0.1, 0.1), rel=1e-4)
+    assert rows[0]["achievement_codes"] == ["[9수01-01]"]
+    assert rows[0]["text"] == "b#0 본문"
+
+
+def test_search_applies_all_filters(store):
+    rows = store.search([0.0, 0.0], {"grade": "중1", "subject": "수학", "sub_subject": None}, 10)
+
+    assert _names(rows) == ["a#0", "b#0"]
+    assert store.search([0.0, 0.0], {"grade": "고1"}, 10) == []
+
+
+def test_search_many_keeps_query_order(store):
+    results = store.search_many([[3.0, 4.0], [0.0, 2.1]], {}, 1)
+
+    assert [_names(rows) for rows in results] == [["d#0"], ["c#0"]]
+
+
+def test_search_tiered_falls_back_to_next_tier(store):
+    tier, rows = store.search_tiered([0.0, 0.0], [("고1", "수학"), ("중2", None), (None, None)], 5)
+
+    assert tier == 1
+    assert _names(rows) == ["c#0"]
+
+
+def test_limit_larger_than_corpus(store):
+    assert len(store.search([0.0, 0.0], {}, 100)) == len(RECORDS)
+
+
+def test_async_search_matches_sync(store):
+    assert asyncio.run(store.asearch([0.9, 0.1], {}, 3)) == store.search([0.9, 0.1], {}, 3)
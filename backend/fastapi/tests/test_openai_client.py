@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+pytest.importorskip("openai")
+
+from rag_pipeline.services.openai_client import LLMTimeoutError, OpenAIChatClient, stream_chat_completion
+
+
+def _chunk(text: str) -> Any:
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class StallingStream:
+    """조각 몇 개를 보낸 뒤 더 이상 응답하지 않는 스트림."""
+
+    def __init__(self, texts: List[str]) -> None:
+        self._texts = list(texts)
+        self.closed = False
+
+    def __aiter__(self) -> "StallingStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._texts:
+            return _chunk(self._texts.pop(0))
+        await asyncio.Event().wait()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeAsyncOpenAI:
+    def __init__(self, *, stream: StallingStream | None = None, delay: float = 0.0) -> None:
+        self.stream = stream
+        self.delay = delay
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, *, stream: bool = False, **kwargs: Any) -> Any:
+        await asyncio.sleep(self.delay)
+        if stream:
+            return self.stream
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="답변"))])
+
+
+def test_stalled_stream_is_bounded_by_deadline():
+    stream = StallingStream(["첫 ", "조각"])
+    client = FakeAsyncOpenAI(stream=stream)
+    received: List[str] = []
+
+    async def consume() -> None:
+        async for delta in stream_chat_completion(client, timeout=0.05, model="gpt-test"):  # type: ignore[arg-type]
+            received.append(delta)
+
+    async def scenario() -> None:
+        # 제한 시간 안에 LLMTimeoutError로 끝나야 하며, 바깥의 wait_for까지 가면 안 된다
+        await asyncio.wait_for(consume(), timeout=1.0)
+
+    with pytest.raises(LLMTimeoutError):
+        asyncio.run(scenario())
+    assert received == ["첫 ", "조각"]
+    assert stream.closed
+
+
+def test_acomplete_raises_llm_timeout(monkeypatch):
+    from rag_pipeline.services import openai_client
+
+    monkeypatch.setattr(openai_client.settings, "openai_timeout", 0.01)
+    chat = OpenAIChatClient("gpt-test", async_client=FakeAsyncOpenAI(delay=1.0))  # type: ignore[arg-type]
+
+    with pytest.raises(LLMTimeoutError):
+        asyncio.run(chat.acomplete([{"role": "user", "content": "안녕"}]))
+
+
+def test_acomplete_returns_reply_text():
+    chat = OpenAIChatClient("gpt-test", async_client=FakeAsyncOpenAI())  # type: ignore[arg-type]
+
+    assert asyncio.run(chat.acomplete([{"role": "user", "content": "안녕"}])) == "답변"
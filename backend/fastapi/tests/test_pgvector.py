@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("psycopg")
+
+from rag_pipeline.retrieval.cache import RetrievalCache
+from rag_pipeline.retrieval.pgvector import METRIC_OPERATORS, TableSpec, _build_hybrid_search_sql, parse_table_spec
+from rag_pipeline.utils.cache import RedisCacheBackend
+
+
+def test_hybrid_rrf_score_is_float8():
+    sql = _build_hybrid_search_sql((), TableSpec(storage="vector", metric="cosine", normalized=True))
+    assert sql.count("1.0::float8 / (%(rrf_k)s +") == 2
+    assert "COALESCE(1.0 /" not in sql
+
+
+def test_hybrid_result_round_trips_through_redis_cache(fake_redis):
+    cache = RetrievalCache(RedisCacheBackend("redis://localhost:6379/0", namespace="test:retrieval", ttl=60))
+    rows = [
+        {
+            "source_name": "math.md#0",
+            "grade": "중1",
+            "subject": "수학",
+            "sub_subject": None,
+            "text": "[9수01-01] 소인수분해의 뜻을 안다.",
+            "achievement_codes": ["[9수01-01]"],
+            "difficulty": None,
+            "distance": 0.1234,
+            "rrf_score": 1.0 / 61 + 1.0 / 62,
+        }
+    ]
+    key = RetrievalCache.make_key("passages", "소인수분해", grade="중1", limit=5, hybrid=True)
+
+    cache.set(key, rows)
+
+    assert cache.get(key) == rows
+    assert cache.hits == 1
+
+
+def test_parse_table_spec_reads_load_metadata():
+    spec = parse_table_spec(("halfvec(1024)", '{"metric": "ip", "normalized": true, "snapshot": "abc"}'))
+
+    assert spec == TableSpec(storage="halfvec", metric="ip", normalized=True)
+    assert spec.snapshot == "abc"
+    assert spec.operator == METRIC_OPERATORS["ip"]
+    assert spec.cast == "::halfvec"
+
+
+@pytest.mark.parametrize(
+    "row",
+    [None, ("vector(1024)", None), ("vector(1024)", "not json"), ("vector(1024)", '{"metric": "hamming"}')],
+)
+def test_parse_table_spec_falls_back_to_l2_vector(row):
+    assert parse_table_spec(row) == TableSpec(storage="vector", metric="l2", normalized=False)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rag_pipeline.embedding.pooling import pad_token_embeddings, pool_embeddings
+
+TOKENS = [
+    [[1.0, 0.0], [3.0, 4.0]],
+    [[2.0, 2.0]],
+]
+
+
+def test_pad_token_embeddings_builds_mask():
+    hidden, mask = pad_token_embeddings(TOKENS)
+
+    assert hidden.shape == (2, 2, 2)
+    assert mask.tolist() == [[True, True], [True, False]]
+    assert hidden[1, 1].tolist() == [0.0, 0.0]
+
+
+def test_pad_token_embeddings_treats_vectors_as_single_tokens():
+    hidden, mask = pad_token_embeddings([[1.0, 2.0], [3.0, 4.0]])
+
+    assert hidden.shape == (2, 1, 2)
+    assert mask.all()
+
+
+@pytest.mark.parametrize(
+    "strategy, expected",
+    [
+        ("mean", [[2.0, 2.0], [2.0, 2.0]]),
+        ("cls", [[1.0, 0.0], [2.0, 2.0]]),
+        ("max", [[3.0, 4.0], [2.0, 2.0]]),
+    ],
+)
+def test_pool_embeddings_ignores_padding(strategy, expected):
+    hidden, mask = pad_token_embeddings(TOKENS)
+
+    pooled = pool_embeddings(hidden, mask, strategy=strategy)
+
+    assert pooled.dtype == np.float32
+    np.testing.assert_allclose(pooled, expected)
+
+
+def test_pool_embeddings_max_with_negative_values_and_empty_rows():
+    hidden, mask = pad_token_embeddings([[[-1.0, -5.0], [-3.0, -2.0]], []])
+
+    pooled = pool_embeddings(hidden, mask, strategy="max")
+
+    np.testing.assert_allclose(pooled, [[-1.0, -2.0], [0.0, 0.0]])
+
+
+def test_pool_embeddings_normalizes_rows():
+    pooled = pool_embeddings(np.array([[3.0, 4.0], [0.0, 0.0]]), normalize=True)
+
+    np.testing.assert_allclose(pooled, [[0.6, 0.8], [0.0, 0.0]])
+
+
+def test_pool_embeddings_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        pool_embeddings(np.zeros((1, 2, 2)), strategy="sum")
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from rag_pipeline.utils.text import find_achievement_codes, normalize_query
+
+
+def test_find_achievement_codes_normalizes_to_brackets():
+    text = "[4국01-02] 복습 후 9수01-03과 [10공수1-01-02], 다시 4국01-02"
+
+    assert find_achievement_codes(text) == ["[4국01-02]", "[9수01-03]", "[10공수1-01-02]"]
+
+
+def test_find_achievement_codes_can_include_bare_variants():
+    assert find_achievement_codes("9수01-03 문제", include_bare=True) == ["9수01-03", "[9수01-03]"]
+
+
+def test_find_achievement_codes_without_codes():
+    assert find_achievement_codes("일차방정식의 풀이") == []
+
+
+def test_normalize_query_collapses_whitespace():
+    assert normalize_query("  중1   수학\n방정식 ") == "중1 수학 방정식"
@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from rag_pipeline.config import settings
+from rag_pipeline.embedding.artifact import convert_jsonl, default_artifact_path, is_artifact
+from rag_pipeline.utils.text import find_achievement_codes
+
+# DATA_ROOTS의 교육과정 문서를 청크로 나누고 임베딩해 embedding_cache.jsonl을 만든다.
+# 문서 단위로 프로세스 풀에 나눠 처리하고, 문서 하나가 끝날 때마다 결과를 이어 쓰며
+# 체크포인트(완료 문서별 내용 해시 + 출력 파일 오프셋)를 갱신하므로 중단 후 다시 실행하면 이어서 진행한다.
+# 다시 실행할 때 내용이 바뀌었거나 삭제된 문서는 이전 청크를 출력에서 지우고 다시 임베딩한다.
+# 모든 문서가 끝나면 JSONL을 바이너리 아티팩트(ARTIFACTS_ROOT/embeddings)로 변환한다.
+
+CHECKPOINT_VERSION = 3
+DEFAULT_EXTENSIONS = (".txt", ".md")
+
+_SUBJECTS = (
+    "기술·가정",
+    "통합사회",
+    "통합과학",
+    "한국사",
+    "국어",
+    "수학",
+    "영어",
+    "사회",
+    "과학",
+    "도덕",
+    "음악",
+    "미술",
+    "체육",
+    "실과",
+    "정보",
+)
+_SCHOOL_LEVELS = {"초": "초등학교", "중": "중학교", "고": "고등학교"}
+_GRADE_PATTERN = re.compile(r"(초등학교|중학교|고등학교)\s*(\d)\s*학년|(초|중|고)\s*(\d)(?!\d)")
+_FALLBACK_TOKEN_PATTERN = re.compile(r"\S+")
+
+
+# --- 메타데이터 ---------------------------------------------------------------
+
+
+def _detect_grade(candidates: Sequence[str]) -> Optional[str]:
+    for candidate in candidates:
+        match = _GRADE_PATTERN.search(candidate)
+        if not match:
+            continue
+        if match.group(1):
+            return f"{match.group(1)} {match.group(2)}학년"
+        return f"{_SCHOOL_LEVELS[match.group(3)]} {match.group(4)}학년"
+    return None
+
+
+def extract_metadata(relative_path: Path, text: str) -> Dict[str, Any]:
+    """
+    경로(디렉터리/파일명)를 우선으로, 없으면 문서 앞부분에서 학년/과목/세부 과목을 추정한다.
+
+    세부 과목은 과목 디렉터리 바로 아래 디렉터리 이름, 없으면 파일 이름을 사용한다.
+    """
+    parts = list(relative_path.parts[:-1]) + [relative_path.stem]
+    head = text[:500]
+
+    grade = _detect_grade(parts) or _detect_grade([head])
+
+    subject: Optional[str] = None
+    subject_index: Optional[int] = None
+    for index, part in enumerate(parts):
+        subject = next((name for name in _SUBJECTS if name in part), None)
+        if subject:
+            subject_index = index
+            break
+    if subject is None:
+        subject = next((name for name in _SUBJECTS if name in head), None)
+
+    sub_subject: Optional[str] = None
+    if subject_index is not None and subject_index + 1 < len(parts):
+        sub_subject = parts[subject_index + 1]
+    elif parts and parts[-1] not in (grade, subject):
+        sub_subject = parts[-1]
+
+    return {
+        "grade": grade,
+        "subject": subject,
+        "sub_subject": sub_subject,
+        "difficulty": None,
+    }
+
+
+# --- 청크 분할 -----------------------------------------------------------------
+
+
+class TokenSpanner:
+    """
+    텍스트를 토큰 단위 (start, end) 문자 오프셋으로 나눈다.
+
+    임베딩 모델의 토크나이저(tokenizers 패키지)를 쓸 수 있으면 그 토큰 수를 기준으로 하고,
+    없으면 공백 단위 근사치를 사용한다.
+    """
+
+    def __init__(self, model_name: str) -> None:
+        self._tokenizer = None
+        try:
+            from tokenizers import Tokenizer  # type: ignore
+
+            self._tokenizer = Tokenizer.from_pretrained(model_name, auth_token=settings.huggingface_token)
+        except Exception:
+            print(f"[warn] '{model_name}' 토크나이저를 불러오지 못해 공백 단위로 청크를 나눕니다.")
+
+    def spans(self, text: str) -> List[Tuple[int, int]]:
+        if self._tokenizer is None:
+            return [match.span() for match in _FALLBACK_TOKEN_PATTERN.finditer(text)]
+        encoding = self._tokenizer.encode(text, add_special_tokens=False)
+        return [offset for offset in encoding.offsets if offset[1] > offset[0]]
+
+
+def chunk_text(text: str, spans: Sequence[Tuple[int, int]], *, chunk_tokens: int, overlap: int) -> List[str]:
+    """토큰 chunk_tokens개 단위로 자르고, 이웃 청크와 overlap개 토큰을 겹친다."""
+    if not spans:
+        return []
+    step = max(1, chunk_tokens - overlap)
+    chunks: List[str] = []
+    for start in range(0, len(spans), step):
+        window = spans[start : start + chunk_tokens]
+        chunk = text[window[0][0] : window[-1][1]].strip()
+        if chunk:
+            chunks.append(chunk)
+        if start + chunk_tokens >= len(spans):
+            break
+    return chunks
+
+
+# --- 워커 프로세스 -------------------------------------------------------------
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(model_name: str, batch_size: int, chunk_tokens: int, overlap: int) -> None:
+    # 모델/토크나이저는 워커 프로세스마다 한 번만 준비한다
+    from rag_pipeline.embedding.local_embeddings import LocalEmbeddingClient
+
+    _worker_state["client"] = LocalEmbeddingClient(model_name, batch_size=batch_size, use_cache=False)
+    _worker_state["spanner"] = TokenSpanner(model_name)
+    _worker_state["chunk_tokens"] = chunk_tokens
+    _worker_state["overlap"] = overlap
+
+
+def document_hash(path: Path) -> str:
+    """체크포인트에 기록하는 문서 내용 해시. 다시 실행할 때 바뀐 문서를 찾는 데 쓴다."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def root_label(root: Path) -> str:
+    """
+    source_name 앞에 붙일 문서 루트 표시.
+
+    이름이 같은 루트(/a/data, /b/data)도 구분되도록 절대 경로 해시를 덧붙인다.
+    DATA_ROOTS의 순서나 --root로 고른 일부 루트와 무관하게 같은 루트는 항상 같은 값이 된다.
+    """
+    digest = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()[:8]
+    return f"{root.name}-{digest}"
+
+
+def _process_document(root: str, path: str) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """문서 하나를 청크로 나누고 배치로 임베딩해 embedding_cache.jsonl 레코드 목록을 만든다."""
+    source_path = Path(path)
+    relative_path = source_path.relative_to(root)
+    raw = source_path.read_bytes()
+    text = raw.decode("utf-8", errors="replace")
+    content_hash = hashlib.sha256(raw).hexdigest()
+    # 여러 루트에 같은 상대 경로의 문서가 있어도 겹치지 않도록 루트 표시를 붙인다
+    source_prefix = f"{root_label(Path(root))}/{relative_path.as_posix()}"
+
+    spanner: TokenSpanner = _worker_state["spanner"]
+    chunks = chunk_text(
+        text,
+        spanner.spans(text),
+        chunk_tokens=_worker_state["chunk_tokens"],
+        overlap=_worker_state["overlap"],
+    )
+    if not chunks:
+        return path, content_hash, []
+
+    metadata = extract_metadata(relative_path, text)
+    vectors = _worker_state["client"].embed(chunks)
+    records: List[Dict[str, Any]] = []
+    for index, (chunk, vector) in enumerate(zip(chunks, vectors)):
+        records.append(
+            {
+                "source_path": str(source_path),
+                # source_name은 load_embeddings에서 기본 키로 쓰이므로 청크마다 고유해야 한다
+                "source_name": f"{source_prefix}#{index}",
+                **metadata,
+                "achievement_codes": find_achievement_codes(chunk),
+                "text": chunk,
+                "embedding": [float(value) for value in vector],
+            }
+        )
+    return path, content_hash, records
+
+
+# --- 체크포인트 ----------------------------------------------------------------
+
+
+def _checkpoint_path(output: Path) -> Path:
+    return output.with_name(output.name + ".checkpoint.json")
+
+
+def load_checkpoint(output: Path, model_name: str) -> Dict[str, Any]:
+    """이전 실행의 체크포인트를 읽고, 마지막으로 완료된 위치 이후의 불완전한 출력은 잘라낸다."""
+    checkpoint_path = _checkpoint_path(output)
+    if not checkpoint_path.exists() or not output.exists():
+        if output.exists():
+            # 체크포인트 없이 남아 있는 출력은 이어 쓸 수 없으므로 새로 만든다
+            print(f"No checkpoint for existing '{output}'; starting over.")
+            output.unlink()
+        return {"version": CHECKPOINT_VERSION, "model": model_name, "offset": 0, "completed": {}}
+
+    checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+    if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint.get("model") != model_name:
+        raise RuntimeError(
+            f"체크포인트({checkpoint_path})가 현재 설정과 맞지 않습니다. --restart로 처음부터 다시 실행하세요."
+        )
+    with output.open("r+b") as outfile:
+        outfile.truncate(checkpoint["offset"])
+    return checkpoint
+
+
+def save_checkpoint(output: Path, checkpoint: Dict[str, Any]) -> None:
+    checkpoint_path = _checkpoint_path(output)
+    temp_path = checkpoint_path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(checkpoint, ensure_ascii=False), encoding="utf-8")
+    os.replace(temp_path, checkpoint_path)
+
+
+def find_stale_documents(completed: Dict[str, str], current: Dict[str, str]) -> Set[str]:
+    """
+    완료 목록 중 다시 처리해야 하는 문서.
+
+    이번 실행에서 찾은 문서(current: 경로 → 내용 해시)는 해시가 달라졌으면, 그 밖의 문서는
+    파일이 삭제되었으면 오래된 것으로 본다. (다른 --root로 실행해 이번에 찾지 않은 문서는 유지)
+    """
+    stale: Set[str] = set()
+    for path, digest in completed.items():
+        if path in current:
+            if current[path] != digest:
+                stale.add(path)
+        elif not Path(path).exists():
+            stale.add(path)
+    return stale
+
+
+def drop_documents(output: Path, checkpoint: Dict[str, Any], paths: Set[str]) -> int:
+    """출력 JSONL에서 paths 문서의 레코드를 지우고 체크포인트를 갱신한다. 지운 레코드 수를 반환한다."""
+    temp_path = output.with_name(output.name + ".tmp")
+    dropped = 0
+    with output.open("rb") as infile, temp_path.open("wb") as outfile:
+        for line in infile:
+            if line.strip() and json.loads(line).get("source_path") in paths:
+                dropped += 1
+                continue
+            outfile.write(line)
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    os.replace(temp_path, output)
+
+    for path in paths:
+        checkpoint["completed"].pop(path, None)
+    checkpoint["offset"] = output.stat().st_size
+    save_checkpoint(output, checkpoint)
+    return dropped
+
+
+# --- 실행 ----------------------------------------------------------------------
+
+
+def discover_documents(roots: Sequence[Path], extensions: Sequence[str]) -> Iterator[Tuple[Path, Path]]:
+    for root in roots:
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and path.suffix.lower() in extensions:
+                yield root, path
+
+
+def build_embeddings(
+    *,
+    roots: Sequence[Path],
+    output: Path,
+    model_name: str,
+    workers: int,
+    batch_size: int,
+    chunk_tokens: int,
+    overlap: int,
+    extensions: Sequence[str],
+    restart: bool,
+    artifact: Optional[Path] = None,
+    artifact_dtype: str = "float32",
+) -> None:
+    if overlap >= chunk_tokens:
+        raise ValueError("--overlap은 --chunk-tokens보다 작아야 합니다.")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if restart:
+        output.unlink(missing_ok=True)
+        _checkpoint_path(output).unlink(missing_ok=True)
+    checkpoint = load_checkpoint(output, model_name)
+    completed: Dict[str, str] = checkpoint["completed"]
+
+    discovered = list(discover_documents(roots, extensions))
+    current = {str(path): document_hash(path) for _, path in discovered}
+    stale = find_stale_documents(completed, current)
+    if stale:
+        dropped = drop_documents(output, checkpoint, stale)
+        print(f"{len(stale)} documents changed or were removed; dropped {dropped} stale chunks.")
+
+    documents = [(str(root), str(path)) for root, path in discovered if str(path) not in completed]
+    print(f"{len(completed)} documents already embedded; {len(documents)} remaining.")
+    if not documents:
+        if artifact is not None and (stale or not is_artifact(artifact)) and output.exists():
+            _write_artifact(output, artifact, model_name=model_name, dtype=artifact_dtype)
+        return
+
+    started = time.perf_counter()
+    processed = 0
+    chunk_count = 0
+    with output.open("ab") as outfile, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model_name, batch_size, chunk_tokens, overlap),
+    ) as executor:
+        pending: set[Future] = set()
+        queue = iter(documents)
+        # 메모리에 쌓이는 결과를 제한하기 위해 워커 수의 두 배까지만 미리 제출한다
+        for root, path in queue:
+            pending.add(executor.submit(_process_document, root, path))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, content_hash, records = future.result()
+                payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+                outfile.write(payload.encode("utf-8"))
+                outfile.flush()
+                os.fsync(outfile.fileno())
+
+                completed[path] = content_hash
+                checkpoint["offset"] = outfile.tell()
+                save_checkpoint(output, checkpoint)
+
+                processed += 1
+                chunk_count += len(records)
+                next_document = next(queue, None)
+                if next_document is not None:
+                    pending.add(executor.submit(_process_document, *next_document))
+
+            elapsed = time.perf_counter() - started
+            print(
+                f"\r{processed}/{len(documents)} documents, {chunk_count} chunks "
+                f"({chunk_count / elapsed if elapsed else 0.0:.1f} chunks/s)",
+                end="",
+                flush=True,
+            )
+    print()
+    print(f"Wrote {chunk_count} chunks to '{output}'.")
+    if artifact is not None:
+        _write_artifact(output, artifact, model_name=model_name, dtype=artifact_dtype)
+
+
+def _write_artifact(output: Path, artifact: Path, *, model_name: str, dtype: str) -> None:
+    started = time.perf_counter()
+    count = convert_jsonl(output, artifact, model=model_name, dtype=dtype)
+    print(f"Wrote {count} vectors to artifact '{artifact}' ({time.perf_counter() - started:.1f}s).")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="DATA_ROOTS 문서를 청크/임베딩해 embedding_cache.jsonl을 만듭니다.")
+    parser.add_argument(
+        "--root",
+        dest="roots",
+        type=Path,
+        action="append",
+        help="문서 루트 디렉터리 (여러 번 지정 가능, 기본값: DATA_ROOTS 중 존재하는 경로)",
+    )
+    parser.add_argument("--output", type=Path, default=settings.artifacts_root / "embedding_cache.jsonl")
+    parser.add_argument("--model", default=settings.embedding_model, help="임베딩 모델 (기본값: EMBEDDING_MODEL)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="임베딩 워커 프로세스 수")
+    parser.add_argument("--batch-size", type=int, default=settings.embedding_batch_size, help="임베딩 배치 크기")
+    parser.add_argument("--chunk-tokens", type=int, default=256, help="청크당 최대 토큰 수")
+    parser.add_argument("--overlap", type=int, default=32, help="이웃 청크와 겹치는 토큰 수")
+    parser.add_argument(
+        "--ext",
+        dest="extensions",
+        action="append",
+        help=f"처리할 파일 확장자 (기본값: {', '.join(DEFAULT_EXTENSIONS)})",
+    )
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 다시 생성")
+    parser.add_argument(
+        "--artifact",
+        type=Path,
+        default=default_artifact_path(),
+        help="완료 후 생성할 바이너리 임베딩 아티팩트 디렉터리 (기본값: ARTIFACTS_ROOT/embeddings)",
+    )
+    parser.add_argument(
+        "--artifact-dtype",
+        choices=("float32", "float16"),
+        default="float32",
+        help="아티팩트 벡터 dtype (float16: 파일 크기 절반)",
+    )
+    parser.add_argument("--no-artifact", action="store_true", help="바이너리 아티팩트를 만들지 않음")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    roots = args.roots or settings.existing_data_roots
+    if not roots:
+        raise SystemExit("처리할 문서 루트가 없습니다. DATA_ROOTS 또는 --root를 지정하세요.")
+    extensions = tuple(
+        ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in args.extensions or DEFAULT_EXTENSIONS
+    )
+    build_embeddings(
+        roots=[root.resolve() for root in roots],
+        output=args.output,
+        model_name=args.model,
+        workers=max(1, args.workers),
+        batch_size=args.batch_size,
+        chunk_tokens=args.chunk_tokens,
+        overlap=args.overlap,
+        extensions=extensions,
+        restart=args.restart,
+        artifact=None if args.no_artifact else args.artifact,
+        artifact_dtype=args.artifact_dtype,
+    )
+
+
+if __name__ == "__main__":
+    main()
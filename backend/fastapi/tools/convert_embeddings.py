@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from rag_pipeline.config import settings
+from rag_pipeline.embedding.artifact import EmbeddingArtifact, convert_jsonl, default_artifact_path
+
+# 기존 embedding_cache.jsonl을 바이너리 임베딩 아티팩트로 변환한다.
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="embedding_cache.jsonl을 바이너리 임베딩 아티팩트로 변환합니다.")
+    parser.add_argument("--jsonl", type=Path, default=settings.artifacts_root / "embedding_cache.jsonl")
+    parser.add_argument("--output", type=Path, default=default_artifact_path(), help="아티팩트 디렉터리")
+    parser.add_argument("--model", default=settings.embedding_model, help="임베딩 모델 (기본값: EMBEDDING_MODEL)")
+    parser.add_argument(
+        "--dtype",
+        choices=("float32", "float16"),
+        default="float32",
+        help="벡터 dtype (float16: 파일 크기 절반)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    started = time.perf_counter()
+    count = convert_jsonl(args.jsonl, args.output, model=args.model, dtype=args.dtype)
+    artifact = EmbeddingArtifact(args.output)
+    print(
+        f"Converted {count} records (dim={artifact.dimension}, {args.dtype}) "
+        f"into '{args.output}' in {time.perf_counter() - started:.1f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
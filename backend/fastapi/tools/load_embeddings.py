@@ -1,14 +1,34 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import itertools
 import json
+import math
+import re
+import struct
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+import numpy as np
 import psycopg
 from psycopg import sql
+from psycopg.adapt import Dumper
+from psycopg.pq import Format
+from psycopg.types import TypeInfo
 
 from rag_pipeline.config import settings
+from rag_pipeline.embedding.artifact import EmbeddingArtifact, default_artifact_path, is_artifact
+from rag_pipeline.retrieval.cache import get_retrieval_cache, notify_reload
+
+try:  # orjson은 Windows에서는 설치되지 않는다
+    import orjson as _json_impl
+except ImportError:  # pragma: no cover - platform dependent
+    import json as _json_impl  # type: ignore[no-redef]
 
 
 def _resolve_dsn() -> str:
@@ -18,42 +38,113 @@ def _resolve_dsn() -> str:
     return dsn
 
 
-def discover_dimension(jsonl_path: Path) -> int:
-    with jsonl_path.open("r", encoding="utf-8") as infile:
+def _optional_text(value: Any) -> Optional[str]:
+    # COPY는 text 컬럼에 문자열만 받으므로 숫자 등으로 기록된 값은 문자열로 바꾼다
+    return None if value is None else str(value)
+
+
+def _row_from_payload(payload: Dict[str, Any], line_no: int) -> Dict[str, object]:
+    embedding = payload.get("embedding")
+    if not isinstance(embedding, (list, np.ndarray)):
+        raise RuntimeError(f"잘못된 임베딩 형식 (line {line_no}): {embedding!r}")
+    row: Dict[str, object] = {
+        "id": payload.get("source_name") or f"row-{line_no}",
+        "source_path": payload.get("source_path"),
+        "source_name": payload.get("source_name"),
+        "grade": payload.get("grade"),
+        "subject": payload.get("subject"),
+        "sub_subject": payload.get("sub_subject"),
+        "difficulty": _optional_text(payload.get("difficulty")),
+        "achievement_codes": payload.get("achievement_codes", []),
+        "text": payload.get("text"),
+        # 파싱된 숫자 리스트를 바로 float32 버퍼로 옮긴다 (float32 아티팩트의 memmap 행은 복사하지 않음)
+        "embedding": np.asarray(embedding, dtype=np.float32),
+    }
+    row["content_hash"] = content_hash(row)
+    return row
+
+
+def _parse_lines(first_line_no: int, lines: List[bytes]) -> List[Dict[str, object]]:
+    rows: List[Dict[str, object]] = []
+    for line_no, line in enumerate(lines, start=first_line_no):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = _json_impl.loads(line)
+        except ValueError as exc:
+            raise RuntimeError(f"JSON 파싱 오류 (line {line_no}): {exc}") from exc
+        rows.append(_row_from_payload(payload, line_no))
+    return rows
+
+
+def _iter_line_chunks(jsonl_path: Path, size: int) -> Iterator[Tuple[int, List[bytes]]]:
+    with jsonl_path.open("rb") as infile:
+        first_line_no = 1
+        lines: List[bytes] = []
         for line in infile:
-            line = line.strip()
-            if not line:
-                continue
-            payload = json.loads(line)
-            embedding = payload.get("embedding")
-            if isinstance(embedding, list):
-                return len(embedding)
-    raise RuntimeError("임베딩 차원을 찾을 수 없습니다.")
-
-
-def stream_rows(jsonl_path: Path) -> Iterator[Dict[str, object]]:
-    with jsonl_path.open("r", encoding="utf-8") as infile:
-        for line_no, line in enumerate(infile, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                payload = json.loads(line)
-            except json.JSONDecodeError as exc:
-                raise RuntimeError(f"JSON 파싱 오류 (line {line_no}): {exc}") from exc
-
-            yield {
-                "id": payload.get("source_name") or f"row-{line_no}",
-                "source_path": payload.get("source_path"),
-                "source_name": payload.get("source_name"),
-                "grade": payload.get("grade"),
-                "subject": payload.get("subject"),
-                "sub_subject": payload.get("sub_subject"),
-                "difficulty": payload.get("difficulty"),
-                "achievement_codes": payload.get("achievement_codes", []),
-                "text": payload.get("text"),
-                "embedding": payload.get("embedding"),
-            }
+            lines.append(line)
+            if len(lines) >= size:
+                yield first_line_no, lines
+                first_line_no += len(lines)
+                lines = []
+        if lines:
+            yield first_line_no, lines
+
+
+def stream_rows(
+    jsonl_path: Path,
+    *,
+    parse_workers: int = 0,
+    chunk_lines: int = 2000,
+) -> Iterator[Dict[str, object]]:
+    """
+    JSONL 파일을 한 번만 읽으며 행을 순서대로 내보낸다.
+
+    parse_workers가 2 이상이면 줄 묶음을 프로세스 풀에서 파싱해 DB 쓰기와 파싱을 겹친다.
+    미리 제출하는 묶음 수를 제한해 메모리 사용량을 일정하게 유지한다.
+    """
+    chunks = _iter_line_chunks(jsonl_path, chunk_lines)
+    if parse_workers <= 1:
+        for first_line_no, lines in chunks:
+            yield from _parse_lines(first_line_no, lines)
+        return
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as executor:
+        pending: Deque[Future] = deque()
+        for first_line_no, lines in chunks:
+            pending.append(executor.submit(_parse_lines, first_line_no, lines))
+            if len(pending) >= parse_workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def read_rows(source: Path, *, parse_workers: int = 0) -> Iterator[Dict[str, object]]:
+    """source가 바이너리 아티팩트 디렉터리면 memmap에서, 아니면 JSONL에서 행을 읽는다."""
+    if is_artifact(source):
+        artifact = EmbeddingArtifact(source)
+        for line_no, record in enumerate(artifact.iter_records(), start=1):
+            yield _row_from_payload(record, line_no)
+        return
+    yield from stream_rows(source, parse_workers=parse_workers)
+
+
+def peek_dimension(rows: Iterator[Dict[str, object]]) -> Tuple[int, Iterator[Dict[str, object]]]:
+    """첫 행에서 임베딩 차원을 구하고, 첫 행을 포함한 같은 스트림을 돌려준다."""
+    try:
+        first = next(rows)
+    except StopIteration:
+        raise RuntimeError("임베딩 차원을 찾을 수 없습니다.") from None
+    return len(first["embedding"]), itertools.chain([first], rows)  # type: ignore[arg-type]
+
+
+def content_hash(row: Dict[str, object]) -> str:
+    """증분 적재에서 변경 여부를 판단하기 위한 행 내용(메타데이터 + 임베딩 바이트) 해시."""
+    metadata = {key: value for key, value in row.items() if key not in ("embedding", "content_hash")}
+    digest = hashlib.sha256(json.dumps(metadata, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    digest.update(row["embedding"].tobytes())  # type: ignore[union-attr]
+    return digest.hexdigest()
 
 
 def chunked(iterable: Iterable[Dict[str, object]], size: int) -> Iterator[List[Dict[str, object]]]:
@@ -67,81 +158,727 @@ def chunked(iterable: Iterable[Dict[str, object]], size: int) -> Iterator[List[D
         yield chunk
 
 
-def load_embeddings(
-    jsonl_path: Path,
+def _index_name(table_name: str) -> str:
+    return f"{table_name}_embedding_idx"
+
+
+# 임베딩 저장 형식과 거리 지표는 COMMENT ON TABLE에 JSON으로 기록해 두고,
+# 검색(rag_pipeline.retrieval.pgvector)과 인덱스 빌드가 같은 값을 읽어 연산자를 고른다.
+_STORAGE_TYPES = ("vector", "halfvec")
+_METRICS = ("l2", "cosine", "ip")
+
+
+def write_table_metadata(
+    conn: psycopg.Connection,
     *,
     table_name: str,
-    batch_size: int,
+    storage: str,
+    metric: str,
+    dimension: int,
+    normalized: bool,
 ) -> None:
-    dsn = _resolve_dsn()
-    dimension = discover_dimension(jsonl_path)
+    # snapshot은 적재할 때마다 새로 만든다 (생성 결과 캐시가 검색 데이터 버전을 구분하는 데 사용)
+    metadata = {
+        "storage": storage,
+        "metric": metric,
+        "dimension": dimension,
+        "normalized": normalized,
+        "snapshot": uuid.uuid4().hex,
+    }
+    conn.execute(
+        sql.SQL("COMMENT ON TABLE {table} IS {comment}").format(
+            table=sql.Identifier(table_name),
+            comment=sql.Literal(json.dumps(metadata)),
+        )
+    )
 
-    create_table_sql = sql.SQL(
+
+def read_table_metadata(conn: psycopg.Connection, *, table_name: str) -> Dict[str, object]:
+    """테이블 주석의 저장 형식/거리 지표. 주석이 없던 기존 테이블은 vector + l2로 본다."""
+    row = conn.execute(
         """
-        CREATE TABLE IF NOT EXISTS {table} (
-            id TEXT PRIMARY KEY,
-            source_path TEXT NOT NULL,
-            source_name TEXT NOT NULL,
-            grade TEXT,
-            subject TEXT,
-            sub_subject TEXT,
-            difficulty TEXT,
-            achievement_codes TEXT[],
-            text TEXT NOT NULL,
-            embedding VECTOR({dimension})
+        SELECT format_type(a.atttypid, a.atttypmod), obj_description(a.attrelid, 'pg_class')
+        FROM pg_attribute AS a
+        WHERE a.attrelid = to_regclass(%s) AND a.attname = 'embedding' AND NOT a.attisdropped
+        """,
+        (table_name,),
+    ).fetchone()
+    if row is None:
+        raise RuntimeError(f"임베딩 테이블을 찾을 수 없습니다: {table_name}")
+    column_type, comment = row
+    metadata: Dict[str, object] = json.loads(comment) if comment else {}
+    metadata["storage"] = "halfvec" if column_type.startswith("halfvec") else "vector"
+    metadata.setdefault("metric", "l2")
+    dimension = re.search(r"\((\d+)\)", column_type)
+    if dimension:
+        metadata.setdefault("dimension", int(dimension.group(1)))
+    return metadata
+
+
+def _default_ivfflat_lists(row_count: int) -> int:
+    # pgvector 권장값: 100만 행 이하는 rows / 1000, 그 이상은 sqrt(rows)
+    if row_count <= 1_000_000:
+        return max(1, row_count // 1000)
+    return max(1, int(math.sqrt(row_count)))
+
+
+def build_vector_index(
+    conn: psycopg.Connection,
+    *,
+    table_name: str,
+    method: str,
+    hnsw_m: int = 16,
+    hnsw_ef_construction: int = 64,
+    ivfflat_lists: Optional[int] = None,
+    parallel_workers: Optional[int] = None,
+    maintenance_work_mem: Optional[str] = None,
+) -> None:
+    """임베딩 컬럼에 ANN 인덱스(HNSW/IVFFlat)를 (재)생성한다."""
+    table = sql.Identifier(table_name)
+    index = sql.Identifier(_index_name(table_name))
+    metadata = read_table_metadata(conn, table_name=table_name)
+    # 예: vector_l2_ops, halfvec_cosine_ops, halfvec_ip_ops
+    opclass = sql.Identifier(f"{metadata['storage']}_{metadata['metric']}_ops")
+
+    conn.execute(sql.SQL("DROP INDEX IF EXISTS {index}").format(index=index))
+    if method == "none":
+        conn.commit()
+        print(f"Dropped vector index on '{table_name}'.")
+        return
+
+    # 인덱스 빌드 세션 설정: 메모리를 넉넉히 주고 병렬 워커를 허용한다
+    if maintenance_work_mem:
+        conn.execute("SELECT set_config('maintenance_work_mem', %s, false)", (maintenance_work_mem,))
+    if parallel_workers is not None:
+        conn.execute(
+            "SELECT set_config('max_parallel_maintenance_workers', %s, false)",
+            (str(parallel_workers),),
         )
-        """
-    ).format(table=sql.Identifier(table_name), dimension=sql.Literal(dimension))
 
-    truncate_sql = sql.SQL("TRUNCATE TABLE {table}").format(table=sql.Identifier(table_name))
+    if method == "hnsw":
+        create_index_sql = sql.SQL(
+            "CREATE INDEX {index} ON {table} USING hnsw (embedding {opclass}) "
+            "WITH (m = {m}, ef_construction = {ef_construction})"
+        ).format(
+            index=index,
+            table=table,
+            opclass=opclass,
+            m=sql.Literal(hnsw_m),
+            ef_construction=sql.Literal(hnsw_ef_construction),
+        )
+    elif method == "ivfflat":
+        if ivfflat_lists is None:
+            row_count = conn.execute(
+                sql.SQL("SELECT count(*) FROM {table}").format(table=table)
+            ).fetchone()[0]
+            ivfflat_lists = _default_ivfflat_lists(row_count)
+        create_index_sql = sql.SQL(
+            "CREATE INDEX {index} ON {table} USING ivfflat (embedding {opclass}) "
+            "WITH (lists = {lists})"
+        ).format(index=index, table=table, opclass=opclass, lists=sql.Literal(ivfflat_lists))
+    else:
+        raise ValueError(f"지원하지 않는 인덱스 종류입니다: {method}")
+
+    started = time.perf_counter()
+    conn.execute(create_index_sql)
+    conn.execute(sql.SQL("ANALYZE {table}").format(table=table))
+    conn.commit()
+    print(f"Built {method} index ({opclass.as_string(conn)}) on '{table_name}' in {time.perf_counter() - started:.1f}s.")
+
+
+def build_lexical_indexes(conn: psycopg.Connection, *, table_name: str) -> None:
+    """하이브리드 검색용 GIN 인덱스(본문 트라이그램, 성취기준 코드 배열)를 만든다."""
+    table = sql.Identifier(table_name)
+    conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    conn.execute(
+        sql.SQL("CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin (text gin_trgm_ops)").format(
+            index=sql.Identifier(f"{table_name}_text_trgm_idx"),
+            table=table,
+        )
+    )
+    conn.execute(
+        sql.SQL("CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin (achievement_codes)").format(
+            index=sql.Identifier(f"{table_name}_achievement_codes_idx"),
+            table=table,
+        )
+    )
+    conn.commit()
+    print(f"Ensured lexical GIN indexes on '{table_name}'.")
+
+
+_COLUMNS = (
+    "id",
+    "source_path",
+    "source_name",
+    "grade",
+    "subject",
+    "sub_subject",
+    "difficulty",
+    "achievement_codes",
+    "text",
+    "content_hash",
+    "embedding",
+)
+_COPY_TYPES = ["text", "text", "text", "text", "text", "text", "text", "text[]", "text", "text"]
+_LOAD_METHODS = ("copy", "insert")
+# replace: 비우고 다시 적재 / incremental: 바뀐 행만 upsert·delete / swap: 그림자 테이블에 적재 후 교체
+_LOAD_MODES = ("replace", "incremental", "swap")
+
+
+class _Progress:
+    """적재 진행 상황(행 수, 초당 행 수)을 주기적으로 출력한다."""
+
+    def __init__(self, *, interval: float = 1.0) -> None:
+        self.rows = 0
+        self.interval = interval
+        self._started = time.perf_counter()
+        self._last_report = self._started
+
+    def advance(self, count: int = 1) -> None:
+        self.rows += count
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            print(f"\r  {self.rows:,} rows ({self.rate():,.0f} rows/s)", end="", flush=True)
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self._started
+        return self.rows / elapsed if elapsed else 0.0
+
+    def finish(self) -> None:
+        elapsed = time.perf_counter() - self._started
+        print(f"\r  {self.rows:,} rows in {elapsed:.1f}s ({self.rate():,.0f} rows/s)")
+
+
+def _register_embedding_dumper(conn: psycopg.Connection, storage: str) -> None:
+    """
+    numpy 배열을 pgvector 바이너리 형식으로 직렬화하는 COPY용 dumper를 등록한다.
+
+    형식: uint16 차원 수, uint16 예약(0), 이어서 빅엔디언 float32(vector) 또는 float16(halfvec) 값.
+    """
+    info = TypeInfo.fetch(conn, storage)
+    if info is None:
+        raise RuntimeError(f"'{storage}' 타입을 찾을 수 없습니다. pgvector 확장을 확인하세요.")
+    # Copy.set_types는 타입 이름을 연결의 타입 레지스트리에서 찾으므로 등록해 두어야 한다
+    info.register(conn)
+    element_type = np.dtype(">f4") if storage == "vector" else np.dtype(">f2")
+
+    class EmbeddingBinaryDumper(Dumper):
+        format = Format.BINARY
+        oid = info.oid
+
+        def dump(self, obj: np.ndarray) -> bytes:
+            values = np.asarray(obj, dtype=element_type)
+            return struct.pack(">HH", values.shape[0], 0) + values.tobytes()
+
+    conn.adapters.register_dumper(np.ndarray, EmbeddingBinaryDumper)
+
+
+def _prepare_embedding(embedding: np.ndarray, *, dimension: int, normalize: bool) -> np.ndarray:
+    if embedding.shape != (dimension,):
+        raise RuntimeError(f"임베딩 차원이 {dimension}이 아닙니다: {embedding.shape}")
+    if normalize:
+        norm = float(np.linalg.norm(embedding))
+        if norm > 0:
+            embedding = embedding / norm
+    return embedding
+
+
+def copy_rows(
+    conn: psycopg.Connection,
+    rows: Iterable[Dict[str, object]],
+    *,
+    table_name: str,
+    storage: str,
+    dimension: int,
+    normalize: bool,
+    progress: _Progress,
+) -> None:
+    """COPY ... FROM STDIN (FORMAT BINARY)로 행을 스트리밍한다. 벡터는 텍스트 변환 없이 전송된다."""
+    _register_embedding_dumper(conn, storage)
+    copy_sql = sql.SQL("COPY {table} ({columns}) FROM STDIN (FORMAT BINARY)").format(
+        table=sql.Identifier(table_name),
+        columns=sql.SQL(", ").join(sql.Identifier(column) for column in _COLUMNS),
+    )
+    with conn.cursor() as cur, cur.copy(copy_sql) as copy:
+        copy.set_types([*_COPY_TYPES, storage])
+        for row in rows:
+            row["embedding"] = _prepare_embedding(
+                row["embedding"], dimension=dimension, normalize=normalize  # type: ignore[arg-type]
+            )
+            copy.write_row([row[column] for column in _COLUMNS])
+            progress.advance()
+
 
+def insert_rows(
+    conn: psycopg.Connection,
+    rows: Iterable[Dict[str, object]],
+    *,
+    table_name: str,
+    storage: str,
+    batch_size: int,
+    dimension: int,
+    normalize: bool,
+    progress: _Progress,
+) -> None:
+    """배치마다 executemany로 INSERT한다. (COPY를 쓸 수 없는 환경용) 벡터는 바이너리 파라미터로 보낸다."""
+    _register_embedding_dumper(conn, storage)
     insert_sql = sql.SQL(
         """
         INSERT INTO {table} (
             id, source_path, source_name,
             grade, subject, sub_subject,
             difficulty, achievement_codes,
-            text, embedding
+            text, content_hash, embedding
         )
         VALUES (
             %(id)s, %(source_path)s, %(source_name)s,
             %(grade)s, %(subject)s, %(sub_subject)s,
             %(difficulty)s, %(achievement_codes)s,
-            %(text)s, %(embedding)s::vector
+            %(text)s, %(content_hash)s, %(embedding)b
         )
         """
     ).format(table=sql.Identifier(table_name))
 
+    with conn.cursor() as cur:
+        for batch in chunked(rows, batch_size):
+            for row in batch:
+                row["embedding"] = _prepare_embedding(
+                    row["embedding"], dimension=dimension, normalize=normalize  # type: ignore[arg-type]
+                )
+            cur.executemany(insert_sql, batch)
+            progress.advance(len(batch))
+
+
+def _create_table_sql(table_name: str, column_type: sql.Composable) -> sql.Composed:
+    return sql.SQL(
+        """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id TEXT PRIMARY KEY,
+            source_path TEXT NOT NULL,
+            source_name TEXT NOT NULL,
+            grade TEXT,
+            subject TEXT,
+            sub_subject TEXT,
+            difficulty TEXT,
+            achievement_codes TEXT[],
+            text TEXT NOT NULL,
+            content_hash TEXT,
+            embedding {column_type}
+        )
+        """
+    ).format(table=sql.Identifier(table_name), column_type=column_type)
+
+
+def load_embeddings(
+    source: Path,
+    *,
+    table_name: str,
+    batch_size: int,
+    storage: str = "vector",
+    metric: str = "l2",
+    method: str = "copy",
+    parse_workers: int = 0,
+) -> None:
+    """
+    임베딩을 테이블에 적재한다.
+
+    method="copy"(기본값)는 바이너리 COPY로 스트리밍하고, "insert"는 배치 INSERT를 사용한다.
+    비우기부터 적재까지 한 트랜잭션으로 처리하므로 실패하면 이전 데이터가 그대로 남는다.
+    다만 TRUNCATE와 ALTER TABLE이 ACCESS EXCLUSIVE 잠금을 잡기 때문에 커밋할 때까지 이 테이블을
+    읽는 다른 세션의 질의는 모두 대기한다. 서비스 중인 테이블을 다시 적재할 때는 그림자 테이블에
+    적재한 뒤 교체하는 swap 모드(--mode swap)를 사용한다.
+
+    storage="halfvec"이면 반정밀도로 저장해 테이블/인덱스 크기가 절반으로 줄어든다.
+    metric이 cosine/ip이면 벡터를 단위 길이로 정규화해 저장하며, 정규화된 벡터에서는
+    내적(<#>) 순위가 코사인 유사도 순위와 같다.
+    """
+    if storage not in _STORAGE_TYPES:
+        raise ValueError(f"지원하지 않는 저장 형식입니다: {storage}")
+    if metric not in _METRICS:
+        raise ValueError(f"지원하지 않는 거리 지표입니다: {metric}")
+    if method not in _LOAD_METHODS:
+        raise ValueError(f"지원하지 않는 적재 방식입니다: {method}")
+    dsn = _resolve_dsn()
+    dimension, rows = peek_dimension(read_rows(source, parse_workers=parse_workers))
+    normalize = metric != "l2"
+    column_type = sql.SQL("{storage}({dimension})").format(
+        storage=sql.SQL(storage), dimension=sql.Literal(dimension)
+    )
+
+    create_table_sql = _create_table_sql(table_name, column_type)
+    add_hash_column_sql = sql.SQL("ALTER TABLE {table} ADD COLUMN IF NOT EXISTS content_hash TEXT").format(
+        table=sql.Identifier(table_name)
+    )
+
+    truncate_sql = sql.SQL("TRUNCATE TABLE {table}").format(table=sql.Identifier(table_name))
+
+    # 기존 테이블의 저장 형식이 다를 수 있으므로 비운 뒤 컬럼 타입을 맞춘다.
+    # 기존 인덱스의 연산자 클래스가 새 타입과 맞지 않을 수 있어 먼저 삭제한다 (적재 후 재생성).
+    drop_index_sql = sql.SQL("DROP INDEX IF EXISTS {index}").format(
+        index=sql.Identifier(_index_name(table_name))
+    )
+    alter_column_sql = sql.SQL("ALTER TABLE {table} ALTER COLUMN embedding TYPE {column_type}").format(
+        table=sql.Identifier(table_name), column_type=column_type
+    )
+
     with psycopg.connect(dsn) as conn:
         conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
         conn.execute(create_table_sql)
+        conn.execute(add_hash_column_sql)
         conn.execute(truncate_sql)
+        conn.execute(drop_index_sql)
+        conn.execute(alter_column_sql)
+        write_table_metadata(
+            conn,
+            table_name=table_name,
+            storage=storage,
+            metric=metric,
+            dimension=dimension,
+            normalized=normalize,
+        )
+
+        progress = _Progress()
+        print(f"Loading '{source}' into '{table_name}' ({method})...")
+        if method == "copy":
+            copy_rows(
+                conn,
+                rows,
+                table_name=table_name,
+                storage=storage,
+                dimension=dimension,
+                normalize=normalize,
+                progress=progress,
+            )
+        else:
+            insert_rows(
+                conn,
+                rows,
+                table_name=table_name,
+                storage=storage,
+                batch_size=batch_size,
+                dimension=dimension,
+                normalize=normalize,
+                progress=progress,
+            )
         conn.commit()
+        progress.finish()
+
+
+def sync_embeddings(
+    source: Path,
+    *,
+    table_name: str,
+    storage: str = "vector",
+    metric: str = "l2",
+    parse_workers: int = 0,
+) -> bool:
+    """
+    기존 테이블과 행별 content_hash를 비교해 바뀐 행만 upsert하고 사라진 행은 삭제한다.
+
+    테이블을 비우지 않으므로 적재 중에도 검색이 계속 동작한다. 바뀐 행은 임시 테이블로
+    바이너리 COPY한 뒤 INSERT ... ON CONFLICT 한 번으로 반영한다.
+
+    Returns:
+        변경 사항이 있었는지 여부
+    """
+    dsn = _resolve_dsn()
+    dimension, rows = peek_dimension(read_rows(source, parse_workers=parse_workers))
+    normalize = metric != "l2"
+    table = sql.Identifier(table_name)
+
+    with psycopg.connect(dsn) as conn:
+        metadata = read_table_metadata(conn, table_name=table_name)
+        if (metadata.get("storage"), metadata.get("metric"), metadata.get("dimension")) != (
+            storage,
+            metric,
+            dimension,
+        ):
+            raise RuntimeError(
+                f"'{table_name}'의 저장 형식/거리 지표/차원({metadata})이 요청과 다릅니다. "
+                "--mode swap으로 전체를 다시 적재하세요."
+            )
+        conn.execute(sql.SQL("ALTER TABLE {table} ADD COLUMN IF NOT EXISTS content_hash TEXT").format(table=table))
+        existing: Dict[str, Optional[str]] = dict(
+            conn.execute(sql.SQL("SELECT id, content_hash FROM {table}").format(table=table)).fetchall()
+        )
+
+        seen: Set[str] = set()
+
+        def changed_rows() -> Iterator[Dict[str, object]]:
+            for row in rows:
+                row_id = str(row["id"])
+                seen.add(row_id)
+                if existing.get(row_id) != row["content_hash"]:
+                    yield row
+
+        staging = f"{table_name}_staging"
+        conn.execute(
+            sql.SQL("CREATE TEMP TABLE {staging} (LIKE {table}) ON COMMIT DROP").format(
+                staging=sql.Identifier(staging), table=table
+            )
+        )
+        progress = _Progress()
+        print(f"Comparing '{source}' with '{table_name}' ({len(existing):,} existing rows)...")
+        copy_rows(
+            conn,
+            changed_rows(),
+            table_name=staging,
+            storage=storage,
+            dimension=dimension,
+            normalize=normalize,
+            progress=progress,
+        )
+        progress.finish()
+
+        columns = sql.SQL(", ").join(sql.Identifier(column) for column in _COLUMNS)
+        updates = sql.SQL(", ").join(
+            sql.SQL("{column} = EXCLUDED.{column}").format(column=sql.Identifier(column)) for column in _COLUMNS[1:]
+        )
+        conn.execute(
+            sql.SQL(
+                "INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} "
+                "ON CONFLICT (id) DO UPDATE SET {updates}"
+            ).format(table=table, columns=columns, staging=sql.Identifier(staging), updates=updates)
+        )
+        removed = [row_id for row_id in existing if row_id not in seen]
+        if removed:
+            conn.execute(sql.SQL("DELETE FROM {table} WHERE id = ANY(%s)").format(table=table), (removed,))
+        if progress.rows or removed:
+            write_table_metadata(
+                conn,
+                table_name=table_name,
+                storage=storage,
+                metric=metric,
+                dimension=dimension,
+                normalized=normalize,
+            )
+        conn.commit()
+
+    print(f"Upserted {progress.rows:,} changed rows and deleted {len(removed):,} rows in '{table_name}'.")
+    return bool(progress.rows or removed)
+
+
+def _shadow_name(table_name: str) -> str:
+    return f"{table_name}_shadow"
 
-        with conn.cursor() as cur:
-            for batch in chunked(stream_rows(jsonl_path), batch_size):
-                for row in batch:
-                    embedding = row.pop("embedding")
-                    if not isinstance(embedding, list):
-                        raise RuntimeError(f"잘못된 임베딩 형식: {embedding!r}")
-                    row["embedding"] = "[" + ",".join(str(x) for x in embedding) + "]"
-                    cur.execute(insert_sql, row)
-            conn.commit()
+
+def _owned_index_names(table_name: str) -> List[str]:
+    return [
+        f"{table_name}_pkey",
+        _index_name(table_name),
+        f"{table_name}_text_trgm_idx",
+        f"{table_name}_achievement_codes_idx",
+    ]
+
+
+def swap_tables(conn: psycopg.Connection, *, table_name: str, shadow_name: str) -> None:
+    """
+    인덱스까지 만든 그림자 테이블을 한 트랜잭션 안에서 운영 테이블 이름으로 바꾼다.
+
+    검색 쿼리는 교체 순간의 짧은 잠금만 기다리고, 비어 있거나 일부만 적재된 테이블을 보지 않는다.
+    """
+    old_name = f"{table_name}_old"
+    with conn.transaction():
+        conn.execute(
+            sql.SQL("ALTER TABLE IF EXISTS {table} RENAME TO {old}").format(
+                table=sql.Identifier(table_name), old=sql.Identifier(old_name)
+            )
+        )
+        conn.execute(
+            sql.SQL("ALTER TABLE {shadow} RENAME TO {table}").format(
+                shadow=sql.Identifier(shadow_name), table=sql.Identifier(table_name)
+            )
+        )
+        conn.execute(sql.SQL("DROP TABLE IF EXISTS {old}").format(old=sql.Identifier(old_name)))
+        # 인덱스 이름은 테이블 이름에서 파생되므로 교체 후 원래 이름으로 되돌린다
+        for shadow_index, index in zip(_owned_index_names(shadow_name), _owned_index_names(table_name)):
+            conn.execute(
+                sql.SQL("ALTER INDEX IF EXISTS {shadow_index} RENAME TO {index}").format(
+                    shadow_index=sql.Identifier(shadow_index), index=sql.Identifier(index)
+                )
+            )
+    print(f"Swapped '{shadow_name}' into place as '{table_name}'.")
+
+
+def _vector_index_exists(conn: psycopg.Connection, table_name: str) -> bool:
+    return conn.execute("SELECT to_regclass(%s) IS NOT NULL", (_index_name(table_name),)).fetchone()[0]
 
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="embedding_cache.jsonl을 pgvector 테이블에 적재합니다.")
-    parser.add_argument("--jsonl", type=Path, default=Path("artifacts/embedding_cache.jsonl"))
+    parser = argparse.ArgumentParser(description="임베딩 아티팩트 또는 embedding_cache.jsonl을 pgvector 테이블에 적재합니다.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--jsonl", type=Path, help="embedding_cache.jsonl 경로")
+    source.add_argument(
+        "--artifact",
+        type=Path,
+        help="바이너리 임베딩 아티팩트 디렉터리 (기본값: ARTIFACTS_ROOT/embeddings, 없으면 artifacts/embedding_cache.jsonl)",
+    )
     parser.add_argument("--table", default="curriculum_embeddings")
-    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=200, help="--method insert의 배치 크기")
+    parser.add_argument(
+        "--mode",
+        choices=_LOAD_MODES,
+        default="replace",
+        help=(
+            "replace: 테이블을 비우고 다시 적재 (커밋까지 검색 대기) / incremental: 바뀐 행만 반영 / "
+            "swap: 그림자 테이블에 적재·인덱싱 후 무중단 교체"
+        ),
+    )
+    parser.add_argument(
+        "--method",
+        choices=_LOAD_METHODS,
+        default="copy",
+        help="적재 방식 (copy: 바이너리 COPY 스트리밍, insert: 배치 INSERT)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="JSONL 파싱 프로세스 수 (2 이상이면 파싱과 DB 쓰기를 겹침, 0: 적재 프로세스에서 파싱)",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=_STORAGE_TYPES,
+        default="vector",
+        help="임베딩 컬럼 타입 (halfvec: 반정밀도, 테이블/인덱스 크기 절반)",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=_METRICS,
+        default="l2",
+        help="검색 거리 지표 (cosine/ip는 정규화된 벡터로 저장)",
+    )
+    parser.add_argument(
+        "--index",
+        choices=("hnsw", "ivfflat", "none"),
+        default="hnsw",
+        help="적재 후 생성할 ANN 인덱스 종류",
+    )
+    parser.add_argument("--hnsw-m", type=int, default=16, help="HNSW 노드당 최대 연결 수")
+    parser.add_argument(
+        "--hnsw-ef-construction",
+        type=int,
+        default=64,
+        help="HNSW 빌드 시 후보 리스트 크기",
+    )
+    parser.add_argument(
+        "--ivfflat-lists",
+        type=int,
+        help="IVFFlat 클러스터 수 (기본값: 행 수 기반 자동 계산)",
+    )
+    parser.add_argument(
+        "--parallel-workers",
+        type=int,
+        help="인덱스 병렬 빌드에 사용할 max_parallel_maintenance_workers 값",
+    )
+    parser.add_argument(
+        "--maintenance-work-mem",
+        help="인덱스 빌드 세션의 maintenance_work_mem (예: 1GB)",
+    )
+    parser.add_argument(
+        "--skip-lexical-index",
+        action="store_true",
+        help="하이브리드 검색용 GIN 인덱스(pg_trgm, 성취기준 코드) 생성을 건너뜀",
+    )
+    parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="데이터를 다시 적재하지 않고 인덱스만 재생성",
+    )
     return parser.parse_args()
 
 
+def _build_indexes(conn: psycopg.Connection, table_name: str, args: argparse.Namespace) -> None:
+    build_vector_index(
+        conn,
+        table_name=table_name,
+        method=args.index,
+        hnsw_m=args.hnsw_m,
+        hnsw_ef_construction=args.hnsw_ef_construction,
+        ivfflat_lists=args.ivfflat_lists,
+        parallel_workers=args.parallel_workers,
+        maintenance_work_mem=args.maintenance_work_mem,
+    )
+    if not args.skip_lexical_index:
+        build_lexical_indexes(conn, table_name=table_name)
+
+
+def _announce_reload(conn: psycopg.Connection) -> None:
+    # 실행 중인 API 워커의 검색 캐시를 무효화 (공유 백엔드는 여기서 직접 비운다)
+    notify_reload(conn)
+    get_retrieval_cache().invalidate()
+
+
 def main() -> None:
     args = parse_args()
-    load_embeddings(args.jsonl, table_name=args.table, batch_size=args.batch_size)
+    source = args.artifact or args.jsonl
+    if source is None:
+        source = default_artifact_path()
+        if not is_artifact(source):
+            source = Path("artifacts/embedding_cache.jsonl")
+    load_options = {"storage": args.storage, "metric": args.metric, "parse_workers": args.parse_workers}
+
+    if args.reindex:
+        with psycopg.connect(_resolve_dsn()) as conn:
+            _build_indexes(conn, args.table, args)
+        return
+
+    if args.mode == "swap":
+        shadow_name = _shadow_name(args.table)
+        with psycopg.connect(_resolve_dsn()) as conn:
+            conn.execute(sql.SQL("DROP TABLE IF EXISTS {shadow}").format(shadow=sql.Identifier(shadow_name)))
+            conn.commit()
+        load_embeddings(
+            source,
+            table_name=shadow_name,
+            batch_size=args.batch_size,
+            method=args.method,
+            **load_options,
+        )
+        print(f"Loaded embeddings into shadow table '{shadow_name}'.")
+        # 운영 테이블은 그대로 둔 채 그림자 테이블에서 인덱스를 만들고 마지막에 교체한다
+        with psycopg.connect(_resolve_dsn()) as conn:
+            _build_indexes(conn, shadow_name, args)
+            swap_tables(conn, table_name=args.table, shadow_name=shadow_name)
+            _announce_reload(conn)
+        return
+
+    if args.mode == "incremental":
+        changed = sync_embeddings(source, table_name=args.table, **load_options)
+        with psycopg.connect(_resolve_dsn()) as conn:
+            # ANN/GIN 인덱스는 행 변경을 바로 반영하므로 없을 때만 만든다
+            if not _vector_index_exists(conn, args.table) and args.index != "none":
+                build_vector_index(
+                    conn,
+                    table_name=args.table,
+                    method=args.index,
+                    hnsw_m=args.hnsw_m,
+                    hnsw_ef_construction=args.hnsw_ef_construction,
+                    ivfflat_lists=args.ivfflat_lists,
+                    parallel_workers=args.parallel_workers,
+                    maintenance_work_mem=args.maintenance_work_mem,
+                )
+            if not args.skip_lexical_index:
+                build_lexical_indexes(conn, table_name=args.table)
+            if changed:
+                _announce_reload(conn)
+        return
+
+    load_embeddings(
+        source,
+        table_name=args.table,
+        batch_size=args.batch_size,
+        method=args.method,
+        **load_options,
+    )
     print(f"Loaded embeddings into '{args.table}'.")
 
+    # 대량 적재가 끝난 뒤에 인덱스를 만들어야 빌드가 훨씬 빠르다
+    with psycopg.connect(_resolve_dsn()) as conn:
+        _build_indexes(conn, args.table, args)
+        _announce_reload(conn)
+
 
 if __name__ == "__main__":
     main()
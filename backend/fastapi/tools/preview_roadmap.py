@@ -71,7 +71,7 @@ def load_contexts(args: argparse.Namespace) -> List[Dict[str, Any]]:
     if not query:
         raise ValueError("검색용 query를 결정할 수 없습니다. 인자를 확인하세요.")
 
-    from rag_pipeline.retrieval.pgvector import retrieve_passages
+    from rag_pipeline.retrieval.search import retrieve_passages
 
     return retrieve_passages(
         query,
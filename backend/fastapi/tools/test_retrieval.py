@@ -1,27 +1,30 @@
 from __future__ import annotations
 
 import argparse
+from pathlib import Path
 from typing import List, Tuple
 
+import numpy as np
 import psycopg
 
-from rag_pipeline.config import settings
-from rag_pipeline.embeddings.local_embeddings import LocalEmbeddingClient
+from rag_pipeline.embedding.local_embeddings import LocalEmbeddingClient
+from rag_pipeline.retrieval.numpy_store import NumpyVectorStore
+from rag_pipeline.retrieval.pgvector import read_table_spec
+from rag_pipeline.retrieval.pool import close_pool, get_pool
 
 
-def _resolve_dsn() -> str:
-    dsn = settings.database_url
-    if "+psycopg_async" in dsn:
-        dsn = dsn.replace("+psycopg_async", "")
-    return dsn
-
-
-def embed_query(text: str) -> List[float]:
+def embed_query(text: str) -> np.ndarray:
     with LocalEmbeddingClient() as client:
         vectors = client.embed([text])
     return vectors[0]
 
 
+def distance_expression(conn: psycopg.Connection, table: str) -> Tuple[str, bool]:
+    """load_embeddings가 기록한 테이블 메타데이터로 거리 연산식과 정규화 여부를 정한다."""
+    spec = read_table_spec(conn, table)
+    return f"embedding {spec.operator} %b{spec.cast}", spec.normalized
+
+
 def run_retrieval(
     conn: psycopg.Connection,
     table: str,
@@ -31,11 +34,13 @@ def run_retrieval(
     grade: str | None,
     limit: int,
 ) -> List[Tuple]:
-    embedding = embed_query(query)
-    vector_literal = "[" + ",".join(str(x) for x in embedding) + "]"
+    distance_sql, normalized = distance_expression(conn, table)
+    embedding = np.asarray(embed_query(query), dtype=np.float32)
+    if normalized:
+        embedding /= np.linalg.norm(embedding) or 1.0
 
     where_clauses: List[str] = []
-    params: List[str] = []
+    params: List[object] = [embedding]
     if subject:
         where_clauses.append("subject = %s")
         params.append(subject)
@@ -46,23 +51,51 @@ def run_retrieval(
     if where_sql:
         where_sql = "WHERE " + where_sql
 
+    params.append(limit)
+
+    # 질의 벡터는 pgvector 바이너리 포맷(%b)으로, LIMIT은 파라미터로 바인딩
     sql_query = f"""
         SELECT source_name, grade, subject, sub_subject,
                LEFT(text, 120) AS snippet,
-               embedding <-> '{vector_literal}'::vector AS distance
+               {distance_sql} AS distance
         FROM {table}
         {where_sql}
-        ORDER BY embedding <-> '{vector_literal}'::vector
-        LIMIT {limit}
+        ORDER BY distance
+        LIMIT %s
     """
     with conn.cursor() as cur:
         cur.execute(sql_query, params)
         return cur.fetchall()
 
 
+def run_artifact_retrieval(
+    artifact: Path,
+    query: str,
+    *,
+    subject: str | None,
+    grade: str | None,
+    limit: int,
+) -> List[Tuple]:
+    """DB 없이 바이너리 아티팩트를 memmap으로 열어 같은 형식의 결과를 만든다. (L2 거리)"""
+    store = NumpyVectorStore.from_artifact(artifact)
+    rows = store.search(embed_query(query), {"grade": grade, "subject": subject}, limit)
+    return [
+        (
+            row["source_name"],
+            row["grade"],
+            row["subject"],
+            row["sub_subject"],
+            (row["text"] or "")[:120],
+            row["distance"],
+        )
+        for row in rows
+    ]
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="간단한 벡터 검색 스모크 테스트")
     parser.add_argument("--table", default="curriculum_embeddings")
+    parser.add_argument("--artifact", type=Path, help="DB 대신 검색할 바이너리 임베딩 아티팩트 디렉터리")
     parser.add_argument("--subject", help="필터용 과목 (예: 국어)")
     parser.add_argument("--grade", help="필터용 학년 (예: 초등학교 3학년)")
     parser.add_argument("--query", required=True, help="검색 문장")
@@ -72,17 +105,28 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    dsn = _resolve_dsn()
 
-    with psycopg.connect(dsn) as conn:
-        results = run_retrieval(
-            conn,
-            args.table,
+    if args.artifact:
+        results = run_artifact_retrieval(
+            args.artifact,
             args.query,
             subject=args.subject,
             grade=args.grade,
             limit=args.limit,
         )
+    else:
+        try:
+            with get_pool().connection() as conn:
+                results = run_retrieval(
+                    conn,
+                    args.table,
+                    args.query,
+                    subject=args.subject,
+                    grade=args.grade,
+                    limit=args.limit,
+                )
+        finally:
+            close_pool()
 
     print(f"Query: {args.query}")
     if not results:
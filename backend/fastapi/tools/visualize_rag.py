@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.table import Table
@@ -17,6 +18,7 @@ from rag_pipeline.api.schemas import (
     ProblemGenerationRequest,
     ProblemGenerationResponse,
 )
+from rag_pipeline.embedding.artifact import EmbeddingArtifact, default_artifact_path
 from rag_pipeline.roadmap.models import Roadmap, RoadmapNode, RoadmapResource
 from rag_pipeline.services.problem_service import ProblemGenerationService
 
@@ -98,6 +100,50 @@ def run_problem_generation(args: argparse.Namespace) -> None:
     _render_problem_set(response)
 
 
+def _render_category_counts(artifact: EmbeddingArtifact, column: str, title: str) -> None:
+    codes, vocabulary = artifact.categories(column)
+    # 코드 -1(값 없음)은 마지막 칸으로 보내 한 번의 bincount로 센다
+    counts = np.bincount(np.where(codes >= 0, codes, len(vocabulary)), minlength=len(vocabulary) + 1)
+    table = Table(title=title)
+    table.add_column(title, style="bold")
+    table.add_column("청크 수", justify="right", style="cyan")
+    labels = [*vocabulary, "(없음)"]
+    for code in np.argsort(-counts, kind="stable").tolist():
+        if counts[code]:
+            table.add_row(labels[code], f"{int(counts[code]):,}")
+    console.print(table)
+
+
+def run_corpus_inspection(args: argparse.Namespace) -> None:
+    artifact = EmbeddingArtifact(args.artifact)
+    manifest = artifact.manifest
+
+    console.rule("[bold green]임베딩 코퍼스")
+    console.print(
+        f"[bold]모델:[/] {artifact.model}  [bold]차원:[/] {artifact.dimension}  "
+        f"[bold]청크:[/] {len(artifact):,}  [bold]dtype:[/] {manifest['dtype']}  "
+        f"[bold]생성:[/] {manifest['created_at']}"
+    )
+    _render_category_counts(artifact, "grade", "학년")
+    _render_category_counts(artifact, "subject", "과목")
+
+    if args.sample:
+        table = Table(title="샘플 청크", show_lines=True)
+        table.add_column("source_name", style="cyan")
+        table.add_column("학년/과목")
+        table.add_column("성취기준", style="green")
+        table.add_column("본문", style="white")
+        for idx in range(min(args.sample, len(artifact))):
+            record = artifact.record(idx)
+            table.add_row(
+                record["source_name"] or "-",
+                f"{record['grade'] or '-'} {record['subject'] or '-'}",
+                ", ".join(record["achievement_codes"]),
+                (record["text"] or "")[:120],
+            )
+        console.print(table)
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="RAG 결과를 시각적으로 확인하는 CLI 도구")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -112,6 +158,15 @@ def build_parser() -> argparse.ArgumentParser:
     prob_parser.add_argument("--retrieval-limit", type=int, default=5)
     prob_parser.add_argument("--from-json", help="ProblemGenerationResponse JSON 파일 경로")
 
+    corpus_parser = subparsers.add_parser("corpus", help="임베딩 아티팩트 요약 렌더링")
+    corpus_parser.add_argument(
+        "--artifact",
+        type=Path,
+        default=default_artifact_path(),
+        help="바이너리 임베딩 아티팩트 디렉터리 (기본값: ARTIFACTS_ROOT/embeddings)",
+    )
+    corpus_parser.add_argument("--sample", type=int, default=5, help="표시할 샘플 청크 수")
+
     return parser
 
 
@@ -123,6 +178,8 @@ def main() -> None:
         if not args.from_json and not args.query:
             parser.error("problems 모드는 --query 또는 --from-json 중 하나를 지정해야 합니다.")
         run_problem_generation(args)
+    elif args.command == "corpus":
+        run_corpus_inspection(args)
     else:  # pragma: no cover
         parser.error(f"지원하지 않는 명령입니다: {args.command}")
 